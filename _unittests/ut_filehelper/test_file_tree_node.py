@@ -82,6 +82,28 @@ class TestFileNodeTree(unittest.TestCase):
         assert nb > 0
         assert nrst > 0
 
+    def test_file_tree_node_scandir(self):
+        fLOG(
+            __file__,
+            self._testMethodName,
+            OutputPrint=__name__ == "__main__")
+        this = os.path.abspath(os.path.dirname(__file__))
+        folder = os.path.normpath(os.path.join(this, "..", "..", "src"))
+
+        def filter(root, path, f, d):
+            return "__pycache__" not in path and "__pycache__" not in f
+
+        ftn = FileTreeNode(folder, filter=filter)
+        ftn2 = FileTreeNode(folder, filter=filter, walker="scandir", n_jobs=4)
+        self.assertEqual(str(ftn), str(ftn2))
+        self.assertEqual(len(ftn), len(ftn2))
+        for n1, n2 in zip(ftn, ftn2):
+            self.assertEqual(n1.get(), n2.get())
+            self.assertEqual(n1._level, n2._level)
+
+        diff = ftn.difference(ftn2)
+        self.assertEqual(set(d[0] for d in diff), {"=="})
+
 
 if __name__ == "__main__":
     unittest.main()
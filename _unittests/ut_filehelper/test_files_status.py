@@ -0,0 +1,95 @@
+"""
+@brief      test log(time=2s)
+"""
+
+import sys
+import os
+import unittest
+
+try:
+    import src
+except ImportError:
+    path = os.path.normpath(
+        os.path.abspath(
+            os.path.join(
+                os.path.split(__file__)[0],
+                "..",
+                "..")))
+    if path not in sys.path:
+        sys.path.append(path)
+    import src
+
+from src.pyquickhelper import get_temp_folder, fLOG, FileTreeNode, FolderTransferFTP, FilesStatus
+from src.pyquickhelper.filehelper.ftp_transfer import MockTransferFTP
+from src.pyquickhelper.filehelper.files_status_backend import is_sqlite_file
+
+
+class TestFilesStatus(unittest.TestCase):
+
+    def test_files_status_sqlite_migration(self):
+        fLOG(
+            __file__,
+            self._testMethodName,
+            OutputPrint=__name__ == "__main__")
+        temp = get_temp_folder(__file__, "temp_files_status_sqlite")
+        status = os.path.join(temp, "status.txt")
+        files = []
+        for i in range(4):
+            name = os.path.join(temp, "f%d.txt" % i)
+            with open(name, "w") as f:
+                f.write("content %d" % i)
+            files.append(name)
+
+        ft = FilesStatus(status)
+        for name in files[:3]:
+            ft.update_copied_file(name)
+        ft.save_dates()
+        self.assertFalse(is_sqlite_file(status))
+
+        ft = FilesStatus(status, backend="sqlite")
+        self.assertTrue(is_sqlite_file(status))
+        self.assertTrue(os.path.exists(status + ".bak"))
+        self.assertEqual(len(ft.copyFiles), 3)
+        self.assertEqual(sorted(k for k, v in ft), sorted(files[:3]))
+        self.assertEqual(ft.has_been_modified_and_reason(files[0]), (False, None))
+        self.assertEqual(ft.has_been_modified_and_reason(files[3]), (True, "new"))
+        obj = ft.update_copied_file(files[3])
+        self.assertEqual(ft.copyFiles[files[3]].checksum, obj.checksum)
+        ft.update_copied_file(files[0], delete=True)
+        ft.close()
+
+        # the backend is detected
+        ft = FilesStatus(status)
+        self.assertTrue(ft.incremental)
+        self.assertEqual(sorted(k for k, v in ft), sorted(files[1:]))
+        ft.close()
+
+    def test_folder_transfer_sqlite(self):
+        fLOG(
+            __file__,
+            self._testMethodName,
+            OutputPrint=__name__ == "__main__")
+        temp = get_temp_folder(__file__, "temp_folder_transfer_sqlite")
+        status = os.path.join(temp, "status.db")
+        folder = os.path.normpath(os.path.join(
+            temp, "..", "..", "..", "src", "pyquickhelper", "filehelper"))
+
+        ftn = FileTreeNode(folder)
+        ftp = MockTransferFTP(
+            "http://www.xavierdupre.fr/",
+            "login",
+            "password",
+            fLOG=fLOG)
+        fftp = FolderTransferFTP(ftn, ftp, status, status_backend="sqlite")
+        done = fftp.start_transfering()
+        self.assertTrue(len(done) > 0)
+        self.assertTrue(is_sqlite_file(status))
+
+        fftp = FolderTransferFTP(ftn, ftp, status)
+        done = fftp.start_transfering()
+        self.assertEqual(len(done), 0)
+        ftp.close()
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -5,6 +5,8 @@
 import sys
 import os
 import unittest
+import threading
+import warnings
 
 if "temp_" in os.path.abspath(__file__):
     raise ImportError(
@@ -26,6 +28,7 @@ except ImportError:
 
 from src.pyquickhelper import get_temp_folder, fLOG, FileTreeNode, TransferFTP, FolderTransferFTP
 from src.pyquickhelper.filehelper.ftp_transfer import MockTransferFTP
+from src.pyquickhelper.filehelper.ftp_transfer_files import FolderTransferFTPException
 
 
 class TestFolderTransfer(unittest.TestCase):
@@ -67,6 +70,270 @@ class TestFolderTransfer(unittest.TestCase):
 
         ftp.close()
 
+    def test_folder_transfer_parallel_mock(self):
+        fLOG(
+            __file__,
+            self._testMethodName,
+            OutputPrint=__name__ == "__main__")
+        temp = get_temp_folder(__file__, "temp_folder_transfer_parallel_mock")
+        status = os.path.join(temp, "temp_status_file.txt")
+        folder = os.path.normpath(os.path.join(
+            temp, "..", "..", "..", "src", "pyquickhelper", "filehelper"))
+
+        ftn = FileTreeNode(folder)
+        ftp = MockTransferFTP(
+            "http://www.xavierdupre.fr/",
+            "login",
+            "password",
+            fLOG=fLOG)
+        fftp = FolderTransferFTP(ftn, ftp, status)
+        nb = len(list(fftp.iter_eligible_files()))
+        done = fftp.start_transfering(n_jobs=3, batch_size=5)
+        self.assertEqual(len(done), nb)
+        done = fftp.start_transfering(n_jobs=3)
+        self.assertEqual(len(done), 0)
+
+    def test_folder_transfer_parallel_server(self):
+        fLOG(
+            __file__,
+            self._testMethodName,
+            OutputPrint=__name__ == "__main__")
+        try:
+            from pyftpdlib.authorizers import DummyAuthorizer
+            from pyftpdlib.handlers import FTPHandler
+            from pyftpdlib.servers import ThreadedFTPServer
+        except ImportError:
+            warnings.warn("pyftpdlib is not available, skipping " +
+                          self._testMethodName)
+            return
+
+        temp = get_temp_folder(__file__, "temp_folder_transfer_parallel")
+        status = os.path.join(temp, "temp_status_file.txt")
+        remote = os.path.join(temp, "remote")
+        os.mkdir(remote)
+        folder = os.path.normpath(os.path.join(
+            temp, "..", "..", "..", "src", "pyquickhelper", "helpgen"))
+
+        def filter(root, path, f, d):
+            return "__pycache__" not in path and "__pycache__" not in f
+
+        authorizer = DummyAuthorizer()
+        authorizer.add_user("login", "password", remote, perm="elradfmw")
+        handler = type("Handler", (FTPHandler,), dict(authorizer=authorizer))
+        server = ThreadedFTPServer(("127.0.0.1", 0), handler)
+        port = server.address[1]
+        th = threading.Thread(target=server.serve_forever,
+                              kwargs=dict(timeout=0.1))
+        th.start()
+
+        try:
+            ftn = FileTreeNode(folder, filter=filter)
+            ftp = TransferFTP("127.0.0.1", "login", "password",
+                              fLOG=fLOG, port=port)
+            fftp = FolderTransferFTP(ftn, ftp, status,
+                                     root_web="/www/doc",
+                                     footer_html="<b>footer</b>",
+                                     content_filter=lambda c: c)
+            done = fftp.start_transfering(n_jobs=4)
+            self.assertTrue(len(done) > 0)
+            self.assertEqual(ftp.pwd(), "/")
+            ftp.close()
+        finally:
+            server.close_all()
+            th.join()
+
+        for f in ftn:
+            if f.isfile():
+                dest = os.path.join(remote, "www", "doc", f.name)
+                self.assertTrue(os.path.exists(dest))
+                with open(f.fullname, "rb") as fa:
+                    with open(dest, "rb") as fb:
+                        self.assertEqual(fa.read(), fb.read())
+
+    def test_folder_transfer_streaming(self):
+        fLOG(
+            __file__,
+            self._testMethodName,
+            OutputPrint=__name__ == "__main__")
+        temp = get_temp_folder(__file__, "temp_folder_transfer_streaming")
+        status = os.path.join(temp, "temp_status_file.txt")
+        html = os.path.join(temp, "page.html")
+        with open(html, "w", encoding="utf8") as f:
+            f.write("<html><body>\n")
+            for i in range(2000):
+                f.write("<p>ligne é %d</p>\n" % i)
+            f.write("<pre></body></pre>\n</body>\n</html>\n")
+        js = os.path.join(temp, "script.js")
+        with open(js, "wb") as f:
+            f.write(b"var a = 1;\n" * 1000 + b"\xe9\xff;\n")
+
+        ftn = FileTreeNode(temp)
+        ftp = MockTransferFTP(
+            "http://www.xavierdupre.fr/",
+            "login",
+            "password",
+            fLOG=fLOG)
+
+        def cfilter(c):
+            return c.replace("ligne", "line")
+
+        def read_all(stream, size=777):
+            got = []
+            while True:
+                b = stream.read(size)
+                if len(b) == 0:
+                    break
+                self.assertLess(len(stream._partial), 2000)
+                got.append(b)
+            return b"".join(got)
+
+        fftp = FolderTransferFTP(ftn, ftp, status,
+                                 footer_html="<b>footer</b>",
+                                 content_filter=cfilter)
+        sftp = FolderTransferFTP(ftn, ftp, status,
+                                 footer_html="<b>footer</b>",
+                                 chunk_filter=cfilter,
+                                 streaming=True)
+
+        data = fftp.preprocess_before_transfering(html)
+        exp = data.read()
+        fftp.close_stream(data)
+        self.assertIn(b"</pre>\n<b>footer</b></body>", exp)
+        self.assertNotIn(b"ligne", exp)
+
+        stream = sftp.preprocess_before_transfering(html)
+        stream._chunk_size = 1000
+        self.assertEqual(read_all(stream), exp)
+        # the stream can be transfered again
+        self.assertEqual(stream.tell(), len(exp))
+        stream.seek(0)
+        self.assertEqual(stream.tell(), 0)
+        self.assertEqual(read_all(stream), exp)
+        sftp.close_stream(stream)
+
+        # content_filter still receives the whole content
+        pieces = []
+
+        def wfilter(c):
+            pieces.append(c)
+            return c.replace("ligne", "line")
+
+        wftp = FolderTransferFTP(ftn, ftp, status,
+                                 footer_html="<b>footer</b>",
+                                 content_filter=wfilter, streaming=True)
+        data = wftp.preprocess_before_transfering(html)
+        self.assertEqual(data.read(), exp)
+        wftp.close_stream(data)
+        self.assertEqual(len(pieces), 1)
+
+        with warnings.catch_warnings(record=True) as w:
+            warnings.simplefilter("always")
+            data = fftp.preprocess_before_transfering(js)
+            exp = data.read()
+            fftp.close_stream(data)
+            stream = sftp.preprocess_before_transfering(js)
+            stream._chunk_size = 1000
+            got = read_all(stream)
+            sftp.close_stream(stream)
+        self.assertEqual(got, exp)
+        self.assertEqual(len(w), 2)
+
+        # a file without any new line, the footer goes through the filter
+        one = os.path.join(temp, "one.html")
+        with open(one, "w", encoding="utf8") as f:
+            f.write("<html><body>" + "<p>ligne é</p> " * 2000 + "</body></html>")
+        fftp = FolderTransferFTP(ftn, ftp, status,
+                                 footer_html="<b>ligne</b>",
+                                 content_filter=cfilter)
+        sftp = FolderTransferFTP(ftn, ftp, status,
+                                 footer_html="<b>ligne</b>",
+                                 chunk_filter=cfilter,
+                                 streaming=True)
+        data = fftp.preprocess_before_transfering(one)
+        exp = data.read()
+        fftp.close_stream(data)
+        self.assertIn(b"<b>line</b></body></html>", exp)
+        stream = sftp.preprocess_before_transfering(one)
+        stream._chunk_size = 1000
+        self.assertEqual(read_all(stream), exp)
+        sftp.close_stream(stream)
+
+        # errors are raised while the file is read
+        nobody = os.path.join(temp, "nobody.html")
+        with open(nobody, "w", encoding="utf8") as f:
+            f.write("<html>\n" * 100)
+        stream = sftp.preprocess_before_transfering(nobody)
+        self.assertRaises(FolderTransferFTPException, lambda: stream.read())
+        sftp.close_stream(stream)
+
+        def rfilter(c):
+            return None if "ligne é 1999" in c else c
+
+        sftp = FolderTransferFTP(ftn, ftp, status, chunk_filter=rfilter,
+                                 streaming=True)
+        stream = sftp.preprocess_before_transfering(html)
+        self.assertRaises(FolderTransferFTPException, lambda: stream.read())
+        sftp.close_stream(stream)
+
+    def test_folder_transfer_streaming_server(self):
+        fLOG(
+            __file__,
+            self._testMethodName,
+            OutputPrint=__name__ == "__main__")
+        try:
+            from pyftpdlib.authorizers import DummyAuthorizer
+            from pyftpdlib.handlers import FTPHandler
+            from pyftpdlib.servers import ThreadedFTPServer
+        except ImportError:
+            warnings.warn("pyftpdlib is not available, skipping " +
+                          self._testMethodName)
+            return
+
+        temp = get_temp_folder(__file__, "temp_folder_transfer_streaming_server")
+        remote = os.path.join(temp, "remote")
+        local = os.path.join(temp, "local")
+        os.mkdir(remote)
+        os.mkdir(local)
+        for name in ["a.html", "b.html"]:
+            with open(os.path.join(local, name), "w", encoding="utf8") as f:
+                f.write("<html><body>\n<p>ligne %s</p>\n</body></html>\n" % name)
+
+        authorizer = DummyAuthorizer()
+        authorizer.add_user("login", "password", remote, perm="elradfmw")
+        handler = type("Handler", (FTPHandler,), dict(authorizer=authorizer))
+        server = ThreadedFTPServer(("127.0.0.1", 0), handler)
+        port = server.address[1]
+        th = threading.Thread(target=server.serve_forever,
+                              kwargs=dict(timeout=0.1))
+        th.start()
+
+        try:
+            for n_jobs in [1, 2]:
+                status = os.path.join(temp, "status%d.txt" % n_jobs)
+                ftp = TransferFTP("127.0.0.1", "login", "password",
+                                  fLOG=fLOG, port=port)
+                fftp = FolderTransferFTP(FileTreeNode(local), ftp, status,
+                                         root_web="www%d" % n_jobs,
+                                         footer_html="<b>footer</b>",
+                                         chunk_filter=lambda c: c.replace(
+                                             "ligne", "line"),
+                                         streaming=True)
+                if n_jobs == 1:
+                    ftp.makedirs("www1")
+                done = fftp.start_transfering(n_jobs=n_jobs)
+                self.assertEqual(len(done), 2)
+                ftp.close()
+        finally:
+            server.close_all()
+            th.join()
+
+        for n_jobs in [1, 2]:
+            dest = os.path.join(remote, "www%d" % n_jobs)
+            self.assertEqual(sorted(os.listdir(dest)), ["a.html", "b.html"])
+            with open(os.path.join(dest, "a.html"), "r", encoding="utf8") as f:
+                content = f.read()
+            self.assertEqual(
+                content, "<html><body>\n<p>line a.html</p>\n<b>footer</b></body></html>\n")
 
 if __name__ == "__main__":
     unittest.main()
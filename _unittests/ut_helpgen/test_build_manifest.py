@@ -0,0 +1,97 @@
+"""
+@brief      test log(time=1s)
+"""
+
+import sys
+import os
+import unittest
+
+try:
+    import src
+except ImportError:
+    path = os.path.normpath(
+        os.path.abspath(
+            os.path.join(
+                os.path.split(__file__)[0],
+                "..",
+                "..")))
+    if path not in sys.path:
+        sys.path.append(path)
+    import src
+
+from src.pyquickhelper.loghelper.flog import fLOG
+from src.pyquickhelper.pycode.utils_tests import get_temp_folder
+from src.pyquickhelper.helpgen.build_manifest import BuildManifest, write_if_changed
+
+if sys.version_info[0] == 2:
+    from codecs import open
+
+
+class TestBuildManifest(unittest.TestCase):
+
+    def test_write_if_changed(self):
+        fLOG(
+            __file__,
+            self._testMethodName,
+            OutputPrint=__name__ == "__main__")
+
+        temp = get_temp_folder(__file__, "temp_write_if_changed")
+        name = os.path.join(temp, "index.rst")
+        self.assertTrue(write_if_changed(name, "content"))
+        self.assertFalse(write_if_changed(name, "content"))
+        self.assertTrue(write_if_changed(name, "modified"))
+        with open(name, "r", encoding="utf8") as f:
+            self.assertEqual(f.read(), "modified")
+
+    def test_build_manifest(self):
+        fLOG(
+            __file__,
+            self._testMethodName,
+            OutputPrint=__name__ == "__main__")
+
+        temp = get_temp_folder(__file__, "temp_build_manifest")
+        dest = os.path.join(temp, "dest")
+        os.mkdir(dest)
+        sources = []
+        for i in range(3):
+            name = os.path.join(temp, "f%d.py" % i)
+            with open(name, "w", encoding="utf8") as f:
+                f.write("a = %d\n" % i)
+            sources.append(name)
+        copies = [os.path.join(dest, os.path.split(s)[-1]) for s in sources]
+
+        store = os.path.join(temp, "manifest.json")
+        manifest = BuildManifest(store, fingerprint="f1")
+        for s, d in zip(sources, copies):
+            self.assertTrue(manifest.unchanged(s, d) is None)
+            with open(d, "w", encoding="utf8") as f:
+                f.write("# copied\n")
+            with open(os.path.splitext(d)[0] + ".rst", "w", encoding="utf8") as f:
+                f.write("rst\n")
+            manifest.update(s, d, (".py", 1, 0))
+        manifest.save()
+
+        manifest = BuildManifest(store, fingerprint="f1")
+        self.assertEqual(manifest.unchanged(sources[0], copies[0]),
+                         (".py", 1, 0))
+        self.assertTrue(manifest.is_skipped(copies[0]))
+
+        # the source was modified
+        with open(sources[1], "w", encoding="utf8") as f:
+            f.write("a = -1\n")
+        self.assertTrue(manifest.unchanged(sources[1], copies[1]) is None)
+
+        # the source disappeared
+        removed = manifest.remove_stale(dest)
+        self.assertEqual(len(removed), 2)
+        self.assertFalse(os.path.exists(copies[2]))
+        self.assertTrue(os.path.exists(copies[1]))
+        manifest.save()
+
+        # the options changed
+        manifest = BuildManifest(store, fingerprint="f2")
+        self.assertTrue(manifest.unchanged(sources[0], copies[0]) is None)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,69 @@
+"""
+@brief      test log(time=4s)
+"""
+
+import sys
+import os
+import unittest
+
+try:
+    import src
+except ImportError:
+    path = os.path.normpath(
+        os.path.abspath(
+            os.path.join(
+                os.path.split(__file__)[0],
+                "..",
+                "..")))
+    if path not in sys.path:
+        sys.path.append(path)
+    import src
+
+from src.pyquickhelper.loghelper.flog import fLOG
+from src.pyquickhelper.pycode.utils_tests import get_temp_folder
+from src.pyquickhelper.filehelper.synchelper import explore_folder
+from src.pyquickhelper.helpgen.utils_sphinx_doc import copy_source_files
+
+if sys.version_info[0] == 2:
+    from codecs import open
+
+
+class TestCopySourceFiles(unittest.TestCase):
+
+    def test_copy_source_files_n_jobs(self):
+        fLOG(
+            __file__,
+            self._testMethodName,
+            OutputPrint=__name__ == "__main__")
+
+        temp = get_temp_folder(__file__, "temp_copy_source_files_n_jobs")
+        path = os.path.split(__file__)[0]
+        input = os.path.normpath(os.path.join(
+            path, "..", "..", "src", "pyquickhelper", "helpgen"))
+
+        seq = copy_source_files(input, os.path.join(
+            temp, "seq"), silent=True, filter=".*[.]py$")
+        par = copy_source_files(input, os.path.join(
+            temp, "par"), silent=True, filter=".*[.]py$", n_jobs=2)
+        self.assertTrue(len(seq) > 10)
+        self.assertEqual([(_[1].name,) + _[3:] for _ in seq],
+                         [(_[1].name,) + _[3:] for _ in par])
+
+        files = explore_folder(os.path.join(temp, "seq"), ".*[.]py$")[1]
+        self.assertEqual(len(files), len(seq))
+        for name in files:
+            with open(name, "r", encoding="utf8") as f:
+                c1 = f.read()
+            rel = os.path.relpath(name, os.path.join(temp, "seq"))
+            with open(os.path.join(temp, "par", rel), "r", encoding="utf8") as f:
+                c2 = f.read()
+            self.assertEqual(c1, c2)
+
+        # a lambda function cannot be sent to another process
+        lam = copy_source_files(input, os.path.join(temp, "lam"), fmod=lambda c, f: c,
+                                silent=True, filter=".*[.]py$", n_jobs=2)
+        self.assertEqual(len(lam), len(seq))
+
+
+if __name__ == "__main__":
+    unittest.main()
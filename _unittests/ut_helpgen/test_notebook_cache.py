@@ -0,0 +1,93 @@
+"""
+@brief      test log(time=1s)
+"""
+
+import sys
+import os
+import unittest
+import shutil
+
+try:
+    import src
+except ImportError:
+    path = os.path.normpath(
+        os.path.abspath(
+            os.path.join(
+                os.path.split(__file__)[0],
+                "..",
+                "..")))
+    if path not in sys.path:
+        sys.path.append(path)
+    import src
+
+from src.pyquickhelper.loghelper.flog import fLOG
+from src.pyquickhelper.pycode.utils_tests import get_temp_folder
+from src.pyquickhelper.helpgen.notebook_cache import NotebookConversionCache
+
+if sys.version_info[0] == 2:
+    from codecs import open
+
+
+class TestNotebookCache(unittest.TestCase):
+
+    def test_notebook_cache(self):
+        fLOG(
+            __file__,
+            self._testMethodName,
+            OutputPrint=__name__ == "__main__")
+
+        temp = get_temp_folder(__file__, "temp_notebook_cache")
+        path = os.path.abspath(os.path.split(__file__)[0])
+        nb = os.path.join(path, "notebooks", "td1a_correction_session4.ipynb")
+        build1 = os.path.join(temp, "build1")
+        build2 = os.path.join(temp, "build2")
+        os.mkdir(build1)
+        os.mkdir(build2)
+
+        cache = NotebookConversionCache(
+            os.path.join(temp, "cache"), version="test")
+        key = cache.key(nb, "rst", ["rst", "html"])
+        self.assertEqual(key, cache.key(nb, "rst", ["html", "rst"]))
+        self.assertNotEqual(key, cache.key(nb, "html", ["rst", "html"]))
+        # the pdf depends on the availability of latex, not on its location
+        self.assertNotEqual(cache.key(nb, "pdf", ["pdf"], temp),
+                            cache.key(nb, "pdf", ["pdf"], os.path.join(temp, "nolatex")))
+        self.assertEqual(cache.key(nb, "pdf", ["pdf"], temp),
+                         cache.key(nb, "pdf", ["pdf"], path))
+        self.assertTrue(cache.restore(key, build1) is None)
+
+        # a conversion
+        rst = os.path.join(build1, "td1a_correction_session4.rst")
+        with open(rst, "w", encoding="utf8") as f:
+            f.write("converted")
+        images = os.path.join(build1, "td1a_correction_session4_files")
+        os.mkdir(images)
+        with open(os.path.join(images, "output.png"), "w") as f:
+            f.write("png")
+        shutil.copy(nb, build1)
+        cache.store(key, [rst, os.path.join(build1, os.path.split(nb)[-1])],
+                    [images, os.path.join(build1, "missing.docx")])
+
+        # the same notebook in another checkout
+        nb2 = os.path.join(temp, os.path.split(nb)[-1])
+        shutil.copy(nb, nb2)
+        key2 = cache.key(nb2, "rst", ["rst", "html"])
+        self.assertEqual(key, key2)
+        restored = cache.restore(key2, build2)
+        self.assertEqual([os.path.split(_)[-1] for _ in restored],
+                         ["td1a_correction_session4.rst", "td1a_correction_session4.ipynb"])
+        with open(os.path.join(build2, "td1a_correction_session4.rst"), "r", encoding="utf8") as f:
+            self.assertEqual(f.read(), "converted")
+        self.assertTrue(os.path.exists(os.path.join(
+            build2, "td1a_correction_session4_files", "output.png")))
+        self.assertEqual(cache.hits, 1)
+        self.assertEqual(cache.misses, 1)
+
+        # another version of the converter
+        cache2 = NotebookConversionCache(
+            os.path.join(temp, "cache"), version="test2")
+        self.assertNotEqual(key, cache2.key(nb, "rst", ["rst", "html"]))
+
+
+if __name__ == "__main__":
+    unittest.main()
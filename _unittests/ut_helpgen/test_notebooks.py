@@ -116,6 +116,39 @@ class TestNotebookConversion (unittest.TestCase):
         assert "from pyquickhelper import fLOG\n    fLOG(OutputPrint=False)  # by default" in text
         assert ":linenos:" in text
 
+    def test_notebook_parallel(self):
+        fLOG(
+            __file__,
+            self._testMethodName,
+            OutputPrint=__name__ == "__main__")
+
+        if sys.version_info[0] == 2:
+            return
+
+        path = os.path.abspath(os.path.split(__file__)[0])
+        fold = os.path.join(path, "notebooks")
+        nbs = [os.path.join(fold, _) for _ in sorted(os.listdir(fold))]
+        formats = ["ipynb", "html", "python", "rst"]
+
+        temp = get_temp_folder(__file__, "temp_nb_parallel")
+        seq = os.path.join(temp, "seq")
+        par = os.path.join(temp, "par")
+        os.mkdir(seq)
+        os.mkdir(par)
+
+        res1 = process_notebooks(nbs, seq, seq, formats=formats)
+        res2 = process_notebooks(nbs, par, par, formats=formats, n_jobs=3)
+        fou1 = [os.path.split(_[0])[-1] for _ in res1]
+        fou2 = [os.path.split(_[0])[-1] for _ in res2]
+        self.assertEqual(sorted(set(fou1)), sorted(set(fou2)))
+        for _ in res2:
+            assert os.path.exists(_[0])
+
+        # outputs are more recent than the notebooks, nothing is converted again
+        res3 = process_notebooks(nbs, par, par, formats=formats, n_jobs=3)
+        skipped = [_ for _ in res3 if not _[1]]
+        self.assertEqual(len(skipped), len(nbs) * len(formats))
+
     def test_short_cmd(self):
         fLOG(
             __file__,
@@ -6,6 +6,7 @@ import sys
 import os
 import unittest
 import re
+import shutil
 
 
 try:
@@ -21,7 +22,8 @@ except ImportError:
         sys.path.append(path)
     import src
 
-from src.pyquickhelper.ipythonhelper.notebook_helper import run_notebook
+from src.pyquickhelper.ipythonhelper.notebook_helper import run_notebook, execute_notebook_list, read_nb
+from src.pyquickhelper.ipythonhelper.notebook_runner import NotebookError
 from src.pyquickhelper import get_temp_folder, fLOG
 
 
@@ -52,6 +54,173 @@ class TestNotebookRunner (unittest.TestCase):
         assert "No module named 'pyquickhelper'" not in out
         assert "datetime.datetime(2015, 3, 2" in out
 
+    def test_notebook_runner_event(self):
+        fLOG(
+            __file__,
+            self._testMethodName,
+            OutputPrint=__name__ == "__main__")
+        temp = get_temp_folder(__file__, "temp_notebook_event")
+        nbfile = os.path.join(temp, "..", "data", "simple_example.ipynb")
+        addpath = os.path.normpath(os.path.join(temp, "..", "..", "..", "src"))
+        outfile = os.path.join(temp, "out_notebook.ipynb")
+
+        if sys.version_info[0] == 2:
+            return
+
+        stat, out = run_notebook(nbfile, working_dir=temp, outfilename=outfile,
+                                 additional_path=[addpath], drain="event",
+                                 cell_timeout=60)
+        fLOG(stat)
+        assert os.path.exists(outfile)
+        assert "datetime.datetime(2015, 3, 2" in out
+        self.assertEqual(len(stat["cell_times"]), stat["nbrun"])
+
+        runner = read_nb(nbfile)
+        runner.drain = "event"
+        try:
+            runner.run_cell(0, "import time\ntime.sleep(20)", timeout=1)
+            raise AssertionError("the cell should be interrupted")
+        except NotebookError as e:
+            assert "took too long" in str(e)
+        finally:
+            runner.shutdown_kernel()
+
+    def test_notebook_runner_profile(self):
+        fLOG(
+            __file__,
+            self._testMethodName,
+            OutputPrint=__name__ == "__main__")
+        temp = get_temp_folder(__file__, "temp_notebook_profile")
+        nbfile = os.path.join(temp, "..", "data", "simple_example.ipynb")
+        addpath = os.path.normpath(os.path.join(temp, "..", "..", "..", "src"))
+        outfile = os.path.join(temp, "out_notebook.ipynb")
+
+        if sys.version_info[0] == 2:
+            return
+
+        stat, out = run_notebook(nbfile, working_dir=temp, outfilename=outfile,
+                                 additional_path=[addpath], profile=True)
+        df = stat["profile"]
+        fLOG(df)
+        self.assertEqual(list(df.columns), ["cell", "wall_time", "cpu_time",
+                                            "peak_memory", "output_size"])
+        self.assertEqual(len(df), stat["nbrun"])
+        self.assertTrue((df.peak_memory > 0).all())
+        csv = os.path.join(temp, "out_notebook.profile.csv")
+        assert os.path.exists(csv)
+
+    def test_notebook_runner_stream(self):
+        fLOG(
+            __file__,
+            self._testMethodName,
+            OutputPrint=__name__ == "__main__")
+        temp = get_temp_folder(__file__, "temp_notebook_stream")
+        nbfile = os.path.join(temp, "..", "data", "simple_example.ipynb")
+        addpath = os.path.normpath(os.path.join(temp, "..", "..", "..", "src"))
+        outfile = os.path.join(temp, "out_notebook.ipynb")
+
+        if sys.version_info[0] == 2:
+            return
+
+        code = "for i in range(10000):\n    print('line', i)"
+        stat, out = run_notebook(nbfile, working_dir=temp, outfilename=outfile,
+                                 additional_path=[addpath], code_init=code,
+                                 max_output_size=1000, stream=True,
+                                 image_folder=os.path.join(temp, "images"))
+        fLOG(stat)
+        assert "output truncated" in out
+        assert "line 9999" not in out
+        runner = read_nb(outfile)
+        self.assertEqual(runner.count_code_cells(), stat["nbcell"])
+
+    def test_notebook_runner_checkpoint(self):
+        fLOG(
+            __file__,
+            self._testMethodName,
+            OutputPrint=__name__ == "__main__")
+        temp = get_temp_folder(__file__, "temp_notebook_checkpoint")
+        nbfile = os.path.join(temp, "..", "data", "simple_example.ipynb")
+        addpath = os.path.normpath(os.path.join(temp, "..", "..", "..", "src"))
+        outfile = os.path.join(temp, "out_notebook.ipynb")
+        folder = os.path.join(temp, "checkpoint")
+
+        if sys.version_info[0] == 2:
+            return
+
+        runner = read_nb(nbfile)
+        nbcells = runner.count_code_cells()
+        runner.shutdown_kernel()
+
+        # the execution fails on the last cell
+        count = [0]
+
+        def clean_function(code):
+            count[0] += 1
+            if count[0] == nbcells:
+                return code + "\nraise RuntimeError('interrupted')"
+            return code
+
+        try:
+            run_notebook(nbfile, working_dir=temp, additional_path=[addpath],
+                         checkpoint=folder, clean_function=clean_function)
+            raise AssertionError("the execution should fail")
+        except NotebookError:
+            pass
+        assert os.path.exists(os.path.join(folder, "state.json"))
+
+        stat, out = run_notebook(nbfile, working_dir=temp, outfilename=outfile,
+                                 additional_path=[addpath], checkpoint=folder)
+        fLOG(stat)
+        self.assertEqual(stat["resumed"], nbcells - 1)
+        self.assertEqual(stat["nbrun"], 1)
+        assert not os.path.exists(os.path.join(folder, "state.json"))
+        assert not os.path.exists(os.path.join(folder, "namespace"))
+
+        # the checkpoints do not change the execution count
+        stat, out = run_notebook(nbfile, working_dir=temp, outfilename=outfile,
+                                 additional_path=[addpath], checkpoint=folder)
+        runner = read_nb(outfile)
+        numbers = [_.get("prompt_number", None)
+                   for _ in runner.iter_code_cells()]
+        runner.shutdown_kernel()
+        numbers = [_ for _ in numbers if _ is not None]
+        self.assertEqual(numbers, list(
+            range(numbers[0], numbers[0] + len(numbers))))
+
+    def test_notebook_runner_parallel(self):
+        fLOG(
+            __file__,
+            self._testMethodName,
+            OutputPrint=__name__ == "__main__")
+        temp = get_temp_folder(__file__, "temp_notebook_parallel")
+        nbfile = os.path.join(temp, "..", "data", "simple_example.ipynb")
+        addpath = os.path.normpath(os.path.join(temp, "..", "..", "..", "src"))
+
+        if sys.version_info[0] == 2:
+            return
+
+        notebooks = []
+        for i in range(4):
+            name = os.path.join(temp, "simple_example_%d.ipynb" % i)
+            shutil.copy(nbfile, name)
+            notebooks.append(name)
+        # the last one is too long
+        notebooks[-1] = (notebooks[-1], "import time\ntime.sleep(20)")
+
+        res = execute_notebook_list(temp, notebooks, additional_path=[addpath],
+                                    n_jobs=2, timeout=5)
+        self.assertEqual(len(res), 4)
+        for name in notebooks[:3]:
+            success, stat, out = res[name]
+            self.assertTrue(success)
+            self.assertEqual(set(stat), {"nbcell", "nbrun", "nbvalid", "time",
+                                         "cell_times"})
+            assert os.path.exists(os.path.join(
+                temp, "out_" + os.path.split(name)[-1]))
+        success, stat, out = res[notebooks[-1][0]]
+        self.assertFalse(success)
+        assert "took too long" in str(out)
+
 
 if __name__ == "__main__":
     unittest.main()
@@ -0,0 +1,149 @@
+"""
+@brief      test log(time=2s)
+"""
+
+
+import sys
+import os
+import unittest
+
+
+try:
+    import src
+except ImportError:
+    path = os.path.normpath(
+        os.path.abspath(
+            os.path.join(
+                os.path.split(__file__)[0],
+                "..",
+                "..")))
+    if path not in sys.path:
+        sys.path.append(path)
+    import src
+
+from src.pyquickhelper import get_temp_folder
+from src.pyquickhelper.loghelper.flog import fLOG, run_cmd
+from src.pyquickhelper.loghelper.repositories.pygit_helper import get_repo_snapshot, repo_ls, get_repo_log, get_nb_commits, get_repo_version, RepositorySnapshot
+from src.pyquickhelper.filehelper import FileTreeNode
+
+
+class TestGitSnapshot(unittest.TestCase):
+
+    def git(self, folder, *args):
+        out, err = run_cmd(["git", "-c", "user.name=tester", "-c", "user.email=tester@example.com"] + list(args),
+                           wait=True, change_path=folder, shell=False, preprocess=False,
+                           log_error=False)
+        return out
+
+    def test_git_snapshot(self):
+        fLOG(
+            __file__,
+            self._testMethodName,
+            OutputPrint=__name__ == "__main__")
+
+        if sys.version_info[0] == 2 or sys.platform.startswith("win"):
+            return
+
+        temp = get_temp_folder(__file__, "temp_git_snapshot")
+        self.git(temp, "init", "-q")
+        self.git(temp, "remote", "add", "origin",
+                 "https://github.com/sdpython/pyquickhelper.git")
+        for name in ["a.txt", "sub/b.txt", "sub/c d.txt", "sub2/e.txt"]:
+            full = os.path.join(temp, *name.split("/"))
+            if not os.path.exists(os.path.dirname(full)):
+                os.makedirs(os.path.dirname(full))
+            with open(full, "w") as f:
+                f.write(name)
+        self.git(temp, "add", "a.txt", "sub")
+        self.git(temp, "commit", "-q", "-m", "first")
+        self.git(temp, "add", "sub2")
+        self.git(temp, "commit", "-q", "-m", "second")
+
+        sub = os.path.join(temp, "sub")
+        snap = get_repo_snapshot(sub)
+        self.assertEqual(snap.files, ["a.txt", "sub/b.txt",
+                                      "sub/c d.txt", "sub2/e.txt"])
+        self.assertEqual(snap.ls_folder(sub), ["sub/b.txt", "sub/c d.txt"])
+        self.assertTrue(get_repo_snapshot(temp) is snap)
+
+        for path in [temp, sub, os.path.join(temp, "sub2")]:
+            exp = sorted(str(_) for _ in repo_ls(path))
+            got = sorted(str(_) for _ in repo_ls(path, snapshot=True))
+            self.assertEqual(exp, got)
+            self.assertEqual(get_nb_commits(path),
+                             get_nb_commits(path, snapshot=True))
+            exp = get_repo_log(path)
+            got = get_repo_log(path, snapshot=True)
+            self.assertEqual(exp, got)
+        self.assertEqual(get_repo_version(sub, usedate=True),
+                         get_repo_version(sub, usedate=True, snapshot=True))
+
+        log = get_repo_log(temp, snapshot=True)
+        self.assertEqual([_[3] for _ in log], ["second", "first"])
+        self.assertEqual(get_nb_commits(sub, snapshot=True), 1)
+
+        # a new commit invalidates the snapshot
+        with open(os.path.join(temp, "f.txt"), "w") as f:
+            f.write("f")
+        self.git(temp, "add", "f.txt")
+        self.git(temp, "commit", "-q", "-m", "third")
+        self.assertFalse(snap.is_valid())
+        snap2 = get_repo_snapshot(temp)
+        self.assertFalse(snap2 is snap)
+        self.assertIn("f.txt", snap2.files)
+        self.assertEqual(get_nb_commits(temp, snapshot=True), 3)
+
+        tree = FileTreeNode(temp, repository=True)
+        names = sorted(_.name for _ in tree if not _.isdir())
+        self.assertEqual(names, sorted(["a.txt", "f.txt", os.path.join("sub", "b.txt"),
+                                        os.path.join("sub", "c d.txt"),
+                                        os.path.join("sub2", "e.txt")]))
+
+
+    def test_git_snapshot_worktree(self):
+        fLOG(
+            __file__,
+            self._testMethodName,
+            OutputPrint=__name__ == "__main__")
+
+        if sys.version_info[0] == 2 or sys.platform.startswith("win"):
+            return
+
+        temp = get_temp_folder(__file__, "temp_git_snapshot_worktree")
+        main = os.path.join(temp, "main")
+        os.makedirs(main)
+        self.git(main, "init", "-q")
+        self.git(main, "remote", "add", "origin",
+                 "https://github.com/sdpython/pyquickhelper.git")
+        with open(os.path.join(main, "a.txt"), "w") as f:
+            f.write("a")
+        self.git(main, "add", "a.txt")
+        self.git(main, "commit", "-q", "-m", "first")
+
+        # .git is a file in a worktree, the branches are in the main repository
+        wt = os.path.join(temp, "wt")
+        self.git(main, "worktree", "add", "-q", "-b", "other", wt)
+        self.assertTrue(os.path.isfile(os.path.join(wt, ".git")))
+        snap = get_repo_snapshot(wt)
+        self.assertEqual(snap.files, ["a.txt"])
+        self.assertEqual(snap.master, "https://github.com/sdpython/pyquickhelper")
+        head = self.git(wt, "rev-parse", "HEAD").strip()
+        self.assertEqual(RepositorySnapshot.current_key(snap.git)[0], head)
+
+        with open(os.path.join(wt, "b.txt"), "w") as f:
+            f.write("b")
+        self.git(wt, "add", "b.txt")
+        self.git(wt, "commit", "-q", "-m", "second")
+        self.assertFalse(snap.is_valid())
+        snap = get_repo_snapshot(wt)
+        self.assertEqual(snap.files, ["a.txt", "b.txt"])
+
+        # the branches are only stored in packed-refs
+        self.git(main, "pack-refs", "--all")
+        head = self.git(wt, "rev-parse", "HEAD").strip()
+        self.assertEqual(RepositorySnapshot.current_key(snap.git)[0], head)
+        self.assertTrue(snap.is_valid())
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,69 @@
+"""
+@brief      test log(time=1s)
+"""
+
+
+import sys
+import os
+import unittest
+
+try:
+    import src
+except ImportError:
+    path = os.path.normpath(
+        os.path.abspath(
+            os.path.join(
+                os.path.split(__file__)[0],
+                "..",
+                "..")))
+    if path not in sys.path:
+        sys.path.append(path)
+    import src
+
+from src.pyquickhelper.loghelper.flog import fLOG, flog_static
+
+
+class RecordStream:
+
+    def __init__(self):
+        self.writes = []
+        self.flushes = 0
+
+    def write(self, s):
+        self.writes.append(s)
+
+    def flush(self):
+        self.flushes += 1
+
+
+class TestLogAsync(unittest.TestCase):
+
+    def test_log_async(self):
+        fLOG(
+            __file__,
+            self._testMethodName,
+            OutputPrint=__name__ == "__main__")
+
+        stream = RecordStream()
+        previous = flog_static.store_log_values["__log_file"]
+        flog_static.store_log_values["__log_file"] = stream
+        try:
+            fLOG(Async=True)
+            for i in range(1000):
+                fLOG("message", i)
+            fLOG(Flush=True)
+            self.assertEqual(flog_static.store_log_values["__log_writer"].queue.unfinished_tasks, 0)
+            text = "".join(stream.writes)
+            lines = [_ for _ in text.split("\n") if "message" in _]
+            self.assertEqual(len(lines), 1000)
+            self.assertTrue(lines[0].endswith("message 0"))
+            self.assertTrue(lines[-1].endswith("message 999"))
+            self.assertGreater(stream.flushes, 0)
+        finally:
+            fLOG(Async=False)
+            flog_static.store_log_values["__log_file"] = previous
+        self.assertTrue(flog_static.store_log_values["__log_writer"] is None)
+
+
+if __name__ == "__main__":
+    unittest.main()
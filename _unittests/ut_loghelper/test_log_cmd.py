@@ -6,6 +6,8 @@
 import sys
 import os
 import unittest
+import time
+import subprocess
 
 
 try:
@@ -65,6 +67,44 @@ class TestLogFunc (unittest.TestCase):
         assert len(out) == 0
         assert len(err) == 0
 
+    def test_run_cmd_threads(self):
+        fLOG(
+            __file__,
+            self._testMethodName,
+            OutputPrint=__name__ == "__main__")
+
+        # a lot of data on stderr, more than the pipe can hold
+        cmd = '"{0}" -c "import sys;sys.stderr.write(\'e\'*200000);print(\'out\')"'.format(
+            sys.executable.replace("\\", "/"))
+        out, err = run_cmd(cmd, wait=True, communicate=False, log_error=False,
+                           shell=False)
+        self.assertEqual(out.strip(), "out")
+        self.assertEqual(len(err), 200000)
+
+        cmd = '"{0}" -c "import time;print(\'begin\', flush=True);time.sleep(20)"'.format(
+            sys.executable.replace("\\", "/"))
+        begin = time.perf_counter()
+        for communicate in [False, True]:
+            try:
+                run_cmd(cmd, wait=True, communicate=communicate, timeout=1,
+                        shell=False)
+                raise AssertionError("TimeoutExpired expected")
+            except subprocess.TimeoutExpired:
+                pass
+        self.assertLess(time.perf_counter() - begin, 15)
+
+        out, err = run_cmd(cmd, wait=True, communicate=False, shell=False,
+                           stop_waiting_if=lambda line: "begin" in line)
+        self.assertEqual(out.strip(), "begin")
+
+        # the error lines received before the end of the waiting are returned
+        cmd = '"{0}" -c "import sys,time;sys.stderr.write(\'warn\\n\');sys.stderr.flush();time.sleep(0.2);print(\'begin\', flush=True);time.sleep(3)"'.format(
+            sys.executable.replace("\\", "/"))
+        out, err = run_cmd(cmd, wait=True, communicate=False, shell=False, log_error=False,
+                           stop_waiting_if=lambda line: "begin" in line)
+        self.assertEqual(out.strip(), "begin")
+        self.assertEqual(err.strip(), "warn")
+
 
 if __name__ == "__main__":
     unittest.main()
@@ -22,6 +22,7 @@ except ImportError:
 
 from src.pyquickhelper.loghelper.flog import fLOG
 from src.pyquickhelper.loghelper.pyrepo_helper import SourceRepository
+from src.pyquickhelper.loghelper.repositories.pysvn_helper import RepositorySnapshot
 
 
 class TestPySvnHelper (unittest.TestCase):
@@ -43,6 +44,50 @@ class TestPySvnHelper (unittest.TestCase):
         fLOG("version", alls)
         assert isinstance(alls, int) or isinstance(alls, str)
 
+    def test_repo_snapshot(self):
+        fLOG(
+            __file__,
+            self._testMethodName,
+            OutputPrint=__name__ == "__main__")
+
+        info = """<?xml version="1.0" encoding="UTF-8"?>
+            <info>
+            <entry kind="dir" path="." revision="12">
+            <url>https://server/svn/project/trunk</url>
+            <repository><root>https://server/svn/project</root></repository>
+            <wc-info><schedule>normal</schedule></wc-info>
+            </entry>
+            <entry kind="file" path="a.txt" revision="12"></entry>
+            <entry kind="dir" path="sub" revision="11"></entry>
+            <entry kind="file" path="sub/b.txt" revision="11"></entry>
+            <entry kind="file" path="sub/new.txt" revision="0">
+            <wc-info><schedule>add</schedule></wc-info>
+            </entry>
+            </info>"""
+        log = """<?xml version="1.0" encoding="UTF-8"?>
+            <log>
+            <logentry revision="12"><author>xd</author><date>2015-06-01T10:00:00.000000Z</date>
+            <paths><path action="M">/trunk/a.txt</path></paths><msg>second</msg></logentry>
+            <logentry revision="11"><author>xd</author><date>2015-05-01T10:00:00.000000Z</date>
+            <paths><path action="A">/trunk/sub</path><path action="A">/trunk/sub/b.txt</path></paths>
+            <msg>first</msg></logentry>
+            </log>"""
+
+        root = os.path.abspath(os.path.split(__file__)[0])
+        snap = RepositorySnapshot(root, info=info)
+        snap._log = RepositorySnapshot.parse_log(log)
+        self.assertEqual(snap.revision, 12)
+        self.assertEqual(snap.prefix, "/trunk")
+        self.assertEqual(sorted(str(_) for _ in snap.ls(root)),
+                         [os.path.join(root, "a.txt"), os.path.join(root, "sub/")])
+        sub = os.path.join(root, "sub")
+        self.assertEqual([str(_) for _ in snap.ls(sub)],
+                         [os.path.join(sub, "b.txt")])
+        self.assertEqual([_[1] for _ in snap.get_log(root)], [12, 11])
+        self.assertEqual([_[1] for _ in snap.get_log(sub)], [11])
+        self.assertEqual(snap.get_log(sub)[0][3], "first")
+        self.assertEqual(snap.version(sub), 12)
+
 
 if __name__ == "__main__":
     unittest.main()
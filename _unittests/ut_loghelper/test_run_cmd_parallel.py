@@ -0,0 +1,98 @@
+"""
+@brief      test log(time=3s)
+"""
+
+
+import sys
+import os
+import unittest
+import time
+
+
+try:
+    import src
+except ImportError:
+    path = os.path.normpath(
+        os.path.abspath(
+            os.path.join(
+                os.path.split(__file__)[0],
+                "..",
+                "..")))
+    if path not in sys.path:
+        sys.path.append(path)
+    import src
+
+from src.pyquickhelper import get_temp_folder
+from src.pyquickhelper.loghelper.flog import fLOG
+from src.pyquickhelper.loghelper import run_cmd_parallel
+
+
+class TestRunCmdParallel (unittest.TestCase):
+
+    def test_run_cmd_parallel(self):
+        fLOG(
+            __file__,
+            self._testMethodName,
+            OutputPrint=__name__ == "__main__")
+        temp = get_temp_folder(__file__, "temp_run_cmd_parallel")
+        script = os.path.join(temp, "sleep.py")
+        with open(script, "w") as f:
+            f.write("import sys, time\n")
+            f.write("time.sleep(float(sys.argv[1]))\n")
+            f.write("print(sys.argv[2])\n")
+            f.write("sys.exit(int(sys.argv[3]))\n")
+
+        def cmd(delay, text, code=0):
+            return '"{0}" "{1}" {2} {3} {4}'.format(sys.executable, script,
+                                                  delay, text, code)
+
+        cmds = [dict(name="a", cmd=cmd(1, "A")),
+                dict(name="b", cmd=cmd(1, "B")),
+                dict(name="c", cmd=cmd(0, "C"), depends=["a", "b"]),
+                dict(name="d", cmd=cmd(0, "D", 3)),
+                dict(name="e", cmd=cmd(0, "E"), depends="d")]
+        begin = time.perf_counter()
+        res = run_cmd_parallel(cmds, n_jobs=4, shell=False, fLOG=fLOG)
+        duration = time.perf_counter() - begin
+        fLOG(res, duration)
+
+        self.assertEqual(set(res), {"a", "b", "c", "d", "e"})
+        for k in "abc":
+            out, err, code, d = res[k]
+            self.assertEqual(out.strip(), k.upper())
+            self.assertEqual(code, 0)
+        self.assertGreater(res["a"][3], 0.9)
+        # a and b run at the same time
+        self.assertLess(duration, 1.9)
+        self.assertEqual(res["d"][2], 3)
+        self.assertEqual(res["e"][2], None)
+        self.assertIn("failed dependencies", res["e"][1])
+
+        res = run_cmd_parallel(cmds, n_jobs=4, shell=False,
+                               skip_if_failed=False)
+        self.assertEqual(res["e"][0].strip(), "E")
+        self.assertEqual(res["e"][2], 0)
+
+        # a dependency fails if its output contains D
+        res = run_cmd_parallel(cmds, n_jobs=4, shell=False,
+                               skip_if_failed=lambda r: "D" in r[0])
+        self.assertEqual(res["c"][2], 0)
+        self.assertEqual(res["e"][2], None)
+        res = run_cmd_parallel(cmds, n_jobs=4, shell=False,
+                               skip_if_failed=lambda r: "A" in r[0])
+        self.assertEqual(res["c"][2], None)
+        self.assertEqual(res["e"][2], 0)
+
+        res = run_cmd_parallel([cmd(0, "F", 1), cmd(0.5, "G")], n_jobs=1,
+                               shell=False, stop_on_error=True)
+        self.assertEqual(res[0][2], 1)
+        self.assertEqual(res[1][2], None)
+
+        self.assertRaises(ValueError, lambda: run_cmd_parallel(
+            [dict(name="a", cmd="a", depends="b"), dict(name="b", cmd="b", depends="a")]))
+        self.assertRaises(ValueError, lambda: run_cmd_parallel(
+            [dict(name="a", cmd="a", depends="z")]))
+
+
+if __name__ == "__main__":
+    unittest.main()
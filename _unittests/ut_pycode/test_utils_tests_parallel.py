@@ -0,0 +1,92 @@
+"""
+@brief      test log(time=3s)
+"""
+
+
+import sys
+import os
+import unittest
+
+try:
+    import src
+except ImportError:
+    path = os.path.normpath(
+        os.path.abspath(
+            os.path.join(
+                os.path.split(__file__)[0],
+                "..",
+                "..")))
+    if path not in sys.path:
+        sys.path.append(path)
+    import src
+
+from src.pyquickhelper import fLOG, get_temp_folder
+from src.pyquickhelper.loghelper.flog import noLOG
+from src.pyquickhelper.pycode.utils_tests import _run_test_files_parallel, _ProcessTestResult
+
+
+class TestUtilsTestsParallel(unittest.TestCase):
+
+    def test_run_test_files_parallel(self):
+        fLOG(
+            __file__,
+            self._testMethodName,
+            OutputPrint=__name__ == "__main__")
+
+        if sys.version_info[0] == 2:
+            return
+
+        temp = get_temp_folder(__file__, "temp_utils_tests_parallel")
+        codes = {"pfast": ("self.assertEqual(1, 1)", 1),
+                 "pslow": ("time.sleep(1)", 10),
+                 "pfail": ("print('printed')\n        self.assertEqual(1, 2)", 2),
+                 "pwarn": ("warnings.warn('a warning')\n        sys.stderr.write('on stderr')", 3)}
+        order = os.path.join(temp, "order.txt")
+        todo = []
+        for i, (name, (code, t)) in enumerate(sorted(codes.items())):
+            filename = os.path.join(temp, "test_{0}.py".format(name))
+            with open(filename, "w") as f:
+                f.write("import sys, time, unittest, warnings\n")
+                f.write("with open(r'{0}', 'a') as f:\n".format(order))
+                f.write("    f.write('{0}\\n')\n\n\n".format(name))
+                f.write("class Test{0}(unittest.TestCase):\n\n".format(name))
+                f.write("    def test_{0}(self):\n        {1}\n\n".format(name, code))
+                f.write("    def test_{0}_2(self):\n        pass\n".format(name))
+            todo.append((t, i, filename, "Test" + name))
+
+        res = _run_test_files_parallel(todo, 2, flogp=noLOG)
+        fLOG(res)
+        self.assertEqual(sorted(res), [0, 1, 2, 3])
+        byname = {os.path.split(t[2])[-1]: res[t[1]] for t in todo}
+
+        fail = byname["test_pfail.py"]
+        self.assertFalse(fail["success"])
+        self.assertEqual(fail["failures"], 1)
+        self.assertEqual(fail["testsRun"], 2)
+        self.assertIn("Ran 2 tests", fail["out"])
+        self.assertIn("printed", fail["stdout"])
+
+        warn = byname["test_pwarn.py"]
+        self.assertTrue(warn["success"])
+        self.assertEqual(len(warn["warnings"]), 1)
+        self.assertIn("a warning", warn["warnings"][0])
+        self.assertEqual(warn["stderr"], "on stderr")
+
+        self.assertTrue(byname["test_pslow.py"]["success"])
+        self.assertTrue(byname["test_pfast.py"]["success"])
+
+        # the longest tests start first
+        os.remove(order)
+        _run_test_files_parallel(todo, 1, flogp=noLOG)
+        with open(order, "r") as f:
+            started = f.read().split()
+        self.assertEqual(started, ["pslow", "pwarn", "pfail", "pfast"])
+
+        r = _ProcessTestResult(2, 0, 1, False)
+        self.assertFalse(r.wasSuccessful())
+        self.assertIn("errors=0", str(r))
+        self.assertIn("failures=1", str(r))
+
+
+if __name__ == "__main__":
+    unittest.main()
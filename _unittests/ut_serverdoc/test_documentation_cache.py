@@ -0,0 +1,111 @@
+"""
+@brief      test log(time=1s)
+
+"""
+
+
+import sys
+import os
+import time
+import unittest
+import threading
+
+try:
+    import src
+except ImportError:
+    path = os.path.normpath(
+        os.path.abspath(
+            os.path.join(
+                os.path.split(__file__)[0],
+                "..",
+                "..")))
+    if path not in sys.path:
+        sys.path.append(path)
+    import src
+
+from src.pyquickhelper.loghelper.flog import fLOG
+from src.pyquickhelper.pycode.utils_tests import get_temp_folder
+from src.pyquickhelper.serverdoc.documentation_cache import DocumentationCache
+
+if sys.version_info[0] == 2:
+    from codecs import open
+
+
+class TestDocumentationCache(unittest.TestCase):
+
+    def test_documentation_cache(self):
+        fLOG(
+            __file__,
+            self._testMethodName,
+            OutputPrint=__name__ == "__main__")
+
+        temp = get_temp_folder(__file__, "temp_documentation_cache")
+        names = []
+        for i in range(4):
+            name = os.path.join(temp, "f%d.txt" % i)
+            with open(name, "w", encoding="utf8") as f:
+                f.write("content %d" % i)
+            names.append(name)
+
+        size = DocumentationCache._size("content 0")
+        cache = DocumentationCache(max_bytes=size * 3)
+        self.assertTrue(cache.get(names[0]) is None)
+        for name in names[:3]:
+            self.assertTrue(cache.put(name, "content " + name[-5]))
+        self.assertEqual(cache.get(names[0]), "content 0")
+
+        # names[1] is the least recently used one
+        cache.put(names[3], "content 3")
+        self.assertTrue(cache.get(names[1]) is None)
+        self.assertEqual(cache.get(names[0]), "content 0")
+        self.assertFalse(cache.put(names[0], "x" * size * 4))
+
+        # the file was modified
+        time.sleep(0.01)
+        with open(names[0], "w", encoding="utf8") as f:
+            f.write("modified content")
+        self.assertTrue(cache.get(names[0]) is None)
+
+        stat = cache.statistics()
+        fLOG(stat)
+        self.assertEqual(stat["hits"], 2)
+        self.assertEqual(stat["misses"], 3)
+        self.assertEqual(stat["evictions"], 1)
+        self.assertLessEqual(stat["nbytes"], stat["max_bytes"])
+
+    def test_documentation_cache_threads(self):
+        fLOG(
+            __file__,
+            self._testMethodName,
+            OutputPrint=__name__ == "__main__")
+
+        temp = get_temp_folder(__file__, "temp_documentation_cache_threads")
+        names = []
+        for i in range(20):
+            name = os.path.join(temp, "f%d.txt" % i)
+            with open(name, "w", encoding="utf8") as f:
+                f.write("content %d" % i)
+            names.append(name)
+
+        cache = DocumentationCache(
+            max_bytes=DocumentationCache._size("content 00") * 5)
+
+        def run():
+            for k in range(200):
+                name = names[k % len(names)]
+                if cache.get(name) is None:
+                    cache.put(name, "content %d" % (k % len(names)))
+
+        ths = [threading.Thread(target=run) for i in range(4)]
+        for th in ths:
+            th.start()
+        for th in ths:
+            th.join()
+        stat = cache.statistics()
+        self.assertEqual(stat["hits"] + stat["misses"], 800)
+        self.assertLessEqual(stat["nbytes"], stat["max_bytes"])
+        self.assertLessEqual(len(cache), 5)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,149 @@
+"""
+@brief      test log(time=2s)
+
+"""
+
+
+import sys
+import os
+import gzip
+import unittest
+
+if sys.version_info[0] == 2:
+    pass
+else:
+    from urllib.request import Request, urlopen
+    from urllib.error import HTTPError
+
+    try:
+        import src
+        import pyquickhelper
+    except ImportError:
+        path = os.path.normpath(
+            os.path.abspath(
+                os.path.join(
+                    os.path.split(__file__)[0],
+                    "..",
+                    "..")))
+        if path not in sys.path:
+            sys.path.append(path)
+        path = os.path.normpath(
+            os.path.abspath(
+                os.path.join(
+                    os.path.split(__file__)[0],
+                    "..",
+                    "..",
+                    "..",
+                    "pyquickhelper",
+                    "src")))
+        if path not in sys.path:
+            sys.path.append(path)
+        import src
+        import pyquickhelper
+
+    from pyquickhelper import fLOG, run_doc_server
+    from pyquickhelper.serverdoc.documentation_server import DocumentationHandler
+
+
+class TestDocumentationServerHttpCache(unittest.TestCase):
+
+    def test_server_etag_gzip(self):
+        if sys.version_info[0] == 2:
+            return
+
+        fLOG(
+            __file__,
+            self._testMethodName,
+            OutputPrint=__name__ == "__main__")
+        path = os.path.abspath(os.path.split(__file__)[0])
+        data = os.path.join(path, "data")
+
+        thread = run_doc_server(None, {"pyquickhelper": data}, True, port=8097,
+                                max_workers=2)
+        try:
+            url = "http://localhost:8097/pyquickhelper/index.html"
+            u = urlopen(Request(url))
+            raw = u.read()
+            etag = u.headers["ETag"]
+            modified = u.headers["Last-Modified"]
+            self.assertEqual(u.headers["Cache-Control"], "no-cache")
+            u.close()
+            assert etag is not None
+            assert b"GitHub/pyquickhelper</a>" in raw
+
+            # the browser already has the page
+            for headers in [{"If-None-Match": etag}, {"If-Modified-Since": modified}]:
+                try:
+                    urlopen(Request(url, headers=headers))
+                    raise AssertionError("304 expected")
+                except HTTPError as e:
+                    self.assertEqual(e.code, 304)
+            u = urlopen(Request(url, headers={"If-None-Match": 'W/"0-0"'}))
+            self.assertEqual(u.read(), raw)
+            u.close()
+
+            # compression
+            for i in range(2):
+                u = urlopen(Request(url, headers={"Accept-Encoding": "gzip"}))
+                self.assertEqual(u.headers["Content-Encoding"], "gzip")
+                compressed = u.read()
+                u.close()
+                self.assertLess(len(compressed), len(raw))
+                self.assertEqual(gzip.decompress(compressed), raw)
+
+            # static files
+            static = os.listdir(os.path.join(data, "_static"))
+            name = [_ for _ in static if os.path.isfile(
+                os.path.join(data, "_static", _))][0]
+            u = urlopen("http://localhost:8097/pyquickhelper/_static/" + name)
+            self.assertIn("max-age", u.headers["Cache-Control"])
+            u.close()
+        finally:
+            thread.shutdown()
+
+
+    def test_server_gzip_project(self):
+        if sys.version_info[0] == 2:
+            return
+
+        fLOG(
+            __file__,
+            self._testMethodName,
+            OutputPrint=__name__ == "__main__")
+        path = os.path.abspath(os.path.split(__file__)[0])
+        data = os.path.join(path, "data")
+
+        # the same folder is served by two projects,
+        # the page depends on the project
+        process_html_path = DocumentationHandler.__dict__["process_html_path"]
+        DocumentationHandler.process_html_path = staticmethod(
+            lambda project, content: content.replace(
+                "GitHub/pyquickhelper</a>", "GitHub/%s</a>" % project))
+        thread = run_doc_server(None, {"projA": data, "projB": data}, True,
+                                port=0, max_workers=2)
+        try:
+            port = thread.server.server_address[1]
+            etags = {}
+            for i in range(2):
+                for project in ["projA", "projB"]:
+                    url = "http://localhost:%d/%s/index.html" % (port, project)
+                    u = urlopen(Request(url, headers={"Accept-Encoding": "gzip"}))
+                    self.assertEqual(u.headers["Content-Encoding"], "gzip")
+                    raw = gzip.decompress(u.read())
+                    etags[project] = u.headers["ETag"]
+                    u.close()
+                    self.assertIn(("GitHub/%s</a>" % project).encode("utf-8"), raw)
+            self.assertNotEqual(etags["projA"], etags["projB"])
+
+            # the ETag of one project does not validate the page of the other one
+            url = "http://localhost:%d/projB/index.html" % port
+            u = urlopen(Request(url, headers={"If-None-Match": etags["projA"]}))
+            self.assertEqual(u.status, 200)
+            u.close()
+        finally:
+            thread.shutdown()
+            DocumentationHandler.process_html_path = process_html_path
+
+
+if __name__ == "__main__":
+    unittest.main()
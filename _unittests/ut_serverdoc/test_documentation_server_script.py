@@ -0,0 +1,207 @@
+"""
+@brief      test log(time=4s)
+
+"""
+
+
+import sys
+import os
+import unittest
+
+if sys.version_info[0] == 2:
+    pass
+else:
+    from urllib.request import urlopen
+    from urllib.error import HTTPError
+
+    try:
+        import src
+        import pyquickhelper
+    except ImportError:
+        path = os.path.normpath(
+            os.path.abspath(
+                os.path.join(
+                    os.path.split(__file__)[0],
+                    "..",
+                    "..")))
+        if path not in sys.path:
+            sys.path.append(path)
+        path = os.path.normpath(
+            os.path.abspath(
+                os.path.join(
+                    os.path.split(__file__)[0],
+                    "..",
+                    "..",
+                    "..",
+                    "pyquickhelper",
+                    "src")))
+        if path not in sys.path:
+            sys.path.append(path)
+        import src
+        import pyquickhelper
+
+    from pyquickhelper import fLOG, run_doc_server, get_temp_folder
+    from pyquickhelper.serverdoc.documentation_server import DocumentationHandler
+    from pyquickhelper.serverdoc.script_pool import ScriptWorkerPool, run_script
+
+
+class TestDocumentationServerScript(unittest.TestCase):
+
+    def test_script_pool(self):
+        if sys.version_info[0] == 2:
+            return
+
+        fLOG(
+            __file__,
+            self._testMethodName,
+            OutputPrint=__name__ == "__main__")
+        temp = get_temp_folder(__file__, "temp_script_pool")
+        script = os.path.join(temp, "script.py")
+        with open(script, "w") as f:
+            f.write("import os\nprint('pid', os.getpid(), params)\n")
+        loop = os.path.join(temp, "loop.py")
+        with open(loop, "w") as f:
+            f.write("while True:\n    pass\n")
+
+        pool = ScriptWorkerPool(1)
+        try:
+            out1, err = pool.run(script, {"a": ["1"]})
+            self.assertEqual(err, b"")
+            out2, err = pool.run(script)
+            # the same process executes both scripts
+            self.assertEqual(out1.split()[1], out2.split()[1])
+            assert b"{'a': ['1']}" in out1
+            try:
+                pool.run(loop, timeout=0.5)
+                raise AssertionError("TimeoutError expected")
+            except TimeoutError:
+                pass
+            out3, err = pool.run(script)
+            self.assertNotEqual(out3.split()[1], out2.split()[1])
+        finally:
+            pool.close()
+
+    def test_script_pool_isolation(self):
+        if sys.version_info[0] == 2:
+            return
+
+        fLOG(
+            __file__,
+            self._testMethodName,
+            OutputPrint=__name__ == "__main__")
+        temp = get_temp_folder(__file__, "temp_script_pool_isolation")
+        with open(os.path.join(temp, "mymodule_pool.py"), "w") as f:
+            f.write("value = 1\n")
+        modify = os.path.join(temp, "modify.py")
+        with open(modify, "w") as f:
+            f.write("\n".join(["import os", "import sys", "import mymodule_pool",
+                               "os.environ['SCRIPT_POOL_VAR'] = '1'",
+                               "os.chdir(os.path.dirname(__file__))",
+                               "sys.path.append('added_by_script')",
+                               "print(os.getpid())", ""]))
+        check = os.path.join(temp, "check.py")
+        with open(check, "w") as f:
+            f.write("\n".join(["import os", "import sys",
+                               "print(os.getpid())",
+                               "print(os.environ.get('SCRIPT_POOL_VAR'))",
+                               "print(os.getcwd())",
+                               "print('added_by_script' in sys.path)",
+                               "print('mymodule_pool' in sys.modules)", ""]))
+        output = os.path.join(temp, "output.py")
+        with open(output, "w") as f:
+            f.write("\n".join(["import os", "import sys", "import subprocess",
+                               "print('print')",
+                               "sys.stdout.buffer.write(b'buffer\\n')",
+                               "sys.stdout.flush()",
+                               "os.write(1, b'fd\\n')",
+                               "subprocess.call([sys.executable, '-c', 'print(\"child\")'])",
+                               "os.write(2, b'error\\n')", ""]))
+
+        pool = ScriptWorkerPool(1)
+        try:
+            out1, err = pool.run(modify)
+            self.assertEqual(err, b"")
+            out2, err = pool.run(check)
+            self.assertEqual(err, b"")
+            lines = out2.decode("utf-8").split()
+            # the same process, the changes made by the first script are gone
+            self.assertEqual(out1.split()[0], out2.split()[0])
+            self.assertEqual(lines[1], "None")
+            self.assertNotEqual(os.path.normcase(lines[2]),
+                                os.path.normcase(temp))
+            self.assertEqual(lines[3:], ["False", "False"])
+
+            out, err = pool.run(output)
+            self.assertEqual(out.split(), [b"print", b"buffer", b"fd", b"child"])
+            self.assertEqual(err.strip(), b"error")
+        finally:
+            pool.close()
+
+    def test_run_script_params(self):
+        if sys.version_info[0] == 2:
+            return
+
+        fLOG(
+            __file__,
+            self._testMethodName,
+            OutputPrint=__name__ == "__main__")
+        temp = get_temp_folder(__file__, "temp_run_script_params")
+        script = os.path.join(temp, "script.py")
+        with open(script, "w") as f:
+            f.write("print(params)\n")
+
+        out, err = run_script(script, {"a": ["1"]})
+        self.assertEqual(err, b"")
+        self.assertEqual(out.strip(), b"{'a': ['1']}")
+
+        # the server passes the parameters the same way without a pool
+        self.assertIsNone(DocumentationHandler.script_pool)
+        out, err = DocumentationHandler.execute(script, {"b": ["2"]})
+        self.assertEqual(err, b"")
+        self.assertEqual(out.strip(), b"{'b': ['2']}")
+
+    def test_server_script(self):
+        if sys.version_info[0] == 2:
+            return
+
+        fLOG(
+            __file__,
+            self._testMethodName,
+            OutputPrint=__name__ == "__main__")
+        temp = get_temp_folder(__file__, "temp_server_script")
+        with open(os.path.join(temp, "page.py"), "w") as f:
+            f.write("print('<b>%s</b>' % params.get('name', ['?'])[0])\n")
+        with open(os.path.join(temp, "loop.py"), "w") as f:
+            f.write("while True:\n    pass\n")
+
+        thread = run_doc_server(None, {"scripts": temp}, True, port=8099,
+                                script_workers=2, script_cache=True)
+        timeout = DocumentationHandler.script_timeout
+        DocumentationHandler.script_timeout = 1
+        hits = DocumentationHandler.cache.statistics()["hits"]
+        try:
+            url = "http://localhost:8099/scripts/page.py?name=doc"
+            for i in range(2):
+                u = urlopen(url)
+                self.assertEqual(u.read().strip(), b"<b>doc</b>")
+                u.close()
+            # the first execution was cached
+            self.assertEqual(DocumentationHandler.cache.statistics()["hits"], hits + 1)
+            u = urlopen(url.replace("doc", "other"))
+            self.assertEqual(u.read().strip(), b"<b>other</b>")
+            u.close()
+            try:
+                urlopen("http://localhost:8099/scripts/loop.py")
+                raise AssertionError("404 expected")
+            except HTTPError as e:
+                self.assertEqual(e.code, 404)
+        finally:
+            DocumentationHandler.script_timeout = timeout
+            DocumentationHandler.script_cache = False
+            DocumentationHandler.script_pool.close()
+            DocumentationHandler.script_pool = None
+            thread.shutdown()
+
+
+if __name__ == "__main__":
+    unittest.main()
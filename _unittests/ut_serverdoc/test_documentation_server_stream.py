@@ -0,0 +1,108 @@
+"""
+@brief      test log(time=2s)
+
+"""
+
+
+import sys
+import os
+import unittest
+
+if sys.version_info[0] == 2:
+    pass
+else:
+    from urllib.request import Request, urlopen
+    from urllib.error import HTTPError
+
+    try:
+        import src
+        import pyquickhelper
+    except ImportError:
+        path = os.path.normpath(
+            os.path.abspath(
+                os.path.join(
+                    os.path.split(__file__)[0],
+                    "..",
+                    "..")))
+        if path not in sys.path:
+            sys.path.append(path)
+        path = os.path.normpath(
+            os.path.abspath(
+                os.path.join(
+                    os.path.split(__file__)[0],
+                    "..",
+                    "..",
+                    "..",
+                    "pyquickhelper",
+                    "src")))
+        if path not in sys.path:
+            sys.path.append(path)
+        import src
+        import pyquickhelper
+
+    from pyquickhelper import fLOG, run_doc_server, get_temp_folder
+    from pyquickhelper.serverdoc.documentation_server import DocumentationHandler
+
+
+class TestDocumentationServerStream(unittest.TestCase):
+
+    def test_server_stream_range(self):
+        if sys.version_info[0] == 2:
+            return
+
+        fLOG(
+            __file__,
+            self._testMethodName,
+            OutputPrint=__name__ == "__main__")
+        temp = get_temp_folder(__file__, "temp_server_stream")
+        name = os.path.join(temp, "big.pdf")
+        content = bytes(bytearray(i % 251 for i in range(
+            DocumentationHandler.stream_min_size * 3)))
+        with open(name, "wb") as f:
+            f.write(content)
+
+        thread = run_doc_server(None, {"bigfiles": temp}, True, port=8098)
+        try:
+            url = "http://localhost:8098/bigfiles/big.pdf"
+            u = urlopen(url)
+            self.assertEqual(u.headers["Content-Type"], "application/pdf")
+            self.assertEqual(u.headers["Accept-Ranges"], "bytes")
+            self.assertEqual(u.read(), content)
+            u.close()
+            # big files are not cached
+            self.assertTrue(DocumentationHandler.cache.get(name) is None)
+
+            for rng, exp in [("bytes=10-19", content[10:20]),
+                             ("bytes=-5", content[-5:]),
+                             ("bytes=%d-" % (len(content) - 3), content[-3:])]:
+                u = urlopen(Request(url, headers={"Range": rng}))
+                self.assertEqual(u.status, 206)
+                self.assertEqual(u.read(), exp)
+                u.close()
+
+            # If-Range: a weak ETag does not validate the range
+            u = urlopen(url)
+            etag, modified = u.headers["ETag"], u.headers["Last-Modified"]
+            u.close()
+            u = urlopen(Request(url, headers={"Range": "bytes=10-19",
+                                              "If-Range": etag}))
+            self.assertEqual(u.status, 200)
+            self.assertEqual(u.read(), content)
+            u.close()
+            u = urlopen(Request(url, headers={"Range": "bytes=10-19",
+                                              "If-Range": modified}))
+            self.assertEqual(u.status, 206)
+            self.assertEqual(u.read(), content[10:20])
+            u.close()
+
+            try:
+                urlopen(Request(url, headers={"Range": "bytes=%d-" % len(content)}))
+                raise AssertionError("416 expected")
+            except HTTPError as e:
+                self.assertEqual(e.code, 416)
+        finally:
+            thread.shutdown()
+
+
+if __name__ == "__main__":
+    unittest.main()
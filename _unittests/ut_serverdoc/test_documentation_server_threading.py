@@ -0,0 +1,112 @@
+"""
+@brief      test log(time=10s)
+
+"""
+
+
+import sys
+import os
+import unittest
+import socket
+import time
+
+if sys.version_info[0] == 2:
+    pass
+else:
+    try:
+        import src
+        import pyquickhelper
+    except ImportError:
+        path = os.path.normpath(
+            os.path.abspath(
+                os.path.join(
+                    os.path.split(__file__)[0],
+                    "..",
+                    "..")))
+        if path not in sys.path:
+            sys.path.append(path)
+        path = os.path.normpath(
+            os.path.abspath(
+                os.path.join(
+                    os.path.split(__file__)[0],
+                    "..",
+                    "..",
+                    "..",
+                    "pyquickhelper",
+                    "src")))
+        if path not in sys.path:
+            sys.path.append(path)
+        import src
+        import pyquickhelper
+
+    from pyquickhelper import fLOG, run_doc_server, get_url_content
+    from urllib.error import HTTPError
+
+
+class TestDocumentationServerThreading(unittest.TestCase):
+
+    def test_server_threading(self):
+        if sys.version_info[0] == 2:
+            return
+
+        fLOG(
+            __file__,
+            self._testMethodName,
+            OutputPrint=__name__ == "__main__")
+        path = os.path.abspath(os.path.split(__file__)[0])
+        data = os.path.join(path, "data")
+
+        pool = run_doc_server(None, {"pyquickhelper": data}, True, port=0,
+                              max_workers=2, max_pending=2)
+        server = pool.server
+        port = server.server_address[1]
+        url = "http://localhost:%d/pyquickhelper/index.html" % port
+
+        def wait_pending(expected):
+            begin = time.perf_counter()
+            while server.pending != expected:
+                if time.perf_counter() - begin > 10:
+                    raise AssertionError("pending={0} != {1}".format(
+                        server.pending, expected))
+                time.sleep(0.01)
+
+        slows = []
+        try:
+            # a slow client sends an incomplete request and holds a thread
+            slow = socket.create_connection(("localhost", port))
+            slows.append(slow)
+            slow.sendall(b"GET /pyquickhelper/index.html HTTP/1.0\r\n")
+            wait_pending(1)
+
+            # the second thread still serves the other requests
+            for i in range(3):
+                cont = get_url_content(url)
+                assert "GitHub/pyquickhelper</a>" in cont
+                wait_pending(1)
+
+            # a second slow client, the server is full
+            slow2 = socket.create_connection(("localhost", port))
+            slows.append(slow2)
+            slow2.sendall(b"GET /pyquickhelper/index.html HTTP/1.0\r\n")
+            wait_pending(2)
+            try:
+                get_url_content(url)
+                raise AssertionError("a 503 error is expected")
+            except HTTPError as e:
+                self.assertEqual(e.code, 503)
+
+            # the slow clients leave, the server accepts requests again
+            for s in slows:
+                s.close()
+            wait_pending(0)
+            cont = get_url_content(url)
+            assert "GitHub/pyquickhelper</a>" in cont
+        finally:
+            for s in slows:
+                s.close()
+            pool.shutdown()
+        self.assertEqual(server.pending, 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
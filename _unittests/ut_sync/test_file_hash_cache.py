@@ -0,0 +1,110 @@
+"""
+@brief      test log(time=1s)
+"""
+
+import sys
+import os
+import unittest
+
+try:
+    import src
+except ImportError:
+    path = os.path.normpath(
+        os.path.abspath(
+            os.path.join(
+                os.path.split(__file__)[0],
+                "..",
+                "..")))
+    if path not in sys.path:
+        sys.path.append(path)
+    import src
+
+from src.pyquickhelper.loghelper.flog import fLOG
+from src.pyquickhelper.pycode.utils_tests import get_temp_folder
+from src.pyquickhelper.filehelper.file_hash_cache import FileHashCache
+from src.pyquickhelper.filehelper.file_info import checksum_md5
+from src.pyquickhelper.filehelper.synchelper import synchronize_folder
+
+
+class TestFileHashCache(unittest.TestCase):
+
+    def test_file_hash_cache(self):
+        fLOG(
+            __file__,
+            self._testMethodName,
+            OutputPrint=__name__ == "__main__")
+
+        temp = get_temp_folder(__file__, "temp_file_hash_cache")
+        files = []
+        for i in range(3):
+            name = os.path.join(temp, "f%d.txt" % i)
+            with open(name, "w") as f:
+                f.write("content %d" % i)
+            files.append(name)
+
+        store = os.path.join(temp, "hash_cache.txt")
+        cache = FileHashCache(store, max_entries=2)
+        md5s = [cache.md5(f) for f in files]
+        self.assertEqual(md5s, [checksum_md5(f) for f in files])
+        self.assertEqual(len(set(md5s)), 3)
+        self.assertEqual(cache.misses, 3)
+        self.assertEqual(len(cache), 2)
+        cache.save()
+
+        cache = FileHashCache(store, max_entries=2)
+        self.assertEqual(len(cache), 2)
+        self.assertEqual(checksum_md5(files[2], cache=cache), md5s[2])
+        self.assertEqual(cache.hits, 1)
+        self.assertEqual(cache.misses, 0)
+
+        with open(files[2], "w") as f:
+            f.write("modified content")
+        self.assertNotEqual(cache.md5(files[2]), md5s[2])
+        self.assertEqual(cache.misses, 1)
+
+        # a filename with a tabulation and a new line
+        if not sys.platform.startswith("win"):
+            name = os.path.join(temp, "f\tname\n.txt")
+            with open(name, "w") as f:
+                f.write("special")
+            md = cache.md5(name)
+            cache.save()
+            cache = FileHashCache(store, max_entries=2)
+            self.assertEqual(len(cache), 2)
+            self.assertEqual(cache.md5(name), md)
+            self.assertEqual(cache.hits, 1)
+
+    def test_synchronize_hash_cache(self):
+        fLOG(
+            __file__,
+            self._testMethodName,
+            OutputPrint=__name__ == "__main__")
+
+        temp = get_temp_folder(__file__, "temp_synchronize_hash_cache")
+        p1 = os.path.join(temp, "p1")
+        p2 = os.path.join(temp, "p2")
+        os.mkdir(p1)
+        os.mkdir(p2)
+        for i in range(3):
+            with open(os.path.join(p1, "f%d.txt" % i), "w") as f:
+                f.write("content %d" % i)
+
+        store = os.path.join(temp, "hash_cache.txt")
+        a = synchronize_folder(p1, p2, hash_cache=store)
+        self.assertEqual(len(a), 3)
+
+        # the copies are more recent, the checksums are computed
+        b = synchronize_folder(p1, p2, hash_cache=store)
+        self.assertEqual(len(b), 0)
+        self.assertTrue(os.path.exists(store))
+
+        cache = FileHashCache(store)
+        self.assertEqual(len(cache), 6)
+        c = synchronize_folder(p1, p2, hash_cache=cache)
+        self.assertEqual(len(c), 0)
+        self.assertEqual(cache.hits, 6)
+        self.assertEqual(cache.misses, 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -81,6 +81,7 @@ from .filehelper.files_status import FilesStatus
 from .filehelper.ftp_transfer import TransferFTP
 from .filehelper.ftp_transfer_files import FolderTransferFTP
 from .filehelper.file_tree_node import FileTreeNode
+from .filehelper.file_hash_cache import FileHashCache
 from .filehelper.anyfhelper import change_file_status
 from .texthelper.diacritic_helper import remove_diacritics
 from .pycode.utils_tests import get_temp_folder, main_wrapper_tests
@@ -26,6 +26,7 @@ from .synchelper import explore_folder_iterfile, explore_folder_iterfile_repo
 from .visual_sync import create_visual_diff_through_html, create_visual_diff_through_html_files
 from .compression_helper import zip_files, gzip_files, zip7_files
 from .file_tree_node import FileTreeNode
+from .file_hash_cache import FileHashCache
 from .internet_helper import download, read_url
 from .anyfhelper import change_file_status, read_content_ufs
 from .download_helper import get_url_content_timeout, InternetException
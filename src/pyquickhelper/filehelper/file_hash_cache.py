@@ -0,0 +1,158 @@
+# -*- coding: utf-8 -*-
+"""
+@file
+@brief      Defines class @see cl FileHashCache
+
+.. versionadded:: 1.2
+"""
+
+import os
+import sys
+import json
+import hashlib
+import threading
+from collections import OrderedDict
+
+from ..loghelper.flog import noLOG
+
+if sys.version_info[0] == 2:
+    from codecs import open
+
+
+class FileHashCache:
+
+    """
+    stores the MD5 checksum of files on disk,
+    a checksum is reused as long as the size, the modification time
+    (in nanoseconds) and the inode of the file did not change,
+    the cache keeps at most *max_entries* files and evicts the least recently
+    used ones
+
+    @code
+    cache = FileHashCache("hash_cache.txt")
+    md5 = cache.md5("c:/mydata/file.txt")
+    cache.save()
+    @endcode
+
+    The cache is stored in a text file, one line per file,
+    every line is a JSON list ``[filename, size, mtime_ns, inode, md5]``,
+    a filename can contain any character (tabulation, new line).
+    """
+
+    def __init__(self, file=None, max_entries=200000, fLOG=noLOG):
+        """
+        constructor
+
+        @param      file            file which stores the cache, None to keep it in memory
+        @param      max_entries     maximum number of stored checksums
+        @param      fLOG            logging function
+        """
+        self._file = file
+        self.max_entries = max_entries
+        self.LOG = fLOG
+        self._lock = threading.Lock()
+        self._cache = OrderedDict()
+        self._modified = False
+        self.hits = 0
+        self.misses = 0
+
+        if file is not None and os.path.exists(file):
+            self._load()
+
+    def _load(self):
+        """
+        private: loads the cache from the disk, corrupted lines are skipped
+        """
+        with open(self._file, "r", encoding="utf8") as f:
+            for line in f:
+                try:
+                    spl = json.loads(line)
+                    if not isinstance(spl, list) or len(spl) != 5:
+                        raise ValueError("5 values are expected")
+                    self._cache[spl[0]] = (
+                        int(spl[1]), int(spl[2]), int(spl[3]), spl[4])
+                except (ValueError, TypeError):
+                    self.LOG(
+                        "[FileHashCache] unable to read line", line.strip("\r\n"))
+        while len(self._cache) > self.max_entries:
+            self._cache.popitem(last=False)
+
+    def save(self, file=None):
+        """
+        saves the cache on disk if it was modified
+
+        @param      file        filename, None to use the one given to the constructor
+        """
+        if file is None:
+            file = self._file
+            if file is None or not self._modified:
+                return
+        with self._lock:
+            rows = [json.dumps([k, v[0], v[1], v[2], v[3]]) + "\n"
+                    for k, v in self._cache.items()]
+            self._modified = False
+        with open(file, "w", encoding="utf8") as f:
+            for r in rows:
+                f.write(r)
+
+    def __len__(self):
+        """
+        returns the number of stored checksums
+        """
+        return len(self._cache)
+
+    @staticmethod
+    def _key(st):
+        """
+        private: returns the values which must not change to reuse a checksum
+
+        @param      st      result of ``os.stat``
+        @return             tuple ``(size, mtime_ns, inode)``
+        """
+        return st.st_size, st.st_mtime_ns, st.st_ino
+
+    def md5(self, filename):
+        """
+        returns the MD5 checksum of a file, the file is only read
+        if the checksum is not in the cache or if the file was modified
+
+        @param      filename        filename
+        @return                     string
+        """
+        name = os.path.abspath(filename)
+        key = FileHashCache._key(os.stat(name))
+
+        with self._lock:
+            value = self._cache.get(name, None)
+            if value is not None and value[:3] == key:
+                self._cache.move_to_end(name)
+                self.hits += 1
+                return value[3]
+            self.misses += 1
+
+        md = FileHashCache.compute_md5(name)
+
+        with self._lock:
+            self._cache[name] = key + (md,)
+            self._cache.move_to_end(name)
+            while len(self._cache) > self.max_entries:
+                self._cache.popitem(last=False)
+            self._modified = True
+        return md
+
+    @staticmethod
+    def compute_md5(filename, block_size=1024 ** 2):
+        """
+        computes the MD5 checksum of a file without any cache
+
+        @param      filename        filename
+        @param      block_size      the file is read by blocks of this size
+        @return                     string
+        """
+        m = hashlib.md5()
+        with open(filename, "rb") as f:
+            block = f.read(block_size)
+            while block:
+                m.update(block)
+                block = f.read(block_size)
+        return m.hexdigest()
@@ -5,9 +5,10 @@
 """
 
 import datetime
-import hashlib
 import sys
 
+from .file_hash_cache import FileHashCache
+
 
 def convert_st_date_to_datetime(t):
     """
@@ -25,31 +26,21 @@ def convert_st_date_to_datetime(t):
         return datetime.datetime.fromtimestamp(t)
 
 
-def checksum_md5(filename):
+def checksum_md5(filename, cache=None):
     """
     computes MD5 for a file
 
     @param      filename        filename
-    @return                     string or None if there was an error
+    @param      cache           @see cl FileHashCache or None, if not None,
+                                the checksum is not computed again if the file did not change
+    @return                     string
+
+    .. versionchanged:: 1.2
+        Parameter *cache* was added.
     """
-    fname = filename
-    block_size = 0x10000
-    fd = open(fname, "rb")
-    try:
-        block = [fd.read(block_size)]
-        while len(block[-1]) > 0:
-            block.append(fd.read(block_size))
-        contents = block
-        zero = hashlib.md5()
-        i = 0
-        for el in contents:
-            i += 1
-            zero.update(el)
-        m = zero
-        return m.hexdigest()
-    finally:
-        fd.close()
-        return None
+    if cache is not None:
+        return cache.md5(filename)
+    return FileHashCache.compute_md5(filename, block_size=0x10000)
 
 
 class FileInfo:
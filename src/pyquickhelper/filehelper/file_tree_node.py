@@ -10,13 +10,13 @@ import re
 import datetime
 import time
 import shutil
-import hashlib
 import sys
 
 
 from ..loghelper.pqh_exception import PQHException
 from ..loghelper.flog import noLOG
 from ..loghelper.pyrepo_helper import SourceRepository
+from .file_hash_cache import FileHashCache
 
 
 class FileTreeNode:
@@ -85,7 +85,10 @@ class FileTreeNode:
                  repository=False,
                  log=False,
                  log1=False,
-                 fLOG=noLOG):
+                 fLOG=noLOG,
+                 walker="listdir",
+                 n_jobs=None,
+                 entry=None):
         """
         define a file, relative to a root
         @param      root            root (it must exist)
@@ -100,9 +103,22 @@ class FileTreeNode:
         @param      log             log every explored folder
         @param      log1            intermediate logs (first level)
         @param      fLOG            logging function to use
+        @param      walker          ``"listdir"`` (default) explores the folders with ``os.listdir``
+                                    and one call to ``os.stat`` per file, ``"scandir"`` relies on ``os.scandir``
+                                    and explores the subfolders with a pool of threads
+                                    (ignored if *repository* is True or if ``os.scandir`` is not
+                                    available, before Python 3.5)
+        @param      n_jobs          number of threads used by the walker ``"scandir"``
+                                    (None for the default value of ``ThreadPoolExecutor``)
+        @param      entry           ``os.DirEntry`` already retrieved for this file,
+                                    it avoids calling ``os.stat`` again, the node does not explore
+                                    its content in that case, the caller is expected to do it
 
         .. versionchanged:: 1.1
             Parameter *fLOG* was added.
+
+        .. versionchanged:: 1.2
+            Parameters *walker*, *n_jobs*, *entry* were added.
         """
         self._root = root
         self._file = None if file is None else file
@@ -122,6 +138,13 @@ class FileTreeNode:
         if not os.path.isdir(root):
             raise PQHException("path %s is not a folder" % root)
 
+        if walker not in ("listdir", "scandir"):
+            raise ValueError("unexpected value for walker: {0}".format(walker))
+
+        if entry is not None:
+            self._fillstat(entry)
+            return
+
         if self._file is not None:
             if not self.exists():
                 raise PQHException(
@@ -137,7 +160,10 @@ class FileTreeNode:
                 def fil(root, path, f, dir, e=exp):
                     return dir or (e.search(f) is not None)
 
-                self._fill(fil, repository=repository)
+                filter = fil
+
+            if walker == "scandir" and not repository and hasattr(os, "scandir"):
+                self._fill_scandir(filter, n_jobs=n_jobs)
             else:
                 self._fill(filter, repository=repository)
 
@@ -183,24 +209,21 @@ class FileTreeNode:
         """
         return self.get_fullname()
 
-    def hash_md5_readfile(self):
+    def hash_md5_readfile(self, cache=None):
         """
         compute a hash of a file
 
+        @param      cache       @see cl FileHashCache or None,
+                                the file is not read again if its checksum is in the cache
         @return     string
+
+        .. versionchanged:: 1.2
+            Parameter *cache* was added.
         """
         filename = self.get_fullname()
-        f = open(filename, 'rb')
-        m = hashlib.md5()
-        readBytes = 1024 ** 2  # read 1024 bytes per time
-        totalBytes = 0
-        while readBytes:
-            readString = f.read(readBytes)
-            m.update(readString)
-            readBytes = len(readString)
-            totalBytes += readBytes
-        f.close()
-        return m.hexdigest()
+        if cache is not None:
+            return cache.md5(filename)
+        return FileHashCache.compute_md5(filename)
 
     def get_content(self, encoding="utf8"):
         """
@@ -236,17 +259,26 @@ class FileTreeNode:
         """
         return os.path.exists(self.get_fullname())
 
-    def _fillstat(self):
+    def _fillstat(self, entry=None):
         """
         private: fill _type, _size
+
+        @param      entry       ``os.DirEntry`` or None, if not None,
+                                the function uses its cached information
         """
-        full = self.get_fullname()
-        if os.path.isfile(full):
+        if entry is None:
+            full = self.get_fullname()
+            isfile = os.path.isfile(full)
+            stat = os.stat(full)
+        else:
+            isfile = entry.is_file()
+            stat = entry.stat()
+
+        if isfile:
             self._type = "file"
         else:
             self._type = "folder"
 
-        stat = os.stat(self.get_fullname())
         self._size = stat.st_size
         temp = datetime.datetime.utcfromtimestamp(stat.st_mtime)
         self._date = temp
@@ -284,9 +316,17 @@ class FileTreeNode:
     def repo_ls(self, path):
         """
         call ls of an instance of @see cl SourceRepository
+
+        .. versionchanged:: 1.2
+            The repository is shared with the parent node, git and SVN repositories are explored
+            with a cached snapshot (see @see cl SourceRepository), it runs
+            one command for the whole tree.
         """
         if "_repo_" not in self.__dict__:
-            self._repo_ = SourceRepository(True)
+            if self._parent is not None:
+                self._repo_ = self._parent.__dict__.get("_repo_", None)
+            if self.__dict__.get("_repo_", None) is None:
+                self._repo_ = SourceRepository(True, snapshot=True)
         return self._repo_.ls(path)
 
     def _fill(self, filter, repository):
@@ -341,6 +381,96 @@ class FileTreeNode:
                 else:
                     self._children.append(n)
 
+    def _fill_scandir(self, filter, n_jobs=None):
+        """
+        look for subfolders with ``os.scandir``,
+        every folder is explored by a pool of threads,
+        the result is the same as @see me _fill
+
+        @param      filter      boolean function
+        @param      n_jobs      number of threads (None for the default value)
+
+        .. versionadded:: 1.2
+        """
+        from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+
+        if not self.isdir():
+            raise PQHException(
+                "unable to look into a file %s full %s" % (self._file, self.get_fullname()))
+
+        with ThreadPoolExecutor(max_workers=n_jobs) as executor:
+            running = {executor.submit(self._scan_folder, self, filter)}
+            while running:
+                done, running = wait(running, return_when=FIRST_COMPLETED)
+                for fut in done:
+                    for sub in fut.result():
+                        running.add(executor.submit(
+                            self._scan_folder, sub, filter))
+
+        FileTreeNode._remove_empty_folders(self)
+
+    @staticmethod
+    def _scan_folder(node, filter):
+        """
+        private: fill the children of *node* without going further,
+        used by @see me _fill_scandir
+
+        @param      node        @see cl FileTreeNode
+        @param      filter      boolean function
+        @return                 list of children which are folders
+        """
+        full = node.get_fullname()
+        fi = "" if node._file is None else node._file
+        it = os.scandir(full)
+        try:
+            entries = list(it)
+        finally:
+            # the iterator holds a file descriptor until it is closed (Python >= 3.6)
+            if hasattr(it, "close"):
+                it.close()
+        entries.sort(key=lambda e: e.name)
+
+        node._children = []
+        for e in entries:
+            if node._log1:
+                node.fLOG("[FileTreeNode], entering", e.name)
+            try:
+                isdir = e.is_dir()
+                if filter is not None and not filter(node._root, fi, e.name, isdir):
+                    continue
+                n = FileTreeNode(node._root,
+                                 os.path.join(fi, e.name),
+                                 level=node._level + 1,
+                                 parent=node,
+                                 log=node._log,
+                                 log1=node._log1 or node._log,
+                                 fLOG=node.fLOG,
+                                 entry=e)
+            except FileNotFoundError as ex:
+                node.fLOG(
+                    "a folder should exist, but is it is not, we continue [opt=scandir]")
+                node.fLOG(ex)
+                continue
+            node._children.append(n)
+
+        return [n for n in node._children if n._type == "folder"]
+
+    @staticmethod
+    def _remove_empty_folders(node):
+        """
+        private: remove every empty subfolder as @see me _fill does
+
+        @param      node        @see cl FileTreeNode
+        @return                 number of remaining children
+        """
+        children = []
+        for n in node._children:
+            if n._type == "folder" and FileTreeNode._remove_empty_folders(n) == 0:
+                continue
+            children.append(n)
+        node._children = children
+        return len(children)
+
     def get(self):
         """
         return a dictionary with some values which describe the file
@@ -408,11 +538,18 @@ class FileTreeNode:
                     res[node._file] = node
         return res
 
-    def sign(self, node, hash_size):
+    def sign(self, node, hash_size, cache=None):
         """
         return ==, < or > according the dates
         if the size is not too big, if the sign is "<" or ">",
         applies the hash method
+
+        @param      node        other node
+        @param      hash_size   above this size, we do not compute the hash key
+        @param      cache       @see cl FileHashCache or None
+
+        .. versionchanged:: 1.2
+            Parameter *cache* was added.
         """
         if self._date == node._date:
             return "=="
@@ -421,8 +558,8 @@ class FileTreeNode:
             ) or self._size != node._size or node._size > hash_size:
                 return "<"
             else:
-                h1 = self.hash_md5_readfile()
-                h2 = node.hash_md5_readfile()
+                h1 = self.hash_md5_readfile(cache)
+                h2 = node.hash_md5_readfile(cache)
                 if h1 != h2:
                     return "<"
                 else:
@@ -432,20 +569,22 @@ class FileTreeNode:
             ) or self._size != node._size or node._size > hash_size:
                 return ">"
             else:
-                h1 = self.hash_md5_readfile()
-                h2 = node.hash_md5_readfile()
+                h1 = self.hash_md5_readfile(cache)
+                h2 = node.hash_md5_readfile(cache)
                 if h1 != h2:
                     return ">"
                 else:
                     return "=="
 
-    def difference(self, node, hash_size=1024 ** 2 * 2, lower=False):
+    def difference(self, node, hash_size=1024 ** 2 * 2, lower=False, cache=None):
         """
         return the differences with another folder
 
         @param      node        other node
         @param      hash_size   above this size, we do not compute the hash key
         @param      lower       if True, every filename is converted into lower case
+        @param      cache       @see cl FileHashCache or None, it avoids computing
+                                the same checksums every time the function is called
         @return                 list of [ (``?``, self._file, node (in self), node (in node)) ], see below for the choice of ``?``
 
         The question mark ``?`` means:
@@ -455,6 +594,8 @@ class FileTreeNode:
             - ``>+`` absent in node
             - ``<+`` absent in self
 
+        .. versionchanged:: 1.2
+            Parameter *cache* was added.
         """
         ti = time.clock()
         d1 = self.get_dict(lower=lower)
@@ -469,7 +610,7 @@ class FileTreeNode:
             if k not in d2:
                 res.append((k, ">+", v, None))
             else:
-                res.append((k, v.sign(d2[k], hash_size), v, d2[k]))
+                res.append((k, v.sign(d2[k], hash_size, cache=cache), v, d2[k]))
             nb += 1
 
         for k, v in d2.items():
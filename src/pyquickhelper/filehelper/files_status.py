@@ -9,13 +9,10 @@
 
 import os
 import datetime
-import sys
 
 from ..loghelper.flog import noLOG
 from .file_info import convert_st_date_to_datetime, checksum_md5, FileInfo
-
-if sys.version_info[0] == 2:
-    from codecs import open
+from .files_status_backend import create_files_status_backend
 
 
 class FilesStatus:
@@ -30,46 +27,45 @@ class FilesStatus:
 
     """
 
-    def __init__(self, file, fLOG=noLOG):
+    def __init__(self, file, fLOG=noLOG, hash_cache=None, backend=None):
         """
         file which will contains the status
         @param      file            file, if None, fill _children
         @param      fLOG            logging function
+        @param      hash_cache      @see cl FileHashCache or None, it avoids
+                                    reading a file again to compute its checksum if it did not change
+        @param      backend         storage of the status, None, ``"text"``, ``"sqlite"``
+                                    or an instance of a backend,
+                                    see @see fn create_files_status_backend
+
+        The text backend loads the whole status in memory and writes everything
+        back every time @see me save_dates is called. The SQLite backend
+        looks up files one by one and commits modifications by batches,
+        an existing text status file is migrated the first time it is used.
+
+        .. versionchanged:: 1.2
+            Parameters *hash_cache*, *backend* were added.
         """
         self._file = file
-        self.copyFiles = {}
+        self.hash_cache = hash_cache
         self.fileKeep = file
         self.LOG = fLOG
-
-        if os.path.exists(self.fileKeep):
-            with open(self.fileKeep, "r", encoding="utf8") as f:
-                for ni, _ in enumerate(f.readlines()):
-                    if ni == 0 and _.startswith("\ufeff"):
-                        _ = _[len("\ufeff"):]
-                    spl = _.strip("\r\n ").split("\t")
-                    try:
-                        if len(spl) >= 2:
-                            a, b = spl[:2]
-                            obj = FileInfo(a, int(b), None, None, None)
-                            if len(spl) > 2 and len(spl[2]) > 0:
-                                obj.set_date(
-                                    convert_st_date_to_datetime(spl[2]))
-                            if len(spl) > 3 and len(spl[3]) > 0:
-                                obj.set_mdate(
-                                    convert_st_date_to_datetime(spl[3]))
-                            if len(spl) > 4 and len(spl[4]) > 0:
-                                obj.set_md5(spl[4])
-                            self.copyFiles[a] = obj
-                        else:
-                            raise ValueError(
-                                "expecting a filename and a date on this line: " + _)
-                    except Exception as e:
-                        raise Exception(
-                            "issue with line:\n  {0} -- {1}".format(_, spl)) from e
+        self._backend = create_files_status_backend(file, backend, fLOG=fLOG)
+        self.copyFiles = self._backend.load()
 
         # contains all file to update
         self.modifiedFile = {}
 
+    @property
+    def incremental(self):
+        """
+        tells if the backend stores every modification
+        without waiting for @see me save_dates to be called
+
+        .. versionadded:: 1.2
+        """
+        return self._backend.incremental
+
     def __iter__(self):
         """
         iterates on all files stored in the current file, yield a couple ( filename, FileInfo )
@@ -90,37 +86,33 @@ class FilesStatus:
 
         @param      checkfile       check the status for file checkfile
         """
-        typstr = str  # unicode#
         if checkfile is None:
             checkfile = []
-        rows = []
-        for k in sorted(self.copyFiles):
+        for k in checkfile:
+            if k not in self.copyFiles:
+                continue
             obj = self.copyFiles[k]
-            da = "" if obj.date is None else str(obj.date)
-            mda = "" if obj.mdate is None else str(obj.mdate)
-            sum5 = "" if obj.checksum is None else str(obj.checksum)
-
-            if k in checkfile and len(da) == 0:
+            if obj.date is None:
                 raise ValueError(
                     "there should be a date for file " + k + "\n" + str(obj))
-            if k in checkfile and len(mda) == 0:
+            if obj.mdate is None:
                 raise ValueError(
                     "there should be a mdate for file " + k + "\n" + str(obj))
-            if k in checkfile and len(sum5) <= 10:
+            if obj.checksum is None or len(str(obj.checksum)) <= 10:
                 raise ValueError(
                     "there should be a checksum( for file " + k + "\n" + str(obj))
 
-            values = [k, typstr(obj.size), da, mda, sum5]
-            sval = "%s\n" % "\t".join(values)
-            if "\tNone" in sval:
-                raise AssertionError(
-                    "this case should happen " + sval + "\n" + str(obj))
+        self._backend.save(self.copyFiles)
 
-            rows.append(sval)
+    def close(self):
+        """
+        saves the status and releases the storage (useful for the SQLite backend)
 
-        with open(self.fileKeep, "w", encoding="utf8") as f:
-            for r in rows:
-                f.write(r)
+        .. versionadded:: 1.2
+        """
+        self.save_dates()
+        if hasattr(self._backend, "close"):
+            self._backend.close()
 
     def has_been_modified_and_reason(self, file):
         """
@@ -149,7 +141,7 @@ class FilesStatus:
                 if d != l:
                     # dates are different but files might be the same
                     if obj.checksum is not None:
-                        ch = checksum_md5(file)
+                        ch = checksum_md5(file, cache=self.hash_cache)
                         if ch != obj.checksum:
                             reason = "date/md5 %s != old date %s  md5 %s != %s" % (
                                 typstr(l), typstr(d), obj.checksum, ch)
@@ -252,7 +244,7 @@ class FilesStatus:
             size = st.st_size
             mdate = convert_st_date_to_datetime(st.st_mtime)
             date = datetime.datetime.now()
-            md = checksum_md5(file)
+            md = checksum_md5(file, cache=self.hash_cache)
             obj = FileInfo(file, size, date, mdate, md)
             self.copyFiles[file] = obj
             return obj
@@ -0,0 +1,311 @@
+# -*- coding: utf-8 -*-
+"""
+@file
+@brief      Storages for class @see cl FilesStatus
+
+.. versionadded:: 1.2
+"""
+
+import os
+import sys
+import sqlite3
+from collections.abc import MutableMapping
+
+from ..loghelper.flog import noLOG
+from .file_info import convert_st_date_to_datetime, FileInfo
+
+if sys.version_info[0] == 2:
+    from codecs import open
+
+
+def is_sqlite_file(file):
+    """
+    tells if a file is a SQLite database
+
+    @param      file        filename
+    @return                 boolean
+    """
+    if not os.path.exists(file) or os.stat(file).st_size < 16:
+        return False
+    with open(file, "rb") as f:
+        header = f.read(16)
+    return header == b"SQLite format 3\x00"
+
+
+def _fileinfo_from_strings(spl):
+    """
+    private: builds a @see cl FileInfo from a list of strings
+    ``[filename, size, date, mdate, md5]``, the last three ones are optional
+    """
+    a, b = spl[:2]
+    obj = FileInfo(a, int(b), None, None, None)
+    if len(spl) > 2 and spl[2]:
+        obj.set_date(convert_st_date_to_datetime(spl[2]))
+    if len(spl) > 3 and spl[3]:
+        obj.set_mdate(convert_st_date_to_datetime(spl[3]))
+    if len(spl) > 4 and spl[4]:
+        obj.set_md5(spl[4])
+    return obj
+
+
+def _fileinfo_to_strings(obj):
+    """
+    private: converts a @see cl FileInfo into a list of strings
+    ``[filename, size, date, mdate, md5]``
+    """
+    typstr = str  # unicode#
+    da = "" if obj.date is None else str(obj.date)
+    mda = "" if obj.mdate is None else str(obj.mdate)
+    sum5 = "" if obj.checksum is None else str(obj.checksum)
+    return [obj.filename, typstr(obj.size), da, mda, sum5]
+
+
+class FilesStatusTextBackend:
+
+    """
+    stores the status of every file in a tab-separated text file,
+    the whole file is loaded in memory and written again
+    every time the status is saved
+    """
+
+    #: the status is not saved until @see me save is called
+    incremental = False
+
+    def __init__(self, file, fLOG=noLOG):
+        """
+        constructor
+
+        @param      file        filename
+        @param      fLOG        logging function
+        """
+        self._file = file
+        self.LOG = fLOG
+
+    def load(self):
+        """
+        loads the status of every file
+
+        @return     dictionary ``{ filename: FileInfo }``
+        """
+        res = {}
+        if not os.path.exists(self._file):
+            return res
+        with open(self._file, "r", encoding="utf8") as f:
+            for ni, _ in enumerate(f.readlines()):
+                if ni == 0 and _.startswith("\ufeff"):
+                    _ = _[len("\ufeff"):]
+                spl = _.strip("\r\n ").split("\t")
+                try:
+                    if len(spl) >= 2:
+                        obj = _fileinfo_from_strings(spl)
+                        res[obj.filename] = obj
+                    else:
+                        raise ValueError(
+                            "expecting a filename and a date on this line: " + _)
+                except Exception as e:
+                    raise Exception(
+                        "issue with line:\n  {0} -- {1}".format(_, spl)) from e
+        return res
+
+    def save(self, files):
+        """
+        saves the status of every file
+
+        @param      files       dictionary ``{ filename: FileInfo }``
+        """
+        rows = []
+        for k in sorted(files):
+            values = _fileinfo_to_strings(files[k])
+            values[0] = k
+            sval = "%s\n" % "\t".join(values)
+            if "\tNone" in sval:
+                raise AssertionError(
+                    "this case should happen " + sval + "\n" + str(files[k]))
+            rows.append(sval)
+
+        with open(self._file, "w", encoding="utf8") as f:
+            for r in rows:
+                f.write(r)
+
+
+class SQLiteFilesMapping(MutableMapping):
+
+    """
+    dictionary ``{ filename: FileInfo }`` stored in a SQLite table,
+    every lookup is a query on the primary key, modifications are committed
+    by batches of *batch_size* rows or when @see me commit is called
+    """
+
+    def __init__(self, con, batch_size):
+        """
+        constructor
+
+        @param      con             SQLite connection
+        @param      batch_size      number of modifications before a commit
+        """
+        self._con = con
+        self._batch_size = batch_size
+        self._pending = 0
+
+    def _modified(self):
+        """
+        private: commits if the number of pending modifications is too high
+        """
+        self._pending += 1
+        if self._pending >= self._batch_size:
+            self.commit()
+
+    def commit(self):
+        """
+        commits the pending modifications
+        """
+        if self._pending > 0:
+            self._con.commit()
+            self._pending = 0
+
+    def __getitem__(self, key):
+        row = self._con.execute(
+            "SELECT filename, size, date, mdate, md5 FROM files WHERE filename=?", (key,)).fetchone()
+        if row is None:
+            raise KeyError(key)
+        return _fileinfo_from_strings(row)
+
+    def __contains__(self, key):
+        row = self._con.execute(
+            "SELECT 1 FROM files WHERE filename=?", (key,)).fetchone()
+        return row is not None
+
+    def __setitem__(self, key, obj):
+        values = _fileinfo_to_strings(obj)
+        values[0] = key
+        values[1] = obj.size
+        self._con.execute(
+            "INSERT OR REPLACE INTO files (filename, size, date, mdate, md5) VALUES (?,?,?,?,?)", values)
+        self._modified()
+
+    def __delitem__(self, key):
+        cur = self._con.execute("DELETE FROM files WHERE filename=?", (key,))
+        if cur.rowcount == 0:
+            raise KeyError(key)
+        self._modified()
+
+    def __iter__(self):
+        for row in self._con.execute("SELECT filename FROM files ORDER BY filename").fetchall():
+            yield row[0]
+
+    def __len__(self):
+        return self._con.execute("SELECT COUNT(*) FROM files").fetchone()[0]
+
+    def items(self):
+        """
+        iterates on all couples ``(filename, FileInfo)`` with a single query
+        """
+        for row in self._con.execute(
+                "SELECT filename, size, date, mdate, md5 FROM files ORDER BY filename").fetchall():
+            yield row[0], _fileinfo_from_strings(row)
+
+
+class FilesStatusSQLiteBackend:
+
+    """
+    stores the status of every file in a SQLite database,
+    files are looked up one by one and every modification is an upsert,
+    modifications are committed by batches
+
+    If *file* is a text file written by @see cl FilesStatusTextBackend,
+    its content is migrated into a database stored at the same location,
+    the text file is kept with the extension ``.bak``.
+    """
+
+    #: the status is saved while it is modified
+    incremental = True
+
+    def __init__(self, file, batch_size=100, fLOG=noLOG):
+        """
+        constructor
+
+        @param      file            filename
+        @param      batch_size      number of modifications before a commit
+        @param      fLOG            logging function
+        """
+        self._file = file
+        self._batch_size = batch_size
+        self.LOG = fLOG
+        self._con = None
+
+    def load(self):
+        """
+        opens the database, migrates a text file if needed
+
+        @return     @see cl SQLiteFilesMapping
+        """
+        migrated = None
+        if os.path.exists(self._file) and not is_sqlite_file(self._file):
+            migrated = FilesStatusTextBackend(self._file).load()
+            backup = self._file + ".bak"
+            if os.path.exists(backup):
+                os.remove(backup)
+            os.rename(self._file, backup)
+            self.LOG("[FilesStatusSQLiteBackend] migrating %d rows from %s" % (
+                len(migrated), backup))
+
+        self._con = sqlite3.connect(self._file, check_same_thread=False)
+        self._con.execute("""CREATE TABLE IF NOT EXISTS files (
+                             filename TEXT PRIMARY KEY,
+                             size INTEGER,
+                             date TEXT,
+                             mdate TEXT,
+                             md5 TEXT)""")
+        mapping = SQLiteFilesMapping(self._con, self._batch_size)
+        if migrated:
+            with self._con:
+                self._con.executemany("INSERT OR REPLACE INTO files VALUES (?,?,?,?,?)",
+                                      [[k, v.size] + _fileinfo_to_strings(v)[2:]
+                                       for k, v in migrated.items()])
+        self._con.commit()
+        self._mapping = mapping
+        return mapping
+
+    def save(self, files):
+        """
+        commits the pending modifications
+
+        @param      files       @see cl SQLiteFilesMapping returned by @see me load
+        """
+        if files is not self._mapping:
+            raise TypeError(
+                "files must be the mapping returned by method load")
+        files.commit()
+
+    def close(self):
+        """
+        closes the connection to the database
+        """
+        if self._con is not None:
+            self._mapping.commit()
+            self._con.close()
+            self._con = None
+
+
+def create_files_status_backend(file, backend=None, fLOG=noLOG):
+    """
+    returns a backend for @see cl FilesStatus
+
+    @param      file        filename
+    @param      backend     None, ``"text"``, ``"sqlite"`` or an instance of a backend,
+                            None means ``"sqlite"`` if *file* is already a SQLite database,
+                            ``"text"`` otherwise
+    @param      fLOG        logging function
+    @return                 backend
+    """
+    if backend is None:
+        backend = "sqlite" if is_sqlite_file(file) else "text"
+    if backend == "text":
+        return FilesStatusTextBackend(file, fLOG=fLOG)
+    elif backend == "sqlite":
+        return FilesStatusSQLiteBackend(file, fLOG=fLOG)
+    elif isinstance(backend, str  # unicode#
+                    ):
+        raise ValueError("unknown backend: {0}".format(backend))
+    else:
+        return backend
@@ -5,7 +5,7 @@
 .. versionadded:: 1.0
     moved from pyensae to pyquickhelper
 """
-from ftplib import FTP
+from ftplib import FTP, error_perm
 import os
 import io
 
@@ -52,7 +52,7 @@ class TransferFTP (FTP):
 
     errorNoDirectory = "Can't change directory"
 
-    def __init__(self, site, login, password, fLOG=noLOG):
+    def __init__(self, site, login, password, fLOG=noLOG, port=None):
         """
         constructor
 
@@ -60,10 +60,20 @@ class TransferFTP (FTP):
         @param      login       login
         @param      password    password
         @param      fLOG        logging function
+        @param      port        port, None for the default one
+
+        .. versionchanged:: 1.2
+            Parameter *port* was added.
         """
-        FTP.__init__(self, site, login, password)
+        if port is None:
+            FTP.__init__(self, site, login, password)
+        else:
+            FTP.__init__(self)
+            self.connect(site, port)
+            self.login(login, password)
         self.LOG = fLOG
-        self._atts = dict(site=site)
+        self._atts = dict(site=site, login=login,
+                          password=password, port=port)
 
     @property
     def Site(self):
@@ -77,7 +87,9 @@ class TransferFTP (FTP):
         logs in
         """
         self.LOG("connecting to ", self.Site)
-        FTP.login(self)
+        # the current directory is lost with the connection
+        self._atts["current"] = None
+        FTP.login(self, self._atts["login"], self._atts["password"])
 
     def run_command(self, command, *args):
         """
@@ -98,6 +110,9 @@ class TransferFTP (FTP):
         except Exception as e:
             if TransferFTP.errorNoDirectory in str(e):
                 raise e
+            if isinstance(e, error_perm) and not str(e).startswith("530"):
+                # a permanent error (missing file or folder), logging in again does not help
+                raise e
             self.LOG(e)
             self.LOG("    ** run exc ", str(command), str(args))
             self._private_login()
@@ -237,6 +252,122 @@ class TransferFTP (FTP):
 
         return r
 
+    def clone(self):
+        """
+        opens a new connection to the same website with the same credentials
+
+        @return         @see cl TransferFTP
+
+        .. versionadded:: 1.2
+        """
+        return self.__class__(self._atts["site"], self._atts["login"],
+                              self._atts["password"], fLOG=self.LOG,
+                              port=self._atts["port"])
+
+    def makedirs(self, to):
+        """
+        creates a folder and its parents if they do not exist,
+        the current directory does not change
+
+        @param      to          folder, relative to the current directory
+        @return                 True
+
+        .. versionadded:: 1.2
+        """
+        path = [_ for _ in to.split("/") if len(_) > 0]
+        # absolute paths, the connection may be opened again by run_command
+        base = self.pwd().rstrip("/")
+        self._atts["current"] = None
+        try:
+            for i in range(len(path)):
+                folder = base + "/" + "/".join(path[:i + 1])
+                try:
+                    self.run_command(FTP.cwd, folder)
+                except error_perm:
+                    self.mkd(folder)
+                    self.run_command(FTP.cwd, folder)
+        finally:
+            self.run_command(FTP.cwd, base or "/")
+        return True
+
+    def _store_in(self, folder, name, data, start):
+        """
+        private: goes to *folder* if the connection is somewhere else and stores *data*,
+        it is called through @see me run_command which opens the connection again
+        if it was lost, the stream then starts again from position *start*
+        """
+        if self._atts.get("current", None) != folder:
+            FTP.cwd(self, folder)
+            self._atts["current"] = folder
+        if start is not None:
+            data.seek(start)
+        return FTP.storbinary(self, 'STOR ' + name, data)
+
+    def _absolute_folder(self, to):
+        """
+        private: returns the absolute path of a folder relative to the initial directory
+
+        .. versionadded:: 1.2
+        """
+        if self._atts.get("home", None) is None:
+            self._atts["home"] = self.pwd()
+        home = self._atts["home"]
+        path = "/".join(_ for _ in to.split("/") if len(_) > 0)
+        return (home.rstrip("/") + "/" + path) if path else home
+
+    def rename_file(self, to, name, new_name):
+        """
+        renames a remote file, an existing file with the new name is replaced,
+        the current directory does not change
+
+        @param      to          folder, relative to the initial directory
+        @param      name        current name
+        @param      new_name    new name
+        @return                 server response
+
+        .. versionadded:: 1.2
+        """
+        folder = self._absolute_folder(to).rstrip("/")
+        return self.run_command(FTP.rename, folder + "/" + name, folder + "/" + new_name)
+
+    def store(self, data, to, name):
+        """
+        stores a stream in an existing folder, contrary to @see me transfer,
+        the connection remains in this folder and only changes the current directory
+        if the next file goes somewhere else, @see me reset_folder goes back
+        to the initial directory, like the other methods, it logs in again
+        if the connection was lost (see @see me run_command) and starts the transfer
+        again if the stream can be rewound
+
+        @param      data        binary stream
+        @param      to          destination folder, relative to the initial directory
+        @param      name        name of the stream on the website
+        @return                 status
+
+        .. versionadded:: 1.2
+        """
+        folder = self._absolute_folder(to)
+        try:
+            start = data.tell() if hasattr(data, "seekable") and data.seekable() else None
+        except (OSError, ValueError):
+            start = None
+        try:
+            return self.run_command(TransferFTP._store_in, folder, name, data, start)
+        except Exception:
+            self._atts["current"] = None
+            raise
+
+    def reset_folder(self):
+        """
+        goes back to the initial directory after @see me store was called
+
+        .. versionadded:: 1.2
+        """
+        home = self._atts.get("home", None)
+        if home is not None and self._atts.get("current", None) not in (None, home):
+            self.run_command(FTP.cwd, home)
+        self._atts["current"] = None
+
 
 class MockTransferFTP (TransferFTP):
 
@@ -257,6 +388,36 @@ class MockTransferFTP (TransferFTP):
         """
         return True
 
+    def clone(self):
+        """
+        returns a new @see cl MockTransferFTP
+        """
+        return MockTransferFTP(self._atts["site"], "login", "password", fLOG=self.LOG)
+
+    def makedirs(self, to):
+        """
+        does nothing, returns True
+        """
+        return True
+
+    def store(self, data, to, name):
+        """
+        does nothing, returns True
+        """
+        return True
+
+    def rename_file(self, to, name, new_name):
+        """
+        does nothing, returns True
+        """
+        return True
+
+    def reset_folder(self):
+        """
+        does nothing
+        """
+        pass
+
     def close(self):
         """
         does noting
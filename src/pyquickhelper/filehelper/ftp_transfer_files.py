@@ -7,8 +7,10 @@
 import re
 import os
 import io
+import codecs
 import warnings
 import sys
+from queue import Queue
 from .files_status import FilesStatus
 from ..loghelper.flog import noLOG
 
@@ -44,6 +46,208 @@ def content_as_binary(filename):
         return True
 
 
+def _apply_filter(content_filter, path, content):
+    """
+    private: applies a content filter, see @see cl FolderTransferFTP
+
+    @param      content_filter  function
+    @param      path            file name (for the error message)
+    @param      content         text
+    @return                     filtered text
+    """
+    try:
+        content = content_filter(content)
+    except Exception as e:
+        raise FolderTransferFTPException(
+            "File {0} cannot be transferred (exception)".format(path)) from e
+    if content is None:
+        raise FolderTransferFTPException(
+            "File {0} cannot be transferred due to its content".format(path))
+    return content
+
+
+#: undecodable bytes once decoded with ``errors="surrogateescape"``
+_surrogates = re.compile("[\udc80-\udcff]")
+
+
+class TextTransformStream:
+
+    """
+    binary stream which reads a text file by chunks, inserts a footer
+    before the last tag ``</body>`` and applies a *chunk_filter*,
+    only a few lines are held in memory, the file is read once
+
+    The chunk filter receives pieces of the file, a piece ends with a new line or,
+    if a line is longer than *chunk_size*, after a tag or a space.
+    The text following the last tag ``</body>`` is kept in memory until the end
+    of the file, then the footer and this text go through the filter.
+
+    The errors (tag ``</body>`` is missing, the filter rejects a piece of the file,
+    the file cannot be decoded) are raised while the stream is read,
+    @see cl FolderTransferFTP uploads the stream with a temporary name
+    and renames it once the upload succeeded. A ``.js`` file which cannot be decoded
+    keeps its undecodable bytes (they go through the filter as surrogates).
+
+    The stream can be rewound with ``seek(0)`` to transfer it again after a failure.
+
+    .. versionadded:: 1.2
+    """
+
+    def __init__(self, path, footer_html=None, chunk_filter=None, chunk_size=2 ** 16):
+        """
+        constructor
+
+        @param      path            file name
+        @param      footer_html     footer or None
+        @param      chunk_filter    function or None, see @see cl FolderTransferFTP
+        @param      chunk_size      number of bytes read at once
+        """
+        self._path = path
+        self._footer = footer_html
+        self._chunk_filter = chunk_filter
+        self._chunk_size = chunk_size
+        self._errors = "surrogateescape" if os.path.splitext(
+            path)[-1].lower() == ".js" else "strict"
+        self._file = open(path, "rb")
+        self._reset()
+
+    def _reset(self):
+        """
+        private: starts reading the file from the beginning
+        """
+        self._file.seek(0)
+        self._decoder = codecs.getincrementaldecoder("utf8")(self._errors)
+        self._partial = ""
+        self._held = "" if self._footer is not None else None
+        self._out = bytearray()
+        self._eof = False
+        self._pos = 0
+        self._warned = False
+
+    def _emit(self, text):
+        """
+        private: applies the filter to a piece of text
+        """
+        if len(text) == 0:
+            return
+        if self._chunk_filter is not None:
+            text = _apply_filter(self._chunk_filter, self._path, text)
+        try:
+            self._out.extend(text.encode("utf8", self._errors))
+        except UnicodeEncodeError as e:
+            raise FolderTransferFTPException(
+                'unable to transfer:\n  File "{0}", line 1'.format(self._path)) from e
+
+    def _process(self, text):
+        """
+        private: looks for the last tag ``</body>`` and emits what precedes it
+        """
+        if self._held is None:
+            self._emit(text)
+            return
+        text = self._held + text
+        pos = text.rfind("</body>")
+        if pos == -1:
+            self._emit(text)
+        else:
+            self._emit(text[:pos])
+            self._held = text[pos:]
+
+    def _fill(self):
+        """
+        private: reads the next chunk
+        """
+        block = self._file.read(self._chunk_size)
+        final = len(block) == 0
+        try:
+            text = self._decoder.decode(block, final)
+        except UnicodeDecodeError as e:
+            raise FolderTransferFTPException(
+                'unable to transfer:\n  File "{0}", line 1'.format(self._path)) from e
+        if not self._warned and self._errors != "strict" and \
+                _surrogates.search(text) is not None:
+            warnings.warn("FTP transfer, encoding issue with: " + self._path)
+            self._warned = True
+
+        text = self._partial + text
+        if final:
+            self._partial = ""
+        else:
+            pos = text.rfind("\n") + 1
+            if pos == 0 and len(text) > self._chunk_size:
+                # no new line, the text is cut after a tag or a space,
+                # tag </body> cannot be split that way
+                pos = max(text.rfind(">"), text.rfind(" "),
+                          text.rfind("\t")) + 1
+                if pos == 0:
+                    pos = len(text)
+            self._partial = text[pos:]
+            text = text[:pos]
+        self._process(text)
+
+        if final:
+            if self._held is not None:
+                if len(self._held) == 0:
+                    raise FolderTransferFTPException(
+                        "tag </body> was not found, it must be written in lower case, file: {0}".format(self._path))
+                self._emit(self._footer + self._held)
+                self._held = None
+            self._eof = True
+
+    def read(self, size=-1):
+        """
+        reads at most *size* bytes
+
+        @param      size        number of bytes, -1 for everything
+        @return                 bytes
+        """
+        while not self._eof and (size is None or size < 0 or len(self._out) < size):
+            self._fill()
+        if size is None or size < 0 or size >= len(self._out):
+            res = bytes(self._out)
+            self._out = bytearray()
+        else:
+            res = bytes(self._out[:size])
+            del self._out[:size]
+        self._pos += len(res)
+        return res
+
+    def seekable(self):
+        """
+        returns True, the stream can only go back to the beginning
+        """
+        return True
+
+    def tell(self):
+        """
+        returns the number of bytes already read
+        """
+        return self._pos
+
+    def seek(self, offset, whence=0):
+        """
+        goes back to the beginning of the stream (``seek(0)``),
+        the file is read again, any other position than the current one
+        raises an exception
+
+        @param      offset      0 or the current position
+        @param      whence      must be 0
+        @return                 new position
+        """
+        if whence != 0 or offset not in (0, self._pos):
+            raise io.UnsupportedOperation(
+                "TextTransformStream can only go back to the beginning")
+        if offset == 0 and self._pos != 0:
+            self._reset()
+        return self._pos
+
+    def close(self):
+        """
+        closes the file
+        """
+        self._file.close()
+
+
 class FolderTransferFTP:
 
     """
@@ -133,6 +337,9 @@ class FolderTransferFTP:
                  is_binary=content_as_binary,
                  text_transform=None,
                  filter_out=None,
+                 status_backend=None,
+                 streaming=False,
+                 chunk_filter=None,
                  fLOG=noLOG):
         """
         constructor
@@ -150,6 +357,15 @@ class FolderTransferFTP:
         @param      is_binary           function which determines if content of a files is binary or not
         @param      text_transform      function to transform the content of a text file before uploading it
         @param      filter_out          regular expression to exclude some files, it can also be a function.
+        @param      status_backend      storage for the status file, see @see cl FilesStatus,
+                                        ``"sqlite"`` avoids writing the whole status file after every transfered file
+        @param      streaming           if True, text files are read and modified by chunks
+                                        (see @see cl TextTransformStream) unless *content_filter*
+                                        or *text_transform* is specified, both receive the whole content
+        @param      chunk_filter        function which filters a piece of a text file, like *content_filter*,
+                                        it returns the modified text or None if the file cannot be transfered,
+                                        the pieces end with a new line or after a tag or a space if a line is too long,
+                                        the whole content is one piece if *streaming* is False
         @param      fLOG                logging function
 
         Function *text_transform(self, filename, content)* returns the modified content.
@@ -159,6 +375,9 @@ class FolderTransferFTP:
             def filter_out(full_file_name):
                 # ...
                 return True # if the file is filtered out, False otherwise
+
+        .. versionchanged:: 1.2
+            Parameters *status_backend*, *streaming*, *chunk_filter* were added.
         """
         self._ftn = file_tree_node
         self._ftp = ftp_transfer
@@ -178,8 +397,10 @@ class FolderTransferFTP:
             self._filter_out = (lambda f: False) if filter_out is None else (
                 lambda f: self._filter_out_reg.search(f) is not None)
 
-        self._ft = FilesStatus(file_status)
+        self._ft = FilesStatus(file_status, backend=status_backend)
         self._text_transform = text_transform
+        self._streaming = streaming
+        self._chunk_filter = chunk_filter
 
     def __str__(self):
         """
@@ -210,9 +431,13 @@ class FolderTransferFTP:
 
         @param      file        filename
         @return                 @see cl FileInfo
+
+        The status is saved unless the backend stores it incrementally,
+        @see me start_transfering saves it in any case at the end.
         """
         r = self._ft.update_copied_file(file)
-        self._ft.save_dates()
+        if not self._ft.incremental:
+            self._ft.save_dates()
         return r
 
     def preprocess_before_transfering(self, path, force_binary=False):
@@ -228,8 +453,15 @@ class FolderTransferFTP:
         if force_binary or self._is_binary(path):
             return open(path, "rb")
         else:
-            if self._footer_html is None and self._content_filter is None:
+            if self._footer_html is None and self._content_filter is None and \
+                    self._chunk_filter is None:
                 return open(path, "rb")
+            elif self._streaming and self._content_filter is None and \
+                    self._text_transform is None:
+                footer = self._footer_html if os.path.splitext(
+                    path)[-1].lower() in (".htm", ".html") else None
+                return TextTransformStream(path, footer_html=footer,
+                                           chunk_filter=self._chunk_filter)
             else:
                 with open(path, "r", encoding="utf8") as f:
                     try:
@@ -259,14 +491,11 @@ class FolderTransferFTP:
                     content = spl[0] + self._footer_html + "</body>" + spl[-1]
 
                 # filter
-                try:
-                    content = self._content_filter(content)
-                except Exception as e:
-                    raise FolderTransferFTPException(
-                        "File {0} cannot be transferred (exception)".format(path)) from e
-                if content is None:
-                    raise FolderTransferFTPException(
-                        "File {0} cannot be transferred due to its content".format(path))
+                if self._content_filter is not None:
+                    content = _apply_filter(
+                        self._content_filter, path, content)
+                if self._chunk_filter is not None:
+                    content = _apply_filter(self._chunk_filter, path, content)
 
                 # transform
                 if self._text_transform is not None:
@@ -287,14 +516,63 @@ class FolderTransferFTP:
         else:
             stream.close()
 
-    def start_transfering(self):
+    def _send(self, ftp, data, path, name, store=False):
+        """
+        uploads a stream returned by @see me preprocess_before_transfering,
+        a stream modified while it is read (@see cl TextTransformStream) is uploaded
+        with a temporary name and renamed once the upload succeeded,
+        an error raised while the file is read does not replace the remote file
+
+        @param      ftp         @see cl TransferFTP
+        @param      data        stream
+        @param      path        remote folder
+        @param      name        remote name
+        @param      store       use method *store* instead of *transfer*
+        @return                 status
+
+        .. versionadded:: 1.2
+        """
+        send = ftp.store if store else ftp.transfer
+        if not isinstance(data, TextTransformStream):
+            return send(data, path, name)
+        temp = name + ".uploading"
+        r = send(data, path, temp)
+        if r:
+            ftp.rename_file(path, temp, name)
+        return r
+
+    def _remote_folder(self, file):
+        """
+        returns the remote folder of a file
+
+        @param      file        @see cl FileTreeNode
+        @return                 remote folder
+        """
+        relp = os.path.relpath(file.fullname, self._root_local)
+        if ".." in relp:
+            raise ValueError("the local root is not accurate:\n{0}\nFILE:\n{1}\nRELPATH:\n{2}".format(
+                self, file.fullname, relp))
+        path = self._root_web + "/" + os.path.split(relp)[0]
+        return path.replace("\\", "/")
+
+    def start_transfering(self, n_jobs=1, batch_size=50):
         """
         starts transfering files to the remote website
 
-        @return         list of transfered @see cl FileInfo
-        @exception      the class raises an exception (@see cl FolderTransferFTPException)
-                        if more than 5 issues happened
+        @param      n_jobs      number of simultaneous connections, if > 1,
+                                see @see me _start_transfering_parallel
+        @param      batch_size  the status is saved every *batch_size* transfered files
+                                when *n_jobs* > 1 (unless the status backend is incremental)
+        @return                 list of transfered @see cl FileInfo
+        @exception              the class raises an exception (@see cl FolderTransferFTPException)
+                                if more than 5 issues happened
+
+        .. versionchanged:: 1.2
+            Parameters *n_jobs*, *batch_size* were added.
         """
+        if n_jobs > 1:
+            return self._start_transfering_parallel(n_jobs, batch_size)
+
         issues = []
         done = []
         total = list(self.iter_eligible_files())
@@ -303,12 +581,7 @@ class FolderTransferFTP:
             if i % 20 == 0:
                 self.fLOG("#### transfering %d/%d (so far %d bytes)" %
                           (i, len(total), sum_bytes))
-            relp = os.path.relpath(file.fullname, self._root_local)
-            if ".." in relp:
-                raise ValueError("the local root is not accurate:\n{0}\nFILE:\n{1}\nRELPATH:\n{2}".format(
-                    self, file.fullname, relp))
-            path = self._root_web + "/" + os.path.split(relp)[0]
-            path = path.replace("\\", "/")
+            path = self._remote_folder(file)
 
             size = os.stat(file.fullname).st_size
             self.fLOG("[upload % 8d bytes name=%s -- fullname=%s -- to=%s]" % (
@@ -320,13 +593,13 @@ class FolderTransferFTP:
             data = self.preprocess_before_transfering(file.fullname)
 
             try:
-                r = self._ftp.transfer(
-                    data, path, os.path.split(file.fullname)[-1])
+                r = self._send(self._ftp, data, path,
+                               os.path.split(file.fullname)[-1])
             except FileNotFoundError:
                 r = False
                 issues.append((file.fullname, "not found"))
-
-            self.close_stream(data)
+            finally:
+                self.close_stream(data)
 
             sum_bytes += size
 
@@ -335,7 +608,99 @@ class FolderTransferFTP:
                 done.append(fi)
 
             if len(issues) >= 5:
+                self._ft.save_dates()
                 raise FolderTransferFTPException("too many issues:\n{0}".format(
                     "\n".join("{0} -- {1}".format(a, b) for a, b in issues)))
 
+        self._ft.save_dates()
+        return done
+
+    def _start_transfering_parallel(self, n_jobs, batch_size):
+        """
+        transfers files through a pool of *n_jobs* connections,
+        the first one is the connection given to the constructor,
+        the others are created with method *clone* of @see cl TransferFTP,
+        every remote folder is created once before the files are transfered,
+        every connection only changes its current directory when the next
+        file goes to another folder
+
+        @param      n_jobs      number of simultaneous connections
+        @param      batch_size  the status is saved every *batch_size* transfered files
+                                (unless the status backend is incremental)
+        @return                 list of transfered @see cl FileInfo
+
+        The status is only updated by the calling thread in the order
+        the files would be transfered by @see me start_transfering.
+
+        .. versionadded:: 1.2
+        """
+        from concurrent.futures import ThreadPoolExecutor
+
+        total = [(file, self._remote_folder(file))
+                 for file in self.iter_eligible_files()]
+        if len(total) == 0:
+            return []
+
+        for path in sorted(set(path for file, path in total)):
+            self._ftp.makedirs(path)
+
+        clones = [self._ftp.clone()
+                  for i in range(min(n_jobs, len(total)) - 1)]
+        connections = Queue()
+        for ftp in [self._ftp] + clones:
+            connections.put(ftp)
+
+        def upload(file, path):
+            ftp = connections.get()
+            try:
+                self.fLOG("[upload % 8d bytes name=%s -- fullname=%s -- to=%s]" % (
+                    file.size, os.path.split(file.fullname)[-1], file.fullname, path))
+                data = self.preprocess_before_transfering(file.fullname)
+                try:
+                    return self._send(ftp, data, path, os.path.split(file.fullname)[-1],
+                                      store=True)
+                finally:
+                    self.close_stream(data)
+            finally:
+                connections.put(ftp)
+
+        issues = []
+        done = []
+        sum_bytes = 0
+        try:
+            with ThreadPoolExecutor(max_workers=len(clones) + 1) as executor:
+                futures = [(file, executor.submit(upload, file, path))
+                           for file, path in total]
+                for i, (file, fut) in enumerate(futures):
+                    if i % 20 == 0:
+                        self.fLOG("#### transfering %d/%d (so far %d bytes)" %
+                                  (i, len(total), sum_bytes))
+                    try:
+                        r = fut.result()
+                    except FileNotFoundError:
+                        r = False
+                        issues.append((file.fullname, "not found"))
+                    except Exception:
+                        for f, fu in futures:
+                            fu.cancel()
+                        raise
+
+                    sum_bytes += file.size
+
+                    if r:
+                        done.append(self._ft.update_copied_file(file.fullname))
+                        if not self._ft.incremental and len(done) % batch_size == 0:
+                            self._ft.save_dates()
+
+                    if len(issues) >= 5:
+                        for f, fu in futures:
+                            fu.cancel()
+                        raise FolderTransferFTPException("too many issues:\n{0}".format(
+                            "\n".join("{0} -- {1}".format(a, b) for a, b in issues)))
+        finally:
+            self._ft.save_dates()
+            for ftp in clones:
+                ftp.close()
+            self._ftp.reset_folder()
+
         return done
@@ -11,6 +11,7 @@ import sys
 from ..loghelper.flog import fLOG
 from .file_tree_node import FileTreeNode
 from .files_status import FilesStatus, checksum_md5
+from .file_hash_cache import FileHashCache
 from ..loghelper.pqh_exception import PQHException
 
 if sys.version_info[0] == 2:
@@ -106,7 +107,10 @@ def synchronize_folder(p1,
                        operations=None,
                        file_date=None,
                        log1=False,
-                       copy_1to2=False):
+                       copy_1to2=False,
+                       walker="listdir",
+                       n_jobs=None,
+                       hash_cache=None):
     """
     synchronize two folders (or copy if the second is empty), it only copies more recent files.
 
@@ -132,6 +136,12 @@ def synchronize_folder(p1,
     @param      file_date           filename which contains information about when the last sync was done
     @param      log1                @see cl FileTreeNode
     @param      copy_1to2           only copy files from *p1* to *p2*
+    @param      walker              how to explore the folders, ``"listdir"`` or ``"scandir"``,
+                                    see @see cl FileTreeNode
+    @param      n_jobs              number of threads used by the walker ``"scandir"``
+    @param      hash_cache          None, a filename or a @see cl FileHashCache, it stores the checksums
+                                    of the files and avoids reading unchanged files again,
+                                    the cache is saved at the end of the synchronization
     @return                         list of operations done by the function
                                         list of 3-uple: action, source_file, dest_file
 
@@ -166,6 +176,9 @@ def synchronize_folder(p1,
     .. versionchanged:: 1.1
         Parameter *copy_1to2* was added.
 
+    .. versionchanged:: 1.2
+        Parameters *walker*, *n_jobs*, *hash_cache* were added.
+
     """
 
     fLOG("form ", p1)
@@ -197,23 +210,29 @@ def synchronize_folder(p1,
         rg = re.compile(filter_copy)
         filter_copy = lambda f, ex=rg: ex.search(f) is not None
 
+    if isinstance(hash_cache, str  # unicode#
+                  ):
+        hash_cache = FileHashCache(hash_cache, fLOG=fLOG)
+
     f1 = p1
     f2 = p2
 
     fLOG("   exploring ", f1)
     node1 = FileTreeNode(
-        f1, filter=pr_filter, repository=repo1, log=True, log1=log1)
+        f1, filter=pr_filter, repository=repo1, log=True, log1=log1,
+        walker=walker, n_jobs=n_jobs)
     fLOG("     number of found files (p1)", len(node1), node1.max_date())
     if file_date is not None:
         log1n = 1000 if log1 else None
-        status = FilesStatus(file_date, fLOG=fLOG)
+        status = FilesStatus(file_date, fLOG=fLOG, hash_cache=hash_cache)
         res = list(status.difference(node1, u4=True, nlog=log1n))
     else:
         fLOG("   exploring ", f2)
         node2 = FileTreeNode(
-            f2, filter=pr_filter, repository=repo2, log=True, log1=log1)
+            f2, filter=pr_filter, repository=repo2, log=True, log1=log1,
+            walker=walker, n_jobs=n_jobs)
         fLOG("     number of found files (p2)", len(node2), node2.max_date())
-        res = node1.difference(node2, hash_size=hash_size)
+        res = node1.difference(node2, hash_size=hash_size, cache=hash_cache)
         status = None
 
     action = []
@@ -293,6 +312,8 @@ def synchronize_folder(p1,
 
     if status is not None:
         status.save_dates(file_date)
+    if hash_cache is not None:
+        hash_cache.save()
 
     return action
 
@@ -349,13 +370,17 @@ def remove_folder(top, remove_also_top=True, raise_exception=True):
     return res
 
 
-def has_been_updated(source, dest):
+def has_been_updated(source, dest, hash_cache=None):
     """
     we assume ``dest`` is a copy of ``source``, we want to know
     if the copy is up to date or not
     @param      source      filename
     @param      dest        copy
+    @param      hash_cache  @see cl FileHashCache or None
     @return                 True,reason or False,None
+
+    .. versionchanged:: 1.2
+        Parameter *hash_cache* was added.
     """
     if not os.path.exists(dest):
         return True, "new"
@@ -370,8 +395,8 @@ def has_been_updated(source, dest):
     if d1 > d2:
         return True, "date"
 
-    c1 = checksum_md5(source)
-    c2 = checksum_md5(dest)
+    c1 = checksum_md5(source, cache=hash_cache)
+    c2 = checksum_md5(dest, cache=hash_cache)
 
     if c1 != c2:
         return True, "md5"
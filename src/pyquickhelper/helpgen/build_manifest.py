@@ -0,0 +1,200 @@
+"""
+@file
+@brief Keeps track of the files produced by the documentation generation
+to skip the unchanged ones.
+
+.. versionadded:: 1.2
+"""
+import os
+import sys
+import json
+from ..filehelper.file_info import checksum_md5
+
+if sys.version_info[0] == 2:
+    from codecs import open
+
+
+def write_if_changed(filename, content, encoding="utf8"):
+    """
+    writes a file only if its content changed,
+    the modification time of an unchanged file remains the same
+    and Sphinx does not read it again
+
+    @param      filename        filename
+    @param      content         content (str)
+    @param      encoding        encoding
+    @return                     True if the file was written
+    """
+    if os.path.exists(filename):
+        try:
+            with open(filename, "r", encoding=encoding) as f:
+                if f.read() == content:
+                    return False
+        except UnicodeDecodeError:
+            pass
+    with open(filename, "w", encoding=encoding) as f:
+        f.write(content)
+    return True
+
+
+class BuildManifest:
+
+    """
+    stores the checksums of every source file copied into the documentation
+    folder and of the file produced from it,
+    a source file does not need to be processed again if both checksums did not change
+
+    The manifest is a json file::
+
+        {"fingerprint": "...",
+         "files": {"<copied file>": {"source": "<md5>", "output": "<md5>",
+                                     "stats": [".py", 10, 4], "doc": "..."}}}
+
+    The fingerprint summarizes the options of the generation,
+    every file is processed again if it changes. The functions modifying the
+    content of the files cannot be part of it, the manifest must be removed
+    when they change.
+    """
+
+    def __init__(self, file=None, fingerprint=None):
+        """
+        constructor
+
+        @param      file            file which stores the manifest, None to keep it in memory
+        @param      fingerprint     string summarizing the options of the generation
+        """
+        self._file = file
+        self.fingerprint = fingerprint
+        self.files = {}
+        self.skipped = set()
+        self.seen = set()
+        self.pending = {}
+        if file is not None and os.path.exists(file):
+            with open(file, "r", encoding="utf8") as f:
+                try:
+                    data = json.load(f)
+                except ValueError:
+                    data = {}
+            if data.get("fingerprint", None) == fingerprint:
+                self.files = data.get("files", {})
+
+    @staticmethod
+    def _key(dest):
+        """
+        private: normalizes a filename
+        """
+        return os.path.normpath(os.path.abspath(dest))
+
+    def unchanged(self, source, dest):
+        """
+        tells if *dest* was produced from the same *source*
+        and was not modified since
+
+        @param      source      source file
+        @param      dest        produced file
+        @return                 the statistics stored by @see me update or None if it changed
+        """
+        key = BuildManifest._key(dest)
+        self.seen.add(key)
+        info = self.files.get(key, None)
+        if info is None or not os.path.exists(dest):
+            return None
+        if info["source"] != checksum_md5(source) or info["output"] != checksum_md5(dest):
+            return None
+        self.skipped.add(key)
+        return tuple(info["stats"])
+
+    def is_skipped(self, dest):
+        """
+        tells if the processing of *dest* was skipped during the current generation
+
+        @param      dest        produced file
+        @return                 boolean
+        """
+        return BuildManifest._key(dest) in self.skipped
+
+    def update(self, source, dest, stats):
+        """
+        stores the checksums of a source file and the file produced from it,
+        the checksum of the produced file is computed by @see me save
+        as it may be modified again by the generation
+
+        @param      source      source file
+        @param      dest        produced file
+        @param      stats       statistics about the file (tuple)
+        """
+        key = BuildManifest._key(dest)
+        self.seen.add(key)
+        self.skipped.discard(key)
+        self.files[key] = dict(source=checksum_md5(source),
+                               output=None, stats=list(stats))
+        self.pending[key] = dest
+
+    def get_doc(self, dest, rst):
+        """
+        returns the documentation stored by @see me set_doc
+        if *dest* was skipped and *rst* was not modified
+
+        @param      dest        produced file
+        @param      rst         rst file produced from *dest*
+        @return                 documentation or None
+        """
+        key = BuildManifest._key(dest)
+        if key not in self.skipped or not os.path.exists(rst):
+            return None
+        info = self.files[key]
+        if info.get("rst", None) != checksum_md5(rst):
+            return None
+        return info.get("doc", None)
+
+    def set_doc(self, dest, rst, doc):
+        """
+        stores the documentation extracted from *dest* and
+        the checksum of the rst file produced from it
+
+        @param      dest        produced file
+        @param      rst         rst file produced from *dest*
+        @param      doc         documentation
+        """
+        key = BuildManifest._key(dest)
+        if key in self.files:
+            self.files[key]["rst"] = checksum_md5(rst)
+            self.files[key]["doc"] = doc
+
+    def remove_stale(self, folder, fLOG=None):
+        """
+        removes the files produced in *folder* during a previous generation
+        whose source disappeared, the rst file associated to every one of them
+        is removed as well
+
+        @param      folder      folder
+        @param      fLOG        logging function or None
+        @return                 list of removed files
+        """
+        folder = BuildManifest._key(folder) + os.sep
+        removed = []
+        for key in sorted(self.files):
+            if not key.startswith(folder) or key in self.seen:
+                continue
+            for name in [key, os.path.splitext(key)[0] + ".rst"]:
+                if os.path.exists(name):
+                    if fLOG:
+                        fLOG("BuildManifest: remove", name)
+                    os.remove(name)
+                    removed.append(name)
+            del self.files[key]
+        return removed
+
+    def save(self):
+        """
+        saves the manifest
+        """
+        for key, dest in self.pending.items():
+            if key in self.files and os.path.exists(dest):
+                self.files[key]["output"] = checksum_md5(dest)
+        self.pending = {}
+        if self._file is None:
+            return
+        with open(self._file, "w", encoding="utf8") as f:
+            json.dump(dict(fingerprint=self.fingerprint, files=self.files),
+                      f, indent=0, sort_keys=True)
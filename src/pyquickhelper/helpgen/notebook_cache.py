@@ -0,0 +1,157 @@
+"""
+@file
+@brief Cache for the conversion of notebooks, see @see fn process_notebooks.
+
+.. versionadded:: 1.2
+"""
+import os
+import sys
+import json
+import shutil
+import hashlib
+import threading
+
+if sys.version_info[0] == 2:
+    from codecs import open
+
+
+def get_converter_version():
+    """
+    returns the version of the module converting the notebooks
+
+    @return         string
+    """
+    try:
+        import nbconvert
+        return "nbconvert-" + nbconvert.__version__
+    except ImportError:
+        pass
+    try:
+        import IPython
+        return "IPython-" + IPython.__version__
+    except ImportError:
+        return "unknown"
+
+
+class NotebookConversionCache:
+
+    """
+    stores the files produced by the conversion of a notebook into a format,
+    an entry is a folder whose name is a checksum of the notebook content,
+    the format, the other requested formats (they change the links added to the output),
+    the version of the converter and the version of this module,
+    it does not depend on the location or the modification time of the notebook
+    and can be shared between checkouts
+
+    Every entry contains a file ``files.json``::
+
+        {"listed": [<files returned by the conversion>],
+         "extra": [<other produced files or folders>]}
+    """
+
+    def __init__(self, folder, version=None):
+        """
+        constructor
+
+        @param      folder      folder which stores the cache, it is created if it does not exist
+        @param      version     version of the converter, if None, calls @see fn get_converter_version
+        """
+        self.folder = folder
+        if not os.path.exists(folder):
+            os.makedirs(folder)
+        if version is None:
+            version = get_converter_version()
+        from .. import __version__
+        self.version = "%s-pyquickhelper-%s" % (version, __version__)
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def key(self, notebook, format, formats, latex_path=None):
+        """
+        returns the key of a conversion
+
+        @param      notebook        notebook
+        @param      format          format to produce
+        @param      formats         every requested format
+        @param      latex_path      path to the latex compiler, the pdf is not produced
+                                    if latex is not available, only its availability
+                                    is part of the key, not the path
+        @return                     string
+        """
+        m = hashlib.md5()
+        with open(notebook, "rb") as f:
+            m.update(f.read())
+        latex = "" if latex_path is None else "latex:%d" % os.path.exists(
+            latex_path)
+        m.update("|".join([os.path.split(notebook)[-1], format,
+                           ",".join(sorted(formats)), latex, self.version]).encode("utf8"))
+        return m.hexdigest()
+
+    def restore(self, key, build):
+        """
+        copies the files stored for a conversion into folder *build*
+
+        @param      key         key returned by @see me key
+        @param      build       destination
+        @return                 list of restored files (only the listed ones) or None if the key is not cached
+        """
+        entry = os.path.join(self.folder, key)
+        desc = os.path.join(entry, "files.json")
+        if not os.path.exists(desc):
+            with self._lock:
+                self.misses += 1
+            return None
+        with open(desc, "r", encoding="utf8") as f:
+            names = json.load(f)
+        for name in names["listed"] + names["extra"]:
+            src = os.path.join(entry, name)
+            dest = os.path.join(build, name)
+            if os.path.isdir(src):
+                if os.path.exists(dest):
+                    shutil.rmtree(dest)
+                shutil.copytree(src, dest)
+            else:
+                shutil.copy(src, dest)
+        with self._lock:
+            self.hits += 1
+        return [os.path.join(build, name) for name in names["listed"]]
+
+    def store(self, key, listed, extra=None):
+        """
+        stores the files produced by a conversion, the entry is first written
+        in a temporary folder and then renamed, the cache can be shared
+        by several processes
+
+        @param      key         key returned by @see me key
+        @param      listed      files returned by the conversion
+        @param      extra       other files or folders produced by the conversion,
+                                the missing ones are ignored
+        """
+        entry = os.path.join(self.folder, key)
+        if os.path.exists(entry):
+            return
+        temp = "%s.tmp%d_%d" % (entry, os.getpid(), threading.get_ident())
+        if os.path.exists(temp):
+            shutil.rmtree(temp)
+        os.mkdir(temp)
+        names = dict(listed=[], extra=[])
+        for kind, files in [("listed", listed), ("extra", extra or [])]:
+            for name in files:
+                if not os.path.exists(name):
+                    continue
+                short = os.path.split(name)[-1]
+                if short in names["listed"] or short in names["extra"]:
+                    continue
+                if os.path.isdir(name):
+                    shutil.copytree(name, os.path.join(temp, short))
+                else:
+                    shutil.copy(name, temp)
+                names[kind].append(short)
+        with open(os.path.join(temp, "files.json"), "w", encoding="utf8") as f:
+            json.dump(names, f)
+        try:
+            os.rename(temp, entry)
+        except OSError:
+            # another process stored the same entry
+            shutil.rmtree(temp, ignore_errors=True)
@@ -9,15 +9,19 @@ for a module designed the same way as this one, @see fn generate_help_sphinx.
 import os
 import sys
 import shutil
+import threading
 
 from ..loghelper.flog import run_cmd, fLOG
 from .utils_sphinx_doc_helpers import HelpGenException, find_latex_path, find_pandoc_path
 from ..filehelper.synchelper import has_been_updated
+from .notebook_cache import NotebookConversionCache
 from .post_process import post_process_latex_output, post_process_latex_output_any, post_process_rst_output, post_process_html_output, post_process_slides_output
 
 if sys.version_info[0] == 2:
     from codecs import open
 
+_copy_notebook_lock = threading.Lock()
+
 
 template_examples = """
 
@@ -84,8 +88,9 @@ def process_notebooks(notebooks,
                       latex_path=None,
                       pandoc_path=None,
                       formats=[
-                          "ipynb", "html", "python", "rst", "slides", "pdf"]
-                      ):
+                          "ipynb", "html", "python", "rst", "slides", "pdf"],
+                      n_jobs=1,
+                      cache=None):
     """
     Converts notebooks into html, rst, latex, pdf, python, docx using
     `nbconvert <http://ipython.org/ipython-doc/rel-1.0.0/interactive/nbconvert.html>`_.
@@ -96,6 +101,11 @@ def process_notebooks(notebooks,
     @param      pandoc_path path to pandoc
     @param      formats     list of formats to convert into (pdf format means latex then compilation)
     @param      latex_path  path to the latex compiler
+    @param      n_jobs      number of conversions running at the same time,
+                            notebooks and formats are converted concurrently if > 1
+    @param      cache       None, a folder or a @see cl NotebookConversionCache, the cache stores the
+                            converted files, a notebook is not converted again if its content,
+                            the requested formats and the version of the converter did not change
     @return                 list of tuple *[(file, created or skipped)]*
 
     This function relies on `pandoc <http://johnmacfarlane.net/pandoc/index.html>`_.
@@ -136,6 +146,13 @@ def process_notebooks(notebooks,
 
     .. versionchanged:: 1.1
         Add format slides. Return type was changed.
+
+    .. versionchanged:: 1.2
+        Parameter *n_jobs* was added, the conversions are run by a pool of threads
+        as they mostly wait for external processes (nbconvert, pandoc, latex).
+        The formats producing the same files (html and docx, latex and pdf) are
+        converted by the same task. The returned list follows the order of the notebooks.
+        Parameter *cache* was added.
     """
     if pandoc_path is None:
         pandoc_path = find_pandoc_path()
@@ -173,14 +190,16 @@ def process_notebooks(notebooks,
 
     ipy = get_ipython_program(exe, pandoc_path)
 
-    cmd = '{0} nbconvert --to {1} "{2}"{5} --output="{3}/{4}"'
-    files = []
-    skipped = []
+    if isinstance(cache, str  # unicode#
+                  ):
+        cache = NotebookConversionCache(cache)
 
     if "slides" in formats:
         build_slide = os.path.join(build, "bslides")
         if not os.path.exists(build_slide):
             os.mkdir(build_slide)
+    else:
+        build_slide = None
 
     if "WinPython" in sys.executable:
         # pip, or any program in Scripts cannot find python.exe
@@ -191,226 +210,17 @@ def process_notebooks(notebooks,
     else:
         path_modified = False
 
-    for notebook in notebooks:
-        thisfiles = []
-
-        nbout = os.path.split(notebook)[-1]
-        if " " in nbout:
-            raise HelpGenException(
-                "spaces are not allowed in notebooks file names: {0}".format(notebook))
-        nbout = os.path.splitext(nbout)[0]
-        for format in formats:
-
-            # output
-            trueoutputfile = os.path.join(build, nbout + extensions[format])
-            fLOG("--- produce ", trueoutputfile)
-            pandoco = "docx" if format in ["word", "docx"] else None
-
-            # we chech it was not done before
-            if os.path.exists(trueoutputfile):
-                dto = os.stat(trueoutputfile).st_mtime
-                dtnb = os.stat(notebook).st_mtime
-                if dtnb < dto:
-                    fLOG("-- skipping notebook", format,
-                         notebook, "(", trueoutputfile, ")")
-                    if trueoutputfile not in thisfiles:
-                        thisfiles.append(trueoutputfile)
-                    if pandoco is None:
-                        skipped.append(trueoutputfile)
-                        continue
-                    else:
-                        out2 = os.path.splitext(
-                            trueoutputfile)[0] + "." + pandoco
-                        if os.path.exists(out2):
-                            skipped.append(trueoutputfile)
-                            continue
-
-            # if the format is slides, we update the metadata
-            if format == "slides":
-                nb_slide = add_tag_for_slideshow(notebook, build_slide)
-                fLOG("NB SLIDE: run add_tag_for_slideshow", nb_slide)
-            else:
-                nb_slide = None
-
-            # next
-            options = ""
-            if format == "pdf":
-                title = os.path.splitext(
-                    os.path.split(notebook)[-1])[0].replace("_", " ")
-                options = ' --SphinxTransformer.author="" --SphinxTransformer.overridetitle="{0}"'.format(
-                    title)
-                format = "latex"
-                compilation = True
-            elif format in ["word", "docx"]:
-                format = "html"
-                compilation = False
-            elif format in ["slides"]:
-                options += " --reveal-prefix reveal.js"
-                compilation = False
-            else:
-                compilation = False
-
-            # output
-            outputfile = os.path.join(build, nbout + extensions[format])
-            fLOG("--- produce ", outputfile)
-
-            templ = "full" if format != "latex" else "article"
-            fLOG("### convert into ", format, " NB: ", notebook,
-                 " ### ", os.path.exists(outputfile), ":", outputfile)
-
-            if format == "html":
-                fmttpl = " --template {0}".format(templ)
-            else:
-                fmttpl = ""
-
-            c = cmd.format(ipy,  format,
-                           notebook if nb_slide is None else nb_slide,
-                           build, nbout, fmttpl)
-
-            c += options
-            fLOG("NB:", c)
-
-            #
-            if format not in ["ipynb"]:
-                # for latex file
-                if format == "latex":
-                    cwd = os.getcwd()
-                    os.chdir(build)
-
-                if not sys.platform.startswith("win"):
-                    c = c.replace('"', '')
-                # , shell = sys.platform.startswith("win"))
-                out, err = run_cmd(
-                    c, wait=True, do_not_log=True, log_error=False)
-
-                if format == "latex":
-                    os.chdir(cwd)
-
-                if "raise ImportError" in err:
-                    raise ImportError(err)
-                if len(err) > 0:
-                    if format == "latex":
-                        # there might be some errors because the latex script needs to be post-processed
-                        # sometimes (wrong characters such as " or formulas not
-                        # captured as formulas)
-                        fLOG("LATEX ERR\n" + err)
-                        fLOG("LATEX OUT\n" + out)
-                    else:
-                        err = err.lower()
-                        if "error" in err or "critical" in err or "bad config" in err:
-                            raise HelpGenException(err)
-
-            format = extensions[format].strip(".")
-
-            # we add the file to the list of generated files
-            if outputfile not in thisfiles:
-                thisfiles.append(outputfile)
-
-            fLOG("******", format, compilation, outputfile)
-
-            if compilation:
-                # compilation latex
-                if os.path.exists(latex_path):
-                    if sys.platform.startswith("win"):
-                        lat = os.path.join(latex_path, "pdflatex.exe")
-                    else:
-                        lat = "pdflatex"
-
-                    tex = [
-                        _ for _ in thisfiles if os.path.splitext(_)[-1] == ".tex"]
-                    if len(tex) != 1:
-                        raise FileNotFoundError(
-                            "no latex file was generated or more than one (={0}), nb={1}".format(len(tex), notebook))
-                    tex = tex[0]
-                    post_process_latex_output_any(tex)
-                    # -interaction=batchmode
-                    c = '"{0}" "{1}" -output-directory="{2}"'.format(
-                        lat, tex, os.path.split(tex)[0])
-                    fLOG("   ** LATEX compilation (b)", c)
-                    if not sys.platform.startswith("win"):
-                        c = c.replace('"', '')
-                    out, err = run_cmd(
-                        c, wait=True, do_not_log=False, log_error=False, shell=sys.platform.startswith("win"))
-                    if len(err) > 0:
-                        raise HelpGenException(
-                            "CMD:\n{0}\nERR:\n{1}".format(c, err))
-                    f = os.path.join(build, nbout + ".pdf")
-                    if not os.path.exists(f):
-                        raise HelpGenException(
-                            "missing file: {0}\nERR:\n{1}".format(f, err))
-                    thisfiles.append(f)
-                else:
-                    fLOG("unable to find latex in", latex_path)
-
-            elif pandoco is not None:
-                # compilation pandoc
-                fLOG("   ** pandoc compilation (b)", pandoco)
-                outfilep = os.path.splitext(outputfile)[0] + "." + pandoco
-
-                # for some files, the following error might appear:
-                # Stack space overflow: current size 33692 bytes.
-                # Use `+RTS -Ksize -RTS' to increase it.
-                # it usually means there is something wrong (circular
-                # reference, ...)
-                if sys.platform.startswith("win"):
-                    c = r'"{0}\pandoc.exe" -f html -t {1} "{2}" -o "{3}"'.format(
-                        pandoc_path, pandoco, outputfile, outfilep)
-                else:
-                    c = r'pandoc -f html -t {1} "{2}" -o "{3}"'.format(
-                        pandoc_path, pandoco, outputfile, outfilep)
-
-                if not sys.platform.startswith("win"):
-                    c = c.replace('"', '')
-                out, err = run_cmd(
-                    c, wait=True, do_not_log=False, log_error=False, shell=sys.platform.startswith("win"))
-                if len(err) > 0:
-                    raise HelpGenException(
-                        "issue with cmd: %s\nERR:\n%s" % (c, err))
-
-            if format == "html":
-                # we add a link to the notebook
-                if not os.path.exists(outputfile):
-                    raise FileNotFoundError(outputfile + "\nCONTENT in " + os.path.dirname(outputfile) + ":\n" + "\n".join(
-                        os.listdir(os.path.dirname(outputfile))) + "\nERR:\n" + err + "\nOUT:\n" + out + "\nCMD:\n" + c)
-                thisfiles += add_link_to_notebook(outputfile, notebook,
-                                                  "pdf" in formats, False, "python" in formats,
-                                                  "slides" in formats)
-
-            elif format == "slides.html":
-                # we add a link to the notebook
-                if not os.path.exists(outputfile):
-                    raise FileNotFoundError(outputfile + "\nCONTENT in " + os.path.dirname(outputfile) + ":\n" + "\n".join(
-                        os.listdir(os.path.dirname(outputfile))) + "\nERR:\n" + err + "\nOUT:\n" + out + "\nCMD:\n" + c)
-                thisfiles += add_link_to_notebook(outputfile, notebook,
-                                                  "pdf" in formats, False, "python" in formats,
-                                                  "slides" in formats)
-
-            elif format == "ipynb":
-                # we just copy the notebook
-                thisfiles += add_link_to_notebook(outputfile, notebook,
-                                                  "ipynb" in formats, False, "python" in formats,
-                                                  "slides" in formats)
-
-            elif format == "rst":
-                # we add a link to the notebook
-                thisfiles += add_link_to_notebook(
-                    outputfile, notebook, "pdf" in formats, "html" in formats, "python" in formats,
-                    "slides" in formats)
-
-            elif format in ("tex", "latex", "pdf"):
-                thisfiles += add_link_to_notebook(outputfile,
-                                                  notebook, False, False, False, False)
-
-            elif format == "py":
-                pass
-
-            elif format in ["docx", "word"]:
-                pass
-
-            else:
-                raise HelpGenException("unexpected format " + format)
-
-            files.extend(thisfiles)
+    if n_jobs is None or n_jobs <= 1:
+        files = []
+        skipped = []
+        for notebook in notebooks:
+            nbfiles, nbskipped = _process_notebook_formats(notebook, formats, formats, build, build_slide,
+                                                           extensions, ipy, latex_path, pandoc_path, cache)
+            files.extend(nbfiles)
+            skipped.extend(nbskipped)
+    else:
+        files, skipped = _process_notebooks_parallel(notebooks, formats, build, build_slide,
+                                                     extensions, ipy, latex_path, pandoc_path, n_jobs, cache)
 
     copy = []
     for f in files:
@@ -474,6 +284,324 @@ def process_notebooks(notebooks,
     return copy + [(_, False) for _ in skipped]
 
 
+def _process_notebook_formats(notebook, formats, all_formats, build, build_slide,
+                              extensions, ipy, latex_path, pandoc_path, cache=None):
+    """
+    private: converts one notebook into several formats, it is called by
+    @see fn process_notebooks
+
+    @param      notebook        notebook
+    @param      formats         formats to produce
+    @param      all_formats     every format requested from @see fn process_notebooks
+    @param      build           temporary folder which contains all produced files
+    @param      build_slide     folder for the notebooks modified for the slides
+    @param      extensions      extension of every format
+    @param      ipy             ipython executable
+    @param      latex_path      path to the latex compiler
+    @param      pandoc_path     path to pandoc
+    @param      cache           @see cl NotebookConversionCache or None
+    @return                     produced files, skipped files
+
+    .. versionadded:: 1.2
+    """
+    cmd = '{0} nbconvert --to {1} "{2}"{5} --output="{3}/{4}"'
+    thisfiles = []
+    files = []
+    skipped = []
+
+    nbout = os.path.split(notebook)[-1]
+    if " " in nbout:
+        raise HelpGenException(
+            "spaces are not allowed in notebooks file names: {0}".format(notebook))
+    nbout = os.path.splitext(nbout)[0]
+    for format in formats:
+
+        # output
+        trueoutputfile = os.path.join(build, nbout + extensions[format])
+        fLOG("--- produce ", trueoutputfile)
+        pandoco = "docx" if format in ["word", "docx"] else None
+
+        # we chech it was not done before
+        if os.path.exists(trueoutputfile):
+            dto = os.stat(trueoutputfile).st_mtime
+            dtnb = os.stat(notebook).st_mtime
+            if dtnb < dto:
+                fLOG("-- skipping notebook", format,
+                     notebook, "(", trueoutputfile, ")")
+                if trueoutputfile not in thisfiles:
+                    thisfiles.append(trueoutputfile)
+                if pandoco is None:
+                    skipped.append(trueoutputfile)
+                    continue
+                else:
+                    out2 = os.path.splitext(
+                        trueoutputfile)[0] + "." + pandoco
+                    if os.path.exists(out2):
+                        skipped.append(trueoutputfile)
+                        continue
+
+        # we check the conversion was not done before on another checkout
+        if cache is not None:
+            key = cache.key(notebook, format, all_formats, latex_path)
+            restored = cache.restore(key, build)
+            if restored is not None:
+                fLOG("-- notebook from cache", format,
+                     notebook, "(", trueoutputfile, ")")
+                for name in restored:
+                    if name not in thisfiles:
+                        thisfiles.append(name)
+                files.extend(thisfiles)
+                continue
+            first = len(thisfiles)
+
+        # if the format is slides, we update the metadata
+        if format == "slides":
+            nb_slide = add_tag_for_slideshow(notebook, build_slide)
+            fLOG("NB SLIDE: run add_tag_for_slideshow", nb_slide)
+        else:
+            nb_slide = None
+
+        # next
+        options = ""
+        if format == "pdf":
+            title = os.path.splitext(
+                os.path.split(notebook)[-1])[0].replace("_", " ")
+            options = ' --SphinxTransformer.author="" --SphinxTransformer.overridetitle="{0}"'.format(
+                title)
+            format = "latex"
+            compilation = True
+        elif format in ["word", "docx"]:
+            format = "html"
+            compilation = False
+        elif format in ["slides"]:
+            options += " --reveal-prefix reveal.js"
+            compilation = False
+        else:
+            compilation = False
+
+        # output
+        outputfile = os.path.join(build, nbout + extensions[format])
+        fLOG("--- produce ", outputfile)
+
+        templ = "full" if format != "latex" else "article"
+        fLOG("### convert into ", format, " NB: ", notebook,
+             " ### ", os.path.exists(outputfile), ":", outputfile)
+
+        if format == "html":
+            fmttpl = " --template {0}".format(templ)
+        else:
+            fmttpl = ""
+
+        c = cmd.format(ipy,  format,
+                       notebook if nb_slide is None else nb_slide,
+                       build, nbout, fmttpl)
+
+        c += options
+        fLOG("NB:", c)
+
+        #
+        if format not in ["ipynb"]:
+            if not sys.platform.startswith("win"):
+                c = c.replace('"', '')
+            # , shell = sys.platform.startswith("win"))
+            # the latex conversion runs in the build folder,
+            # the current directory is not changed as several conversions may run at the same time
+            out, err = run_cmd(
+                c, wait=True, do_not_log=True, log_error=False,
+                change_path=build if format == "latex" else None)
+
+            if "raise ImportError" in err:
+                raise ImportError(err)
+            if len(err) > 0:
+                if format == "latex":
+                    # there might be some errors because the latex script needs to be post-processed
+                    # sometimes (wrong characters such as " or formulas not
+                    # captured as formulas)
+                    fLOG("LATEX ERR\n" + err)
+                    fLOG("LATEX OUT\n" + out)
+                else:
+                    err = err.lower()
+                    if "error" in err or "critical" in err or "bad config" in err:
+                        raise HelpGenException(err)
+
+        format = extensions[format].strip(".")
+
+        # we add the file to the list of generated files
+        if outputfile not in thisfiles:
+            thisfiles.append(outputfile)
+
+        fLOG("******", format, compilation, outputfile)
+
+        if compilation:
+            # compilation latex
+            if os.path.exists(latex_path):
+                if sys.platform.startswith("win"):
+                    lat = os.path.join(latex_path, "pdflatex.exe")
+                else:
+                    lat = "pdflatex"
+
+                tex = [
+                    _ for _ in thisfiles if os.path.splitext(_)[-1] == ".tex"]
+                if len(tex) != 1:
+                    raise FileNotFoundError(
+                        "no latex file was generated or more than one (={0}), nb={1}".format(len(tex), notebook))
+                tex = tex[0]
+                post_process_latex_output_any(tex)
+                # -interaction=batchmode
+                c = '"{0}" "{1}" -output-directory="{2}"'.format(
+                    lat, tex, os.path.split(tex)[0])
+                fLOG("   ** LATEX compilation (b)", c)
+                if not sys.platform.startswith("win"):
+                    c = c.replace('"', '')
+                out, err = run_cmd(
+                    c, wait=True, do_not_log=False, log_error=False, shell=sys.platform.startswith("win"))
+                if len(err) > 0:
+                    raise HelpGenException(
+                        "CMD:\n{0}\nERR:\n{1}".format(c, err))
+                f = os.path.join(build, nbout + ".pdf")
+                if not os.path.exists(f):
+                    raise HelpGenException(
+                        "missing file: {0}\nERR:\n{1}".format(f, err))
+                thisfiles.append(f)
+            else:
+                fLOG("unable to find latex in", latex_path)
+
+        elif pandoco is not None:
+            # compilation pandoc
+            fLOG("   ** pandoc compilation (b)", pandoco)
+            outfilep = os.path.splitext(outputfile)[0] + "." + pandoco
+
+            # for some files, the following error might appear:
+            # Stack space overflow: current size 33692 bytes.
+            # Use `+RTS -Ksize -RTS' to increase it.
+            # it usually means there is something wrong (circular
+            # reference, ...)
+            if sys.platform.startswith("win"):
+                c = r'"{0}\pandoc.exe" -f html -t {1} "{2}" -o "{3}"'.format(
+                    pandoc_path, pandoco, outputfile, outfilep)
+            else:
+                c = r'pandoc -f html -t {1} "{2}" -o "{3}"'.format(
+                    pandoc_path, pandoco, outputfile, outfilep)
+
+            if not sys.platform.startswith("win"):
+                c = c.replace('"', '')
+            out, err = run_cmd(
+                c, wait=True, do_not_log=False, log_error=False, shell=sys.platform.startswith("win"))
+            if len(err) > 0:
+                raise HelpGenException(
+                    "issue with cmd: %s\nERR:\n%s" % (c, err))
+
+        if format == "html":
+            # we add a link to the notebook
+            if not os.path.exists(outputfile):
+                raise FileNotFoundError(outputfile + "\nCONTENT in " + os.path.dirname(outputfile) + ":\n" + "\n".join(
+                    os.listdir(os.path.dirname(outputfile))) + "\nERR:\n" + err + "\nOUT:\n" + out + "\nCMD:\n" + c)
+            thisfiles += add_link_to_notebook(outputfile, notebook,
+                                              "pdf" in all_formats, False, "python" in all_formats,
+                                              "slides" in all_formats)
+
+        elif format == "slides.html":
+            # we add a link to the notebook
+            if not os.path.exists(outputfile):
+                raise FileNotFoundError(outputfile + "\nCONTENT in " + os.path.dirname(outputfile) + ":\n" + "\n".join(
+                    os.listdir(os.path.dirname(outputfile))) + "\nERR:\n" + err + "\nOUT:\n" + out + "\nCMD:\n" + c)
+            thisfiles += add_link_to_notebook(outputfile, notebook,
+                                              "pdf" in all_formats, False, "python" in all_formats,
+                                              "slides" in all_formats)
+
+        elif format == "ipynb":
+            # we just copy the notebook
+            thisfiles += add_link_to_notebook(outputfile, notebook,
+                                              "ipynb" in all_formats, False, "python" in all_formats,
+                                              "slides" in all_formats)
+
+        elif format == "rst":
+            # we add a link to the notebook
+            thisfiles += add_link_to_notebook(
+                outputfile, notebook, "pdf" in all_formats, "html" in all_formats, "python" in all_formats,
+                "slides" in all_formats)
+
+        elif format in ("tex", "latex", "pdf"):
+            thisfiles += add_link_to_notebook(outputfile,
+                                              notebook, False, False, False, False)
+
+        elif format == "py":
+            pass
+
+        elif format in ["docx", "word"]:
+            pass
+
+        else:
+            raise HelpGenException("unexpected format " + format)
+
+        if cache is not None:
+            extra = [os.path.join(build, nbout + "_files")]
+            if pandoco is not None:
+                extra.append(os.path.splitext(outputfile)[0] + "." + pandoco)
+            cache.store(key, thisfiles[first:], extra)
+
+        files.extend(thisfiles)
+
+    return files, skipped
+
+
+#: formats producing the same files, they cannot be converted at the same time,
+#: rst and latex both write the images into folder ``<notebook>_files``
+_notebook_format_groups = [{"html", "word", "docx"},
+                           {"rst", "latex", "pdf"}]
+
+
+def _process_notebooks_parallel(notebooks, formats, build, build_slide,
+                                extensions, ipy, latex_path, pandoc_path, n_jobs, cache=None):
+    """
+    private: converts notebooks with a pool of threads, it is called by
+    @see fn process_notebooks, a task converts one notebook into a group of formats
+    which produce the same files, the results are merged following the order of the notebooks
+
+    @param      notebooks       list of notebooks
+    @param      formats         formats to produce
+    @param      build           temporary folder which contains all produced files
+    @param      build_slide     folder for the notebooks modified for the slides
+    @param      extensions      extension of every format
+    @param      ipy             ipython executable
+    @param      latex_path      path to the latex compiler
+    @param      pandoc_path     path to pandoc
+    @param      n_jobs          number of threads
+    @param      cache           @see cl NotebookConversionCache or None
+    @return                     produced files, skipped files
+
+    .. versionadded:: 1.2
+    """
+    groups = []
+    for format in formats:
+        for g in groups:
+            if any(format in same and g[0] in same for same in _notebook_format_groups):
+                g.append(format)
+                break
+        else:
+            groups.append([format])
+
+    from concurrent.futures import ThreadPoolExecutor
+    files = []
+    skipped = []
+    with ThreadPoolExecutor(max_workers=n_jobs) as executor:
+        futures = [[executor.submit(_process_notebook_formats, notebook, g, formats, build, build_slide,
+                                    extensions, ipy, latex_path, pandoc_path, cache)
+                    for g in groups] for notebook in notebooks]
+        try:
+            for nbfutures in futures:
+                for fut in nbfutures:
+                    nbfiles, nbskipped = fut.result()
+                    files.extend(nbfiles)
+                    skipped.extend(nbskipped)
+        except Exception:
+            for nbfutures in futures:
+                for fut in nbfutures:
+                    fut.cancel()
+            raise
+    return files, skipped
+
+
 def add_link_to_notebook(file, nb, pdf, html, python, slides):
     """
     add a link to the notebook in HTML format and does a little bit of cleaning
@@ -499,9 +627,11 @@ def add_link_to_notebook(file, nb, pdf, html, python, slides):
 
     fold, name = os.path.split(file)
     res = [os.path.join(fold, os.path.split(nb)[-1])]
-    newr, reason = has_been_updated(nb, res[-1])
-    if newr:
-        shutil.copy(nb, fold)
+    with _copy_notebook_lock:
+        # several formats of the same notebook can be converted at the same time
+        newr, reason = has_been_updated(nb, res[-1])
+        if newr:
+            shutil.copy(nb, fold)
 
     if ext == ".ipynb":
         return res
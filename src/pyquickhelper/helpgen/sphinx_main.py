@@ -20,6 +20,7 @@ import warnings
 from docutils.parsers.rst import directives
 
 from ..loghelper.flog import run_cmd, fLOG
+from ..loghelper.run_cmd_parallel import run_cmd_parallel
 from ..loghelper.pyrepo_helper import SourceRepository
 from ..pandashelper.tblformat import df2rst
 from .utils_sphinx_doc import prepare_file_for_sphinx_help_generation
@@ -67,7 +68,10 @@ def generate_help_sphinx(project_var_name,
                          module_name=None,
                          from_repo=True,
                          use_run_cmd=False,
-                         add_htmlhelp=False):
+                         add_htmlhelp=False,
+                         incremental=False,
+                         n_jobs=1,
+                         notebook_cache=None):
     """
     runs the help generation
         - copies every file in another folder
@@ -89,6 +93,18 @@ def generate_help_sphinx(project_var_name,
                                     False otherwise
     @param      use_run_cmd         use @see fn run_cmd instead os ``os.system`` (default) to run Sphinx
     @param      add_htmlhelp        run HTML Help too (only on Windows)
+    @param      incremental         if True, only the modified source files are processed again,
+                                    see @see cl BuildManifest
+    @param      n_jobs              number of processes used to process the source files,
+                                    see @see fn copy_source_files, it is also the number of
+                                    notebooks conversions running at the same time,
+                                    see @see fn process_notebooks, and the number of
+                                    Sphinx builds (one per layout) and LaTeX compilations
+                                    running at the same time if *use_run_cmd* is True,
+                                    see @see fn run_cmd_parallel
+    @param      notebook_cache      folder which keeps the conversions of the notebooks,
+                                    it can be located outside the repository to be shared between checkouts,
+                                    see @see cl NotebookConversionCache
 
     The result is stored in path: ``root/_doc/sphinxdoc/source``.
     We assume the file ``root/_doc/sphinxdoc/source/conf.py`` exists
@@ -196,6 +212,11 @@ def generate_help_sphinx(project_var_name,
 
             "C:\\Program Files (x86)\\HTML Help Workshop\\hhc.exe" build\\htmlhelp\\<module>.hhp
 
+    .. versionchanged:: 1.2
+        Parameter *incremental* was added, the manifest is stored in ``build/sphinx_manifest.json``.
+        Parameters *n_jobs*, *notebook_cache* were added.
+        If *n_jobs* > 1, the layouts are built at the same time, every build
+        then uses its own doctrees folder ``build/doctrees_<layout>``.
     """
     setup_environment_for_help()
 
@@ -387,6 +408,14 @@ def generate_help_sphinx(project_var_name,
 
     sys_modules = set(sys.modules.keys())
 
+    if incremental:
+        build = os.path.join(root, "build")
+        if not os.path.exists(build):
+            os.makedirs(build)
+        manifest = os.path.join(build, "sphinx_manifest.json")
+    else:
+        manifest = None
+
     ####################
     # generates extra files
     ####################
@@ -404,7 +433,9 @@ def generate_help_sphinx(project_var_name,
             optional_dirs=optional_dirs,
             mapped_function=mapped_function,
             replace_relative_import=False,
-            module_name=module_name)
+            module_name=module_name,
+            manifest=manifest,
+            n_jobs=n_jobs)
 
     except ImportErrorHelpGen as e:
 
@@ -460,7 +491,9 @@ def generate_help_sphinx(project_var_name,
                                         outfold=notebook_doc,
                                         formats=nbformats,
                                         latex_path=latex_path,
-                                        pandoc_path=pandoc_path)
+                                        pandoc_path=pandoc_path,
+                                        n_jobs=n_jobs,
+                                        cache=notebook_cache)
             nbs = list(set(_[0] for _ in nbs_all))
             fLOG("*******NB, add:", nbs)
             add_notebook_page(
@@ -534,6 +567,9 @@ def generate_help_sphinx(project_var_name,
     cmds = []
     lays = []
     cmds_post = []
+    # the builds share the doctrees folder unless they run at the same time
+    parallel = use_run_cmd and n_jobs is not None and n_jobs > 1 and \
+        (len(layout) > 1 or add_htmlhelp)
     for t3 in layout:
         lay, build, override, newconf = lay_build_override_newconf(t3)
 
@@ -553,8 +589,9 @@ def generate_help_sphinx(project_var_name,
 
         sconf = "" if newconf is None else " -c {0}".format(newconf)
 
-        cmd = "sphinx-build -b {1} -d {0}/doctrees{2}{3} source {0}/{1}".format(
-            build, lay, over, sconf)
+        doctrees = "doctrees_" + lay if parallel else "doctrees"
+        cmd = "sphinx-build -b {1} -d {0}/{4}{2}{3} source {0}/{1}".format(
+            build, lay, over, sconf, doctrees)
         cmds.append(cmd)
         fLOG("run:", cmd)
         lays.append(lay)
@@ -562,8 +599,9 @@ def generate_help_sphinx(project_var_name,
         if add_htmlhelp and lay == "html":
             # we cannot execute htmlhelp in the same folder
             # as it changes the encoding
-            cmd = "sphinx-build -b {1}help -d {0}/doctrees{2}{3} source {0}/{1}help".format(
-                build, lay, over, sconf)
+            doctrees = "doctrees_" + lay + "help" if parallel else "doctrees"
+            cmd = "sphinx-build -b {1}help -d {0}/{4}{2}{3} source {0}/{1}help".format(
+                build, lay, over, sconf, doctrees)
             cmds.append(cmd)
             fLOG("run:", cmd)
             lays.append(lay)
@@ -577,6 +615,26 @@ def generate_help_sphinx(project_var_name,
     ###############################################################
     # run cmds (prefer to use os.system instread of run_cmd if it gets stuck)
     ###############################################################
+    if parallel:
+        # HtmlHelp runs once its build is completed
+        tasks = [dict(name=i, cmd=cmd) for i, cmd in enumerate(cmds)]
+        helps = [i for i, cmd in enumerate(cmds) if " -b htmlhelp " in cmd]
+        for cmd, dep in zip(cmds_post, helps):
+            tasks.append(dict(name=len(tasks), cmd=cmd, depends=[dep]))
+        fLOG("##### run sphinx, {0} commands, {1} at the same time".format(
+            len(tasks), n_jobs))
+        res = run_cmd_parallel(tasks, n_jobs=n_jobs, fLOG=fLOG)
+        for i, task in enumerate(tasks):
+            out, err, code, duration = res[i]
+            fLOG("#####", task["cmd"], "exit code", code,
+                 "in", "%1.2fs" % duration)
+            fLOG(out)
+            if len(err) > 0:
+                warnings.warn(
+                    "Sphinx went through errors. Check if any of them is important.\nOUT:\n{0}\nERR:\n{1}".format(out, err))
+        cmds = []
+        cmds_post = []
+
     for cmd in cmds:
         fLOG(
             "##################################################################################################")
@@ -602,7 +660,7 @@ def generate_help_sphinx(project_var_name,
         fLOG(
             "##################################################################################################")
 
-    if add_htmlhelp:
+    if add_htmlhelp and len(cmds_post) > 0:
         # we call HtmlHelp
         fLOG("### run HTMLHELP ###########################")
         for cmd in cmds_post:
@@ -665,7 +723,7 @@ def generate_help_sphinx(project_var_name,
 
     if "pdf" in layout:
         fLOG("---- compile_latex_output_final", froot, "**", latex_path)
-        compile_latex_output_final(froot, latex_path, False)
+        compile_latex_output_final(froot, latex_path, False, n_jobs=n_jobs)
 
     if "html" in layout:
         nbf = os.path.join(build, "html", "notebooks")
@@ -968,7 +1026,7 @@ def generate_changes_repo(chan,
     return final
 
 
-def compile_latex_output_final(root, latex_path, doall, afile=None):
+def compile_latex_output_final(root, latex_path, doall, afile=None, n_jobs=1):
     """
     compiles the latex documents
 
@@ -976,6 +1034,13 @@ def compile_latex_output_final(root, latex_path, doall, afile=None):
     @param      latex_path  path to the compiler
     @param      doall       do more transformation of the latex file before compiling it
     @param      afile       process a specific file
+    @param      n_jobs      number of documents compiled at the same time,
+                            see @see fn run_cmd_parallel
+
+    .. versionchanged:: 1.2
+        Parameter *n_jobs* was added. If *n_jobs* is 1, the documents are compiled
+        one after the other and the function stops at the first error, otherwise,
+        the second compilation of a document is skipped if the first one wrote on stderr.
     """
     if sys.platform.startswith("win"):
         lat = os.path.join(latex_path, "pdflatex.exe")
@@ -983,6 +1048,7 @@ def compile_latex_output_final(root, latex_path, doall, afile=None):
         lat = "pdflatex"
 
     build = os.path.join(root, "_doc", "sphinxdoc", "build", "latex")
+    cmds = []
     for tex in os.listdir(build):
         if tex.endswith(".tex") and (afile is None or afile in tex):
             file = os.path.join(build, tex)
@@ -993,8 +1059,12 @@ def compile_latex_output_final(root, latex_path, doall, afile=None):
             else:
                 c = '"{0}" "{1}" -interaction=batchmode -output-directory="{2}"'.format(
                     lat, file, build)
-            fLOG("   ** LATEX compilation (c)", c)
             post_process_latex_output(file, doall)
+            cmds.append((tex, c))
+
+    if n_jobs == 1:
+        for tex, c in cmds:
+            fLOG("   ** LATEX compilation (c)", c)
             out, err = run_cmd(c, wait=True, do_not_log=False, log_error=False)
             if len(err) > 0:
                 raise HelpGenException(
@@ -1004,6 +1074,28 @@ def compile_latex_output_final(root, latex_path, doall, afile=None):
             out, err = run_cmd(c, wait=True, do_not_log=False, log_error=False)
             if len(err) > 0:
                 raise HelpGenException(err)
+        return
+
+    tasks = []
+    for tex, c in cmds:
+        fLOG("   ** LATEX compilation (c)", c)
+        tasks.append(dict(name=(tex, 1), cmd=c))
+        # second compilation, skipped if the first one wrote on stderr
+        tasks.append(dict(name=(tex, 2), cmd=c, depends=[(tex, 1)]))
+
+    # pdflatex may fail on a document and still produce it,
+    # an error is anything written on stderr, not the exit code
+    res = run_cmd_parallel(tasks, n_jobs=n_jobs,
+                           skip_if_failed=lambda r: len(r[1]) > 0,
+                           do_not_log=False, log_error=False, fLOG=fLOG)
+    for task in tasks:
+        out, err, code, duration = res[task["name"]]
+        if len(err) > 0:
+            if task["name"][1] == 1:
+                raise HelpGenException(
+                    "CMD:\n{0}\nERR:\n{1}\nOUT:\n{2}".format(task["cmd"], err, out))
+            else:
+                raise HelpGenException(err)
 
 
 def replace_placeholder_by_recent_blogpost(all_tocs, plist, placeholder, nb_post=5):
@@ -7,6 +7,8 @@ import os
 import re
 import sys
 import shutil
+import hashlib
+import pickle
 import importlib
 from ..loghelper.flog import fLOG, noLOG
 from ..filehelper.synchelper import remove_folder, synchronize_folder, explore_folder
@@ -15,6 +17,7 @@ from .utils_sphinx_doc_helpers import add_file_rst_template, process_var_tag, im
 from .utils_sphinx_doc_helpers import get_module_objects, add_file_rst_template_cor, add_file_rst_template_title
 from .utils_sphinx_doc_helpers import IndexInformation, RstFileHelp, HelpGenException, process_look_for_tag, make_label_index
 from ..pandashelper.tblformat import df2rst
+from .build_manifest import BuildManifest, write_if_changed
 if sys.version_info[0] == 2:
     from codecs import open
 
@@ -227,16 +230,26 @@ def remove_undesired_part_for_documentation(content, filename):
     return "\n".join(res)
 
 
+def _fmod_copy_default(content, filename):
+    """
+    private: default modification applied to every copied file, returns *content*,
+    unlike a lambda function, it can be sent to another process
+    """
+    return content
+
+
 def copy_source_files(input,
                       output,
-                      fmod=lambda v, filename: v,
+                      fmod=_fmod_copy_default,
                       silent=False,
                       filter=None,
                       remove=True,
                       softfile=lambda f: False,
                       fexclude=lambda f: False,
                       addfilter=None,
-                      replace_relative_import=False):
+                      replace_relative_import=False,
+                      manifest=None,
+                      n_jobs=1):
     """
     copy all sources files (input) into a folder (output),
     apply on each of them a modification
@@ -256,12 +269,22 @@ def copy_source_files(input,
     @param      fexclude    function to exclude some files from the help
     @param      addfilter   additional filter, it should look like: ``"(.+[.]pyx$)|(.+[.]pyh$)"``
     @param      replace_relative_import     replace relative import
+    @param      manifest    @see cl BuildManifest or None, if not None, the output folder
+                            is not cleaned and a file is not processed again if neither
+                            the source nor the copy changed since the previous generation
+    @param      n_jobs      number of processes used to process the files, the results
+                            are merged in the same order, *fmod* must be picklable
+                            (a lambda function is not), the files are processed
+                            sequentially otherwise
     @return                 list of copied files
+
+    .. versionchanged:: 1.2
+        Parameters *manifest*, *n_jobs* were added.
     """
     if not os.path.exists(output):
         os.makedirs(output)
 
-    if remove:
+    if remove and manifest is None:
         remove_folder(output, False, raise_exception=False)
 
     deffilter = "(.+[.]py$)|(.+[.]pyd$)|(.+[.]cpp$)|(.+[.]h$)|(.+[.]dll$)|(.+[.]o$)|(.+[.]def$)|(.+[.]exe$)|(.+[.]config$)"
@@ -273,20 +296,30 @@ def copy_source_files(input,
             filter = "|".join([filter, addfilter])
 
     if filter is None:
-        actions = synchronize_folder(input,
-                                     output,
-                                     filter=deffilter,
-                                     avoid_copy=True)
-    else:
+        filter = deffilter
+
+    if manifest is None:
         actions = synchronize_folder(input,
                                      output,
                                      filter=filter,
                                      avoid_copy=True)
+    else:
+        # every source file is considered, not only the missing ones
+        actions = []
+
+        def collect(op, n1, n2):
+            if n1 is not None and not n1.isdir():
+                actions.append((">+", n1, output))
+            return False
+
+        synchronize_folder(input, output, filter=filter, hash_size=0,
+                           avoid_copy=True, operations=collect)
 
     if len(actions) == 0:
         raise FileNotFoundError("empty folder: " + input)
 
     ractions = []
+    todo = []
     for a, file, dest in actions:
         if a != ">+":
             continue
@@ -304,11 +337,42 @@ def copy_source_files(input,
             fLOG("copy_source_files: create ", dd,
                  softfile=softfile, fexclude=fexclude)
             os.makedirs(dd)
+        if manifest is not None:
+            stats = manifest.unchanged(file.fullname, to)
+            if stats is not None:
+                ractions.append((a, file, dest) + stats)
+                continue
+
         fLOG("copy_source_files: copy ", file.fullname, " to ", to)
+        todo.append((len(ractions), file.fullname, to))
+        ractions.append((a, file, dest))
+
+    if n_jobs is not None and n_jobs > 1 and len(todo) > 1:
+        try:
+            pickle.dumps(fmod)
+        except (pickle.PicklingError, AttributeError, TypeError):
+            fLOG("copy_source_files: fmod cannot be pickled, files are processed sequentially")
+            n_jobs = 1
+
+    if n_jobs is not None and n_jobs > 1 and len(todo) > 1:
+        from concurrent.futures import ProcessPoolExecutor
+        with ProcessPoolExecutor(max_workers=n_jobs) as executor:
+            # map keeps the order of the files
+            results = list(executor.map(_private_process_one_file,
+                                        [_[1] for _ in todo],
+                                        [_[2] for _ in todo],
+                                        [silent] * len(todo),
+                                        [fmod] * len(todo),
+                                        [replace_relative_import] * len(todo),
+                                        chunksize=max(1, len(todo) // (n_jobs * 4))))
+    else:
+        results = [_private_process_one_file(
+            fullname, to, silent, fmod, replace_relative_import) for _, fullname, to in todo]
 
-        rext, rline, rdocline = _private_process_one_file(
-            file.fullname, to, silent, fmod, replace_relative_import)
-        ractions.append((a, file, dest, rext, rline, rdocline))
+    for (pos, fullname, to), stats in zip(todo, results):
+        ractions[pos] = ractions[pos] + tuple(stats)
+        if manifest is not None:
+            manifest.update(fullname, to, stats)
 
     return ractions
 
@@ -518,7 +582,8 @@ def add_file_rst(rootm,
                  mapped_function=[],
                  indexes=None,
                  additional_sys_path=[],
-                 fLOG=noLOG):
+                 fLOG=noLOG,
+                 manifest=None):
     """
     creates a rst file for every source file
 
@@ -543,11 +608,20 @@ def add_file_rst(rootm,
     @param      indexes         to index some information { dictionary label:IndexInformation (...) }, the function populates it
     @param      additional_sys_path     additional path to include to sys.path before importing a module (will be removed afterwards)
     @param      fLOG            logging function
+    @param      manifest        @see cl BuildManifest or None, if not None, a rst file is only
+                                written if its content changed and the rst file produced by a function of
+                                *mapped_function* is not produced again if the source was skipped by
+                                @see fn copy_source_files
     @return                     list of written files stored in RstFileHelp
 
+    Python files are still imported when a manifest is given because the indexes
+    need every object of every module.
+
     .. versionadded:: 1.0
         Paramater *fLOG* was added.
 
+    .. versionchanged:: 1.2
+        Parameter *manifest* was added.
     """
 
     memo = {}
@@ -581,8 +655,11 @@ def add_file_rst(rootm,
                     content += "\n.. _%s_literal:\n\nCode\n----\n\n.. literalinclude:: %s\n\n" % (
                         noex, name)
 
-                with open(rst, "w", encoding="utf8") as g:
-                    g.write(content)
+                if manifest is None:
+                    with open(rst, "w", encoding="utf8") as g:
+                        g.write(content)
+                else:
+                    write_if_changed(rst, content)
                 app.append(RstFileHelp(to, rst, ""))
 
                 for k, v in indexes.items():
@@ -598,19 +675,26 @@ def add_file_rst(rootm,
                     memo[pat] = re.compile(pat)
                 exp = memo[pat]
                 if exp.search(file):
-                    with open(to, "r", encoding="utf8") as g:
-                        content = g.read()
-                    if func is None:
-                        func = filecontent_to_rst
-                    content = func(to, content)
-
-                    if isinstance(content, tuple) and len(content) == 2:
-                        content, doc = content
-                    else:
-                        doc = ""
+                    doc = None if manifest is None else manifest.get_doc(
+                        to, rst)
+                    if doc is None:
+                        with open(to, "r", encoding="utf8") as g:
+                            content = g.read()
+                        if func is None:
+                            func = filecontent_to_rst
+                        content = func(to, content)
+
+                        if isinstance(content, tuple) and len(content) == 2:
+                            content, doc = content
+                        else:
+                            doc = ""
 
-                    with open(rst, "w", encoding="utf8") as g:
-                        g.write(content)
+                        if manifest is None:
+                            with open(rst, "w", encoding="utf8") as g:
+                                g.write(content)
+                        else:
+                            write_if_changed(rst, content)
+                            manifest.set_doc(to, rst, doc)
                     app.append(RstFileHelp(to, rst, ""))
 
                     filenoext, ext = os.path.splitext(os.path.split(to)[-1])
@@ -835,7 +919,7 @@ def prepare_file_for_sphinx_help_generation(
         input,
         output,
         subfolders,
-        fmod_copy=lambda v, filename: v,
+        fmod_copy=_fmod_copy_default,
         template=add_file_rst_template,
         rootrep=("_doc.sphinxdoc.source.project_name.", ""),
         fmod_res=lambda v: v,
@@ -848,7 +932,9 @@ def prepare_file_for_sphinx_help_generation(
         issues=None,
         additional_sys_path=[],
         replace_relative_import=False,
-        module_name=None):
+        module_name=None,
+        manifest=None,
+        n_jobs=1):
     """
     prepare all files for Sphinx generation
 
@@ -892,6 +978,13 @@ def prepare_file_for_sphinx_help_generation(
     @param      additional_sys_path     additional paths to includes to sys.path when import a module (will be removed afterwards)
     @param      replace_relative_import replace relative import
     @param      module_name     module name (cannot be None)
+    @param      manifest        None, a filename or a @see cl BuildManifest, it enables
+                                an incremental generation: the output folder is not cleaned,
+                                unchanged source files are not processed again and files
+                                are only written if their content changed (Sphinx only reads the modified ones),
+                                the manifest must be removed if *fmod_copy* or *fmod_res* change
+    @param      n_jobs          number of processes used to copy and process the source files,
+                                see @see fn copy_source_files
 
     @return                     list of written files stored in RstFileHelp
 
@@ -916,10 +1009,20 @@ def prepare_file_for_sphinx_help_generation(
 
     .. versionchanged:: 1.0
         add parameter *module_name*, more robust to import issues
+
+    .. versionchanged:: 1.2
+        Parameters *manifest*, *n_jobs* were added.
     """
     if module_name is None:
         raise ValueError("module_name cannot be None")
 
+    if isinstance(manifest, str  # unicode#
+                  ):
+        fingerprint = "|".join([hashlib.md5(template.encode("utf8")).hexdigest(), str(rootrep),
+                                str(silent), str(replace_relative_import),
+                                str(subfolders), str(mapped_function)])
+        manifest = BuildManifest(manifest, fingerprint=fingerprint)
+
     fLOG("* starting documentation preparation in", output)
     rootm = os.path.abspath(output)
     fLOG("* module location", input)
@@ -952,7 +1055,8 @@ def prepare_file_for_sphinx_help_generation(
                                   mapped_function=mapped_function,
                                   indexes=indexes,
                                   additional_sys_path=additional_sys_path,
-                                  fLOG=fLOG
+                                  fLOG=fLOG,
+                                  manifest=manifest
                                   )
             rsts += rstadd
         else:
@@ -965,7 +1069,9 @@ def prepare_file_for_sphinx_help_generation(
                                           fexclude=fexclude,
                                           addfilter="|".join(
                                               ['(%s)' % _[0] for _ in mapped_function]),
-                                          replace_relative_import=replace_relative_import)
+                                          replace_relative_import=replace_relative_import,
+                                          manifest=manifest,
+                                          n_jobs=n_jobs)
 
             # without those two lines, importing the module might crash later
             if sys.version_info[0] != 2:
@@ -982,7 +1088,11 @@ def prepare_file_for_sphinx_help_generation(
                                  mapped_function=mapped_function,
                                  indexes=indexes,
                                  additional_sys_path=additional_sys_path,
-                                 fLOG=fLOG)
+                                 fLOG=fLOG,
+                                 manifest=manifest)
+
+            if manifest is not None:
+                manifest.remove_stale(dst, fLOG=fLOG)
 
         actions += actions_t
 
@@ -1006,7 +1116,9 @@ def prepare_file_for_sphinx_help_generation(
                           fexclude=fexclude,
                           addfilter="|".join(['(%s)' % _[0]
                                               for _ in mapped_function]),
-                          replace_relative_import=replace_relative_import)
+                          replace_relative_import=replace_relative_import,
+                          manifest=manifest,
+                          n_jobs=n_jobs)
 
     # processing all store_obj to compute some indices
     fLOG("extracted ", len(store_obj), " objects")
@@ -1030,8 +1142,11 @@ def prepare_file_for_sphinx_help_generation(
                     na = "/".join(na)
                     toc.append("    " + na)
             v += "\n".join(toc)
-        with open(out, "w", encoding="utf8") as f:
-            f.write(v)
+        if manifest is None:
+            with open(out, "w", encoding="utf8") as f:
+                f.write(v)
+        else:
+            write_if_changed(out, v)
         rsts.append(RstFileHelp(None, out, None))
 
     # generates a table with the number of lines per extension
@@ -1107,11 +1222,17 @@ def prepare_file_for_sphinx_help_generation(
             saveas = os.path.join(output, "all_%s%s.rst" %
                                   (tag,
                                    page.replace(":", "").replace("/", "").replace(" ", "")))
-            with open(saveas, "w", encoding="utf8") as f:
-                f.write(onefile)
+            if manifest is None:
+                with open(saveas, "w", encoding="utf8") as f:
+                    f.write(onefile)
+            else:
+                write_if_changed(saveas, onefile)
             app.append(RstFileHelp(saveas, onefile, ""))
     rsts += app
 
+    if manifest is not None:
+        manifest.save()
+
     fLOG("* end of documentation preparation in", output)
     return actions, rsts
 
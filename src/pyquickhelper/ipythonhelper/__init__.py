@@ -6,6 +6,7 @@
 from .notebook_runner import NotebookError, NotebookRunner
 from .cython_helper import ipython_cython_extension
 from .notebook_helper import run_notebook, upgrade_notebook, execute_notebook_list, read_nb
+from .kernel_pool import KernelPool
 from .magic_parser import MagicCommandParser
 from .magic_class import MagicClassWithHelpers
 from .kindofcompletion import AutoCompletion, AutoCompletionFile
@@ -0,0 +1,114 @@
+"""
+@file
+@brief Keeps kernels started in advance to run notebooks.
+
+.. versionadded:: 1.2
+"""
+import threading
+from queue import Queue, Empty
+
+from .notebook_runner import NotebookRunner
+from ..loghelper.flog import noLOG
+
+
+class KernelPool:
+
+    """
+    starts *size* kernels in advance, a kernel is used to run one
+    notebook and is then stopped, a new kernel is started in the background
+    every time one is taken from the pool so that the next notebook
+    does not wait for it
+
+    @code
+    pool = KernelPool(4, working_dir="temp")
+    kernel = pool.acquire()
+    runner = NotebookRunner(nb, kernel=kernel)
+    runner.run_notebook()
+    runner.shutdown_kernel()
+    pool.close()
+    @endcode
+    """
+
+    def __init__(self, size, profile_dir=None, working_dir=None, max_kernels=None, fLOG=noLOG):
+        """
+        constructor
+
+        @param      size            number of kernels ready to be used
+        @param      profile_dir     profile directory
+        @param      working_dir     working directory of the kernels
+        @param      max_kernels     total number of kernels to start (None for no limit),
+                                    the pool does not start kernels which will not be used
+        @param      fLOG            logging function
+        """
+        from concurrent.futures import ThreadPoolExecutor
+        self.size = size
+        self.profile_dir = profile_dir
+        self.working_dir = working_dir
+        self.LOG = fLOG
+        self._executor = ThreadPoolExecutor(max_workers=size)
+        self._ready = Queue()
+        self._lock = threading.Lock()
+        self._closed = False
+        self._remaining = max_kernels
+        for i in range(size):
+            self._start()
+
+    def _start(self):
+        """
+        private: starts a kernel in the background unless *max_kernels* were already started
+        """
+        if self._remaining is not None:
+            if self._remaining <= 0:
+                return
+            self._remaining -= 1
+        self._ready.put(self._executor.submit(NotebookRunner.start_kernel,
+                                              self.profile_dir, self.working_dir))
+
+    def acquire(self):
+        """
+        takes a kernel from the pool, waits for it if it is not ready yet,
+        the caller must stop it
+
+        @return     tuple (kernel manager, kernel client), see @see cl NotebookRunner
+        """
+        with self._lock:
+            if self._closed:
+                raise RuntimeError("the pool is closed")
+            try:
+                fut = self._ready.get_nowait()
+            except Empty:
+                raise RuntimeError(
+                    "no more kernels to start, max_kernels was reached")
+            self._start()
+        self.LOG("[KernelPool] acquire a kernel")
+        return fut.result()
+
+    def close(self):
+        """
+        stops the kernels which were not used
+        """
+        with self._lock:
+            self._closed = True
+        self._executor.shutdown(wait=True)
+        while True:
+            try:
+                fut = self._ready.get_nowait()
+            except Empty:
+                break
+            if fut.exception() is None:
+                km, kc = fut.result()
+                kc.stop_channels()
+                km.shutdown_kernel(now=True)
+        self.LOG("[KernelPool] closed")
+
+    def __enter__(self):
+        """
+        returns the pool
+        """
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        """
+        stops the kernels which were not used
+        """
+        self.close()
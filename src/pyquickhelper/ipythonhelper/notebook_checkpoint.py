@@ -0,0 +1,237 @@
+"""
+@file
+@brief Checkpoints to resume the execution of a notebook, see @see me run_notebook.
+
+.. versionadded:: 1.2
+"""
+import os
+import sys
+import json
+import time
+import shutil
+import hashlib
+
+from IPython.nbformat.v3 import NotebookNode
+
+if sys.version_info[0] == 2:
+    from codecs import open
+
+
+_code_save = '''
+def _checkpoint_save(folder, sequence):
+    import os
+    import pickle
+    import types
+    import inspect
+    import hashlib
+    # objects already saved: name -> (id, type, hash, file), only immutable objects are skipped
+    saved = globals().setdefault("_checkpoint_saved", {})
+    immutable = (int, float, complex, str, bytes, bool, type(None))
+    modules, sources, files = {}, [], {}
+    for name, value in list(globals().items()):
+        if name.startswith("_") or name in ("In", "Out", "exit", "quit", "get_ipython"):
+            continue
+        if isinstance(value, types.ModuleType):
+            modules[name] = value.__name__
+        elif isinstance(value, (types.FunctionType, type)) and \\
+                getattr(value, "__module__", None) == "__main__":
+            try:
+                sources.append(inspect.getsource(value))
+            except (OSError, TypeError):
+                pass
+        else:
+            if isinstance(value, immutable):
+                key = (id(value), type(value), hash(value))
+                if name in saved and saved[name][:3] == key:
+                    files[name] = saved[name][3]
+                    continue
+            else:
+                key = None
+            file = "%%s-%%d.pkl" %% (hashlib.md5(name.encode("utf8")).hexdigest(), sequence)
+            try:
+                # the object is written on disk, it is not copied in memory
+                with open(os.path.join(folder, file), "wb") as f:
+                    pickle.dump(value, f)
+            except Exception:
+                os.remove(os.path.join(folder, file))
+                saved.pop(name, None)
+                continue
+            files[name] = file
+            if key is None:
+                saved.pop(name, None)
+            else:
+                saved[name] = key + (file,)
+    index = os.path.join(folder, "index.pkl")
+    with open(index + ".tmp", "wb") as f:
+        pickle.dump((modules, sources, files), f)
+    os.replace(index + ".tmp", index)
+    keep = set(files.values())
+    for file in os.listdir(folder):
+        if file.endswith(".pkl") and file != "index.pkl" and file not in keep:
+            os.remove(os.path.join(folder, file))
+_checkpoint_save(%r, %d)
+del _checkpoint_save
+'''
+
+_code_restore = '''
+def _checkpoint_restore(folder, lost_file):
+    import os
+    import json
+    import pickle
+    import importlib
+    with open(os.path.join(folder, "index.pkl"), "rb") as f:
+        modules, sources, files = pickle.load(f)
+    for name, module in modules.items():
+        globals()[name] = importlib.import_module(module)
+    lost = []
+    for source in sources + [None]:
+        if source is None:
+            # the functions and the classes may depend on restored objects
+            for name, file in files.items():
+                try:
+                    with open(os.path.join(folder, file), "rb") as f:
+                        globals()[name] = pickle.load(f)
+                except Exception:
+                    lost.append(name)
+            continue
+        try:
+            exec(source, globals())
+        except Exception:
+            lost.append(source.split("\\n")[0])
+    with open(lost_file, "w") as f:
+        json.dump(sorted(lost), f)
+_checkpoint_restore(%r, %r)
+del _checkpoint_restore
+'''
+
+
+def _to_node(obj):
+    """
+    converts dictionaries loaded from JSON into NotebookNode
+    """
+    if isinstance(obj, dict):
+        return NotebookNode({k: _to_node(v) for k, v in obj.items()})
+    elif isinstance(obj, list):
+        return [_to_node(_) for _ in obj]
+    else:
+        return obj
+
+
+class NotebookCheckpoint:
+
+    """
+    stores the state of the execution of a notebook in a folder after every cell
+    (or every *every* seconds):
+
+    * ``state.json``: outputs of the executed cells and index of the next cell to run,
+    * ``namespace``: snapshot of the kernel namespace, modules are stored by name,
+      functions and classes defined in the notebook by their source,
+      the other objects are pickled into one file each, the ones which cannot be pickled are lost
+
+    The state is only used if the code of the notebook did not change.
+    The namespace is saved by a silent execution which does not change
+    the execution count of the kernel. The objects are pickled directly into files,
+    a number, a string or a bytes object is not pickled again if it did not change
+    since the previous checkpoint, the other objects are pickled every time.
+    Parameter *every* reduces the cost for notebooks holding big objects.
+    """
+
+    def __init__(self, runner, folder, every=None):
+        """
+        constructor, loads the state if it exists
+
+        @param      runner      @see cl NotebookRunner
+        @param      folder      folder which stores the checkpoint, it is created if it does not exist
+        @param      every       None to save the state after every cell, otherwise,
+                                minimum time in seconds between two checkpoints
+        """
+        self.runner = runner
+        self.folder = folder
+        self.every = every
+        self.state_file = os.path.join(folder, "state.json")
+        self.namespace_folder = os.path.join(folder, "namespace")
+        if not os.path.exists(self.namespace_folder):
+            os.makedirs(self.namespace_folder)
+        index = os.path.join(self.namespace_folder, "index.pkl")
+
+        m = hashlib.md5()
+        for cell in runner.iter_code_cells():
+            m.update(runner.get_cell_code(cell)[1].encode("utf8"))
+            m.update(b"\n--\n")
+        self.key = m.hexdigest()
+
+        self.state = None
+        if os.path.exists(self.state_file) and os.path.exists(index):
+            with open(self.state_file, "r", encoding="utf8") as f:
+                state = json.load(f)
+            if state["key"] == self.key:
+                self.state = state
+        if self.state is None:
+            self.state = dict(key=self.key, next=0, cells={}, sequence=0)
+        self._last = time.perf_counter()
+
+    @property
+    def resume_index(self):
+        """
+        returns the index of the first cell to execute
+        """
+        return self.state["next"]
+
+    def restore_namespace(self):
+        """
+        restores the kernel namespace if the execution resumes
+        """
+        if self.resume_index > 0:
+            self.runner.fLOG("-- resume the execution at cell",
+                             self.resume_index)
+            lost_file = os.path.join(self.folder, "lost.json")
+            self.runner.run_cell(-1, _code_restore % (self.namespace_folder, lost_file),
+                                 silent=True)
+            if os.path.exists(lost_file):
+                with open(lost_file, "r", encoding="utf8") as f:
+                    lost = json.load(f)
+                os.remove(lost_file)
+                if len(lost) > 0:
+                    self.runner.fLOG(
+                        "-- checkpoint, unable to restore:", ", ".join(lost))
+
+    def restore_cell(self, index, cell):
+        """
+        restores the outputs of a cell executed by a previous run
+        """
+        saved = self.state["cells"].get(str(index), None)
+        if saved is not None:
+            cell["outputs"] = _to_node(saved["outputs"])
+            if saved["prompt_number"] is not None:
+                cell["prompt_number"] = saved["prompt_number"]
+
+    def save(self, index, cell):
+        """
+        saves the kernel namespace and the outputs of cell *index*
+        which was just executed, the namespace and the state are only written
+        if *every* seconds elapsed since the previous checkpoint
+        """
+        self.state["cells"][str(index)] = dict(outputs=cell.get("outputs", []),
+                                               prompt_number=cell.get("prompt_number", None))
+        if self.every is not None and time.perf_counter() - self._last < self.every:
+            return
+        # every checkpoint writes new files, the previous ones are removed
+        # once the new index is written
+        self.state["sequence"] = self.state.get("sequence", 0) + 1
+        self.runner.run_cell(-1, _code_save % (self.namespace_folder, self.state["sequence"]),
+                             silent=True)
+        self.state["next"] = index + 1
+        temp = self.state_file + ".tmp"
+        with open(temp, "w", encoding="utf8") as f:
+            json.dump(self.state, f)
+        os.replace(temp, self.state_file)
+        self._last = time.perf_counter()
+
+    def remove(self):
+        """
+        removes the checkpoint once the notebook is completely executed
+        """
+        if os.path.exists(self.state_file):
+            os.remove(self.state_file)
+        if os.path.exists(self.namespace_folder):
+            shutil.rmtree(self.namespace_folder)
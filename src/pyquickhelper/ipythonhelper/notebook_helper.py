@@ -9,6 +9,7 @@ import time
 from IPython.nbformat import versions
 from IPython.nbformat.reader import reads
 from .notebook_runner import NotebookRunner
+from .kernel_pool import KernelPool
 from ..loghelper.flog import noLOG
 from IPython.nbformat.v4 import upgrade
 from .notebook_exception import NotebookException
@@ -84,7 +85,18 @@ def run_notebook(filename,
                  valid=None,
                  clean_function=None,
                  code_init=None,
-                 fLOG=noLOG):
+                 fLOG=noLOG,
+                 kernel=None,
+                 timeout=None,
+                 max_memory=None,
+                 drain="poll",
+                 cell_timeout=None,
+                 profile=False,
+                 max_output_size=None,
+                 image_folder=None,
+                 stream=False,
+                 checkpoint=None,
+                 checkpoint_every=None):
     """
     run a notebook end to end, it uses module `runipy <https://github.com/paulgb/runipy/>`_
 
@@ -99,6 +111,29 @@ def run_notebook(filename,
     @param      clean_function  function which cleans a cell's code before executing it (None for None)
     @param      code_init       code to run before the execution of the notebook as if it was a cell
     @param      fLOG            logging function
+    @param      kernel          None to start a new kernel or a kernel started by
+                                @see cl NotebookRunner or @see cl KernelPool, it is stopped at the end
+    @param      timeout         maximum execution time in seconds (None for no limit)
+    @param      max_memory      maximum memory the kernel can use in bytes (None for no limit)
+    @param      drain           how to collect the outputs of a cell, ``"poll"`` or ``"event"``,
+                                see @see cl NotebookRunner
+    @param      cell_timeout    maximum execution time of a cell in seconds (None for no limit)
+    @param      profile         if True, measures the execution time, the CPU time, the peak memory
+                                and the size of the outputs of every cell, the profile is stored
+                                in the statistics (key ``profile``, see @see me run_notebook)
+                                and in file ``<outfilename>.profile.csv`` if *outfilename* is not None,
+                                this file is also written with the executed cells if the execution fails
+    @param      max_output_size maximum number of characters of text a cell can output (None for no limit)
+    @param      image_folder    if not None, the images are saved in this folder instead of being
+                                stored in the notebook, see @see cl NotebookRunner
+    @param      stream          if True and *outfilename* is not None, every cell is written
+                                in *outfilename* as soon as it is executed and its outputs are removed
+                                from memory
+    @param      checkpoint      if not None, folder where the state of the execution is saved after every cell,
+                                a new execution resumes from the first cell which was not successfully
+                                executed, see @see me run_notebook
+    @param      checkpoint_every    if not None, minimum time in seconds between two checkpoints,
+                                    see @see cl NotebookCheckpoint
     @return                     tuple (statistics, output)
 
     @warning The function calls `basicConfig <https://docs.python.org/3.4/library/logging.html#logging.basicConfig>`_.
@@ -119,40 +154,69 @@ def run_notebook(filename,
         the absolute file name of the notebook.
         Parameter *code_init* was added.
         Return type was changed. It now returns *stat*, *output*
+
+    .. versionchanged:: 1.2
+        Parameters *kernel*, *timeout*, *max_memory*, *drain*, *cell_timeout*, *profile*,
+        *max_output_size*, *image_folder*, *stream*, *checkpoint*, *checkpoint_every* were added.
+        The kernel is stopped even if the execution fails.
     """
-    with open(filename, "r", encoding=encoding) as payload:
-        nb = reads(payload.read())
+    out = io.StringIO()
 
-        out = io.StringIO()
+    def flogging(*l, **p):
+        if len(l) > 0:
+            out.write(" ".join(l))
+        if len(p) > 0:
+            out.write(str(p))
+        out.write("\n")
+        fLOG(*l, **p)
 
-        def flogging(*l, **p):
-            if len(l) > 0:
-                out.write(" ".join(l))
-            if len(p) > 0:
-                out.write(str(p))
-            out.write("\n")
-            fLOG(*l, **p)
+    nb_runner = None
+    try:
+        with open(filename, "r", encoding=encoding) as payload:
+            nb = reads(payload.read())
 
         nb_runner = NotebookRunner(
             nb, profile_dir, working_dir, fLOG=flogging, comment=filename,
             theNotebook=os.path.abspath(filename),
-            code_init=code_init)
-        stat = nb_runner.run_notebook(skip_exceptions=skip_exceptions, additional_path=additional_path,
-                                      valid=valid, clean_function=clean_function)
+            code_init=code_init, kernel=kernel, drain=drain,
+            max_output_size=max_output_size, image_folder=image_folder)
+        stream_to = outfilename if stream else None
+        try:
+            stat = nb_runner.run_notebook(skip_exceptions=skip_exceptions, additional_path=additional_path,
+                                          valid=valid, clean_function=clean_function,
+                                          timeout=timeout, max_memory=max_memory,
+                                          cell_timeout=cell_timeout, profile=profile,
+                                          stream_to=stream_to, checkpoint=checkpoint,
+                                          checkpoint_every=checkpoint_every)
+        except Exception as e:
+            if outfilename is not None and hasattr(e, "profile"):
+                e.profile.to_csv(os.path.splitext(outfilename)[0] + ".profile.csv",
+                                 index=False)
+            raise
 
         if outfilename is not None:
-            with open(outfilename, 'w', encoding=encoding) as f:
-                try:
-                    s = writes(nb_runner.nb)
-                except NotebookException as e:
-                    raise NotebookException(
-                        "issue with notebook: " + filename) from e
-                if isinstance(s, bytes):
-                    s = s.decode('utf8')
-                f.write(s)
-
-        nb_runner.shutdown_kernel()
-        return stat, out.getvalue()
+            if stream_to is None:
+                with open(outfilename, 'w', encoding=encoding) as f:
+                    try:
+                        s = writes(nb_runner.nb)
+                    except NotebookException as e:
+                        raise NotebookException(
+                            "issue with notebook: " + filename) from e
+                    if isinstance(s, bytes):
+                        s = s.decode('utf8')
+                    f.write(s)
+            if profile:
+                stat["profile"].to_csv(os.path.splitext(outfilename)[0] + ".profile.csv",
+                                       index=False)
+    finally:
+        if nb_runner is not None:
+            nb_runner.shutdown_kernel()
+        elif kernel is not None:
+            # the notebook could not be read, the given kernel is stopped anyway
+            km, kc = kernel
+            kc.stop_channels()
+            km.shutdown_kernel(now=True)
+    return stat, out.getvalue()
 
 
 def read_nb(filename, profile_dir=None, encoding="utf8"):
@@ -186,7 +250,13 @@ def execute_notebook_list(folder,
                           valid=None,
                           fLOG=noLOG,
                           additional_path=None,
-                          deepfLOG=noLOG):
+                          deepfLOG=noLOG,
+                          n_jobs=1,
+                          timeout=None,
+                          max_memory=None,
+                          drain="poll",
+                          cell_timeout=None,
+                          profile=False):
     """
     execute a list of notebooks
 
@@ -197,6 +267,15 @@ def execute_notebook_list(folder,
     @param      fLOG                logging function
     @param      deepfLOG            logging function used to run the notebook
     @param      additional_path     path to add to *sys.path* before running the notebook
+    @param      n_jobs              number of notebooks executed at the same time, if > 1,
+                                    the kernels are started in advance by a @see cl KernelPool
+    @param      timeout             maximum execution time of a notebook in seconds (None for no limit)
+    @param      max_memory          maximum memory a kernel can use in bytes (None for no limit),
+                                    it requires module `psutil <https://pypi.python.org/pypi/psutil>`_
+    @param      drain               how to collect the outputs of a cell, ``"poll"`` or ``"event"``,
+                                    see @see cl NotebookRunner
+    @param      cell_timeout        maximum execution time of a cell in seconds (None for no limit)
+    @param      profile             if True, profiles every cell, see @see fn run_notebook
     @return                         dictionary { notebook_file: (isSuccess, statistics, outout) }
 
     If *isSucess* is False, *statistics* contains the execution time, *output* is the exception
@@ -211,34 +290,69 @@ def execute_notebook_list(folder,
         def clean_function(cell) : return new_cell_content
 
     .. versionadded:: 1.1
+
+    .. versionchanged:: 1.2
+        Parameters *n_jobs*, *timeout*, *max_memory*, *drain*, *cell_timeout*, *profile* were added.
     """
     if additional_path is None:
         additional_path = []
 
-    results = {}
+    def execute(i, note, code_init, kernel=None):
+        fLOG("******", i, os.path.split(note)[-1])
+        outfile = os.path.join(folder, "out_" + os.path.split(note)[-1])
+        cl = time.perf_counter()
+        try:
+            stat, out = run_notebook(note,
+                                     working_dir=folder,
+                                     outfilename=outfile,
+                                     additional_path=additional_path,
+                                     valid=valid,
+                                     clean_function=clean_function,
+                                     fLOG=deepfLOG,
+                                     code_init=code_init,
+                                     kernel=kernel,
+                                     timeout=timeout,
+                                     max_memory=max_memory,
+                                     drain=drain,
+                                     cell_timeout=cell_timeout,
+                                     profile=profile
+                                     )
+            if not os.path.exists(outfile):
+                raise FileNotFoundError(outfile)
+            return (True, stat, out)
+        except Exception as e:
+            etime = time.perf_counter() - cl
+            return (False, dict(time=etime), e)
+
+    todo = []
     for i, note in enumerate(notebooks):
         if isinstance(note, tuple):
             note, code_init = note
         else:
             code_init = None
         if filter(i, note):
-            fLOG("******", i, os.path.split(note)[-1])
-            outfile = os.path.join(folder, "out_" + os.path.split(note)[-1])
-            cl = time.clock()
-            try:
-                stat, out = run_notebook(note,
-                                         working_dir=folder,
-                                         outfilename=outfile,
-                                         additional_path=additional_path,
-                                         valid=valid,
-                                         clean_function=clean_function,
-                                         fLOG=deepfLOG,
-                                         code_init=code_init
-                                         )
-                if not os.path.exists(outfile):
-                    raise FileNotFoundError(outfile)
-                results[note] = (True, stat, out)
-            except Exception as e:
-                etime = time.clock() - cl
-                results[note] = (False, dict(time=etime), e)
+            todo.append((i, note, code_init))
+
+    results = {}
+    if n_jobs is None or n_jobs <= 1 or len(todo) <= 1:
+        for i, note, code_init in todo:
+            results[note] = execute(i, note, code_init)
+    else:
+        from concurrent.futures import ThreadPoolExecutor
+
+        with KernelPool(min(n_jobs, len(todo)), working_dir=folder,
+                        max_kernels=len(todo), fLOG=fLOG) as pool:
+
+            def execute_pool(i, note, code_init):
+                try:
+                    kernel = pool.acquire()
+                except Exception as e:
+                    return (False, dict(time=0.), e)
+                return execute(i, note, code_init, kernel=kernel)
+
+            with ThreadPoolExecutor(max_workers=n_jobs) as executor:
+                futures = [(note, executor.submit(execute_pool, i, note, code_init))
+                           for i, note, code_init in todo]
+                for note, fut in futures:
+                    results[note] = fut.result()
     return results
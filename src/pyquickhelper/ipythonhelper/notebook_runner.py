@@ -8,12 +8,17 @@ import re
 import time
 import io
 import sys
+import json
+import base64
+import threading
 from queue import Empty
+from collections import deque
 
 from IPython.nbformat.v3 import NotebookNode
 from IPython.kernel import KernelManager
-from IPython.nbformat import writes
+from IPython.nbformat import writes, versions
 
+from .notebook_checkpoint import NotebookCheckpoint
 from ..loghelper.flog import noLOG
 
 if sys.version_info[0] == 2:
@@ -28,6 +33,168 @@ class NotebookError(Exception):
     pass
 
 
+class _KernelMemorySampler(threading.Thread):
+
+    """
+    private: measures the memory used by a kernel every *interval* seconds
+    and keeps the maximum, see @see me run_notebook
+    """
+
+    def __init__(self, runner, interval=0.05):
+        """
+        constructor, starts the thread
+
+        @param      runner      @see cl NotebookRunner
+        @param      interval    time between two measures in seconds
+        """
+        threading.Thread.__init__(self)
+        self.daemon = True
+        self.runner = runner
+        self.interval = interval
+        self.peak = 0
+        self._stop_event = threading.Event()
+        self._lock = threading.Lock()
+        self.start()
+
+    def run(self):
+        """
+        measures the memory until @see me stop is called
+        """
+        import psutil
+        while not self._stop_event.wait(self.interval):
+            try:
+                memory = self.runner._kernel_usage()[1]
+            except psutil.Error:
+                # the kernel is stopped
+                break
+            with self._lock:
+                self.peak = max(self.peak, memory)
+
+    def reset(self):
+        """
+        returns the maximum measured since the last call and resets it
+        """
+        with self._lock:
+            peak = self.peak
+            self.peak = 0
+        return peak
+
+    def stop(self):
+        """
+        stops the thread
+        """
+        self._stop_event.set()
+        self.join()
+
+
+class _NotebookStreamWriter:
+
+    """
+    private: writes the cells of a notebook into a file as soon as they are executed,
+    the outputs of a written cell are removed from memory, see @see me run_notebook
+    """
+
+    def __init__(self, nb, filename, encoding="utf8"):
+        """
+        constructor, writes the beginning of the notebook
+
+        @param      nb          notebook
+        @param      filename    destination
+        @param      encoding    encoding
+        """
+        self.nb = nb
+        self.writes_json = versions[nb.nbformat].writes_json
+        if hasattr(nb, "worksheets"):
+            self.nbgroups = len(nb.worksheets)
+            self.pending = deque((k, cell) for k, ws in enumerate(nb.worksheets)
+                                 for cell in ws.cells)
+        else:
+            self.nbgroups = None
+            self.pending = deque((0, cell) for cell in nb.cells)
+
+        # the notebook without its cells, every list of cells is replaced by a marker
+        data = self._convert([[] for i in range(self.nbgroups or 1)])
+        groups = data["worksheets"] if self.nbgroups is not None else [data]
+        for k, group in enumerate(groups):
+            group["cells"] = "__CELLS_%d__" % k
+        text = json.dumps(data, sort_keys=True, indent=1, ensure_ascii=False)
+        self.pieces = []
+        for k in range(len(groups)):
+            before, text = text.split('"__CELLS_%d__"' % k)
+            self.pieces.append(before)
+        self.pieces.append(text)
+
+        self.current = 0
+        self.first = True
+        self.f = open(filename, "w", encoding=encoding)
+        self.f.write(self.pieces[0] + "[")
+
+    def _convert(self, groups):
+        """
+        converts a notebook restricted to some cells into JSON
+        with the same function as @see fn run_notebook
+
+        @param      groups      list of cells for every worksheet
+        @return                 JSON (dictionary)
+        """
+        mini = NotebookNode(self.nb)
+        if self.nbgroups is not None:
+            mini.worksheets = [NotebookNode(ws, cells=cells)
+                               for ws, cells in zip(self.nb.worksheets, groups)]
+        else:
+            mini.cells = groups[0]
+        text = self.writes_json(mini)
+        if isinstance(text, bytes):
+            text = text.decode("utf8")
+        return json.loads(text)
+
+    def _write_cell(self, k, cell):
+        """
+        writes a cell and removes its outputs
+        """
+        while self.current < k:
+            self.current += 1
+            self.f.write("]" + self.pieces[self.current] + "[")
+            self.first = True
+        groups = [[] for i in range(self.nbgroups or 1)]
+        groups[k].append(cell)
+        data = self._convert(groups)
+        data = data["worksheets"][k] if self.nbgroups is not None else data
+        text = json.dumps(data["cells"][0], sort_keys=True,
+                          indent=1, ensure_ascii=False)
+        self.f.write(("\n" if self.first else ",\n") + text)
+        self.f.flush()
+        self.first = False
+        if "outputs" in cell:
+            cell["outputs"] = []
+
+    def write_until(self, cell):
+        """
+        writes every cell until *cell* (included)
+        """
+        while len(self.pending) > 0:
+            k, c = self.pending.popleft()
+            self._write_cell(k, c)
+            if c is cell:
+                break
+
+    def close(self):
+        """
+        writes the remaining cells and closes the file
+        """
+        if self.f is None:
+            return
+        while len(self.pending) > 0:
+            self._write_cell(*self.pending.popleft())
+        while self.current < len(self.pieces) - 1:
+            self.current += 1
+            self.f.write("]" + self.pieces[self.current])
+            if self.current < len(self.pieces) - 1:
+                self.f.write("[")
+        self.f.close()
+        self.f = None
+
+
 class NotebookRunner(object):
 
     """
@@ -50,7 +217,8 @@ class NotebookRunner(object):
     }
 
     def __init__(self, nb, profile_dir=None, working_dir=None,
-                 comment="", fLOG=noLOG, theNotebook=None, code_init=None):
+                 comment="", fLOG=noLOG, theNotebook=None, code_init=None,
+                 kernel=None, drain="poll", max_output_size=None, image_folder=None):
         """
         constuctor
 
@@ -61,34 +229,148 @@ class NotebookRunner(object):
         @param      theNotebook     if not None, populate the variable *theNotebook* with this value in the notebook
         @param      code_init       to initialize the notebook with a python code as if it was a cell
         @param      fLOG            logging function
+        @param      kernel          None to start a new kernel or a kernel already started
+                                    by @see me start_kernel (*profile_dir* and *working_dir* are then ignored)
+        @param      drain           ``"poll"`` or ``"event"``, see below
+        @param      max_output_size if not None, maximum number of characters of text
+                                    a cell can output (streams and plain text results),
+                                    the text beyond is replaced by a marker
+        @param      image_folder    if not None, the images produced by a cell are saved
+                                    in this folder instead of being stored in the notebook
+
+        The outputs of a cell are sent by the kernel on channel *iopub*.
+        With ``drain="poll"``, the runner first waits for the reply to the
+        execution request and then reads the messages until the kernel is idle,
+        it gives up after ten seconds without any message.
+        With ``drain="event"``, the runner only keeps the messages
+        related to the current request and the cell is completed as soon as the kernel
+        sends the status idle for it.
+
+        With *image_folder*, the cell output refers to the saved image
+        with a relative path ``<name of image_folder>/<image>``,
+        the executed notebook should be saved in the parent folder of *image_folder*.
 
         .. versionchanged:: 1.1
             Parameters *theNotebook*, *code_init* were added.
+
+        .. versionchanged:: 1.2
+            Parameters *kernel*, *drain*, *max_output_size*, *image_folder* were added.
         """
-        self.km = KernelManager()
+        if drain not in ("poll", "event"):
+            raise ValueError("drain must be 'poll' or 'event' not '{0}'".format(drain))
+        if kernel is None:
+            kernel = NotebookRunner.start_kernel(profile_dir, working_dir)
+        self.km, self.kc = kernel
         self.fLOG = fLOG
         self.theNotebook = theNotebook
         self.code_init = code_init
+        self.nb = nb
+        self.comment = comment
+        self.deadline = None
+        self.max_memory = None
+        self._stopped = False
+        self.drain = drain
+        self.max_output_size = max_output_size
+        self.image_folder = image_folder
+        self._output_left = None
+        self._nb_images = 0
+
+    @staticmethod
+    def start_kernel(profile_dir=None, working_dir=None):
+        """
+        starts a kernel and waits until it is ready
+
+        @param      profile_dir     profile directory
+        @param      working_dir     working directory
+        @return                     tuple (kernel manager, kernel client)
+
+        The current directory of the process is not changed,
+        kernels can be started from several threads.
+
+        .. versionadded:: 1.2
+        """
+        km = KernelManager()
         args = []
 
         if profile_dir:
             args.append('--profile-dir=%s' % os.path.abspath(profile_dir))
 
-        cwd = os.getcwd()
-
         if working_dir:
-            os.chdir(working_dir)
+            km.start_kernel(extra_arguments=args,
+                            cwd=os.path.abspath(working_dir))
+        else:
+            km.start_kernel(extra_arguments=args)
+
+        kc = km.client()
+        kc.start_channels()
+        # if it does not work, it probably means IPython < 3
+        kc.wait_for_ready()
+        return km, kc
 
-        self.km.start_kernel(extra_arguments=args)
+    def _check_limits(self):
+        """
+        stops the kernel and raises an exception if the execution
+        takes longer than *deadline* or the kernel uses more memory than
+        *max_memory*, see @see me run_notebook
 
-        os.chdir(cwd)
+        .. versionadded:: 1.2
+        """
+        if self.deadline is not None and time.perf_counter() > self.deadline:
+            self.shutdown_kernel()
+            raise NotebookError(
+                "{0}\nthe execution of the notebook took too long, the kernel was stopped".format(self.comment))
+        if self.max_memory is not None:
+            import psutil
+            try:
+                memory = self._kernel_usage()[1]
+            except psutil.Error:
+                # the kernel is already stopped
+                return
+            if memory > self.max_memory:
+                self.shutdown_kernel()
+                raise NotebookError("{0}\nthe kernel uses {1} bytes > {2}, it was stopped".format(
+                    self.comment, memory, self.max_memory))
+
+    def _kernel_usage(self):
+        """
+        returns the CPU time and the memory used by the kernel and the processes it started,
+        it requires module `psutil <https://pypi.python.org/pypi/psutil>`_
 
-        self.kc = self.km.client()
-        self.kc.start_channels()
-        # if it does not work, it probably means IPython < 3
-        self.kc.wait_for_ready()
-        self.nb = nb
-        self.comment = comment
+        @return         tuple (CPU time in seconds, resident memory in bytes)
+
+        .. versionadded:: 1.2
+        """
+        import psutil
+        proc = psutil.Process(self.km.kernel.pid)
+        cpu, memory = 0., 0
+        for p in [proc] + proc.children(recursive=True):
+            try:
+                times = p.cpu_times()
+                cpu += times.user + times.system
+                memory += p.memory_info().rss
+            except psutil.Error:
+                if p is proc:
+                    raise
+        return cpu, memory
+
+    def _get_shell_reply(self, deadline=None):
+        """
+        waits for the reply to an execution request,
+        checks the limits every second
+
+        @param      deadline    deadline for the current cell, see @see me _check_cell_deadline
+        @return     reply
+
+        .. versionadded:: 1.2
+        """
+        if self.deadline is None and self.max_memory is None and deadline is None:
+            return self.kc.get_shell_msg()
+        while True:
+            try:
+                return self.kc.get_shell_msg(timeout=1)
+            except Empty:
+                self._check_limits()
+                self._check_cell_deadline(deadline)
 
     def to_json(self, filename, encoding="utf8"):
         """
@@ -147,8 +429,14 @@ class NotebookRunner(object):
     def shutdown_kernel(self):
         """
         shut down kernel
+
+        .. versionchanged:: 1.2
+            The function does nothing if the kernel was already stopped.
         """
+        if self._stopped:
+            return
         self.fLOG('-- shutdown kernel')
+        self._stopped = True
         self.kc.stop_channels()
         self.km.shutdown_kernel(now=True)
 
@@ -199,27 +487,243 @@ class NotebookRunner(object):
             except AttributeError:
                 return iscell, cell.input
 
-    def run_cell(self, index_cell, cell, clean_function=None):
+    def _add_iopub_output(self, msg, iscell, cell, outs):
+        """
+        converts a message received from the kernel into an output
+        and adds it to the list of outputs of a cell
+
+        @param      msg         message received on channel iopub
+        @param      iscell      True if *cell* is a cell, False for a string
+        @param      cell        cell
+        @param      outs        list of outputs
+        @return                 list of outputs (a new one if the message clears the outputs)
+
+        .. versionadded:: 1.2
+        """
+        content = msg['content']
+        msg_type = msg['msg_type']
+
+        # IPython 3.0.0-dev writes pyerr/pyout in the notebook format but uses
+        # error/execute_result in the message spec. This does the translation
+        # needed for tests to pass with IPython 3.0.0-dev
+        notebook3_format_conversions = {
+            'error': 'pyerr',
+            'execute_result': 'pyout'
+        }
+        msg_type = notebook3_format_conversions.get(msg_type, msg_type)
+
+        out = NotebookNode(output_type=msg_type)
+
+        if 'execution_count' in content:
+            if iscell:
+                cell['prompt_number'] = content['execution_count']
+            out.prompt_number = content['execution_count']
+
+        if msg_type in ('status', 'pyin', 'execute_input'):
+            return outs
+
+        elif msg_type == 'stream':
+            out.stream = content['name']
+            # in msgspec 5, this is name, text
+            # in msgspec 4, this is name, data
+            text = self._truncate_text(
+                content['text'] if 'text' in content else content['data'])
+            if text is None:
+                return outs
+            if 'text' in content:
+                out.text = text
+            else:
+                out.data = text
+
+        elif msg_type in ('display_data', 'pyout'):
+            data = self._save_images(content['data'])
+            if 'text/plain' in data:
+                text = self._truncate_text(data['text/plain'])
+                if text is None:
+                    data = {k: v for k, v in data.items() if k != 'text/plain'}
+                else:
+                    data['text/plain'] = text
+            if len(data) == 0:
+                return outs
+            out.data = data
+
+        elif msg_type == 'pyerr':
+            out.ename = content['ename']
+            out.evalue = content['evalue']
+            out.traceback = content['traceback']
+
+        elif msg_type == 'clear_output':
+            return list()
+
+        elif msg_type == 'comm_open' or msg_type == 'comm_msg':
+            # widgets in a notebook
+            out.data = content["data"]
+            out.comm_id = content["comm_id"]
+
+        else:
+            dcontent = "\n".join("{0}={1}".format(k, v)
+                                 for k, v in sorted(content.items()))
+            raise NotImplementedError(
+                'unhandled iopub message: %s' % msg_type + "\nCONTENT:\n" + dcontent)
+
+        outs.append(out)
+        return outs
+
+    def _truncate_text(self, text):
+        """
+        truncates a text output if the current cell exceeds *max_output_size* characters
+
+        @param      text        text (string or list of strings)
+        @return                 text, truncated text or None if nothing should be kept
+
+        .. versionadded:: 1.2
+        """
+        if self._output_left is None:
+            return text
+        if isinstance(text, list):
+            text = "".join(text)
+        if len(text) <= self._output_left:
+            self._output_left -= len(text)
+            return text
+        if self._output_left < 0:
+            # the marker was already added
+            return None
+        kept = text[:self._output_left]
+        self._output_left = -1
+        return kept + "\n[... output truncated, a cell cannot output more than {0} characters ...]\n".format(
+            self.max_output_size)
+
+    def _save_images(self, data):
+        """
+        saves the images of an output in *image_folder* and replaces them
+        by a reference
+
+        @param      data        dictionary { mime type: content }
+        @return                 modified dictionary
+
+        .. versionadded:: 1.2
+        """
+        if self.image_folder is None:
+            return data
+        images = [(k, NotebookRunner.MIME_MAP[k]) for k in data
+                  if k in ('image/png', 'image/jpeg', 'image/svg+xml')]
+        if len(images) == 0:
+            return data
+        if not os.path.exists(self.image_folder):
+            os.makedirs(self.image_folder)
+        prefix = "image" if self.theNotebook is None else \
+            os.path.splitext(os.path.split(self.theNotebook)[-1])[0]
+        data = data.copy()
+        html = []
+        for mime, ext in images:
+            self._nb_images += 1
+            name = "{0}_{1}.{2}".format(prefix, self._nb_images, ext)
+            content = data.pop(mime)
+            if isinstance(content, list):
+                content = "".join(content)
+            if ext == "svg":
+                with open(os.path.join(self.image_folder, name), "w", encoding="utf8") as f:
+                    f.write(content)
+            else:
+                with open(os.path.join(self.image_folder, name), "wb") as f:
+                    f.write(base64.b64decode(content))
+            html.append('<img src="{0}/{1}" />'.format(
+                os.path.split(os.path.normpath(self.image_folder))[-1], name))
+        if 'text/html' in data:
+            html.insert(0, data['text/html'])
+        data['text/html'] = "\n".join(html)
+        return data
+
+    def _check_cell_deadline(self, deadline):
+        """
+        interrupts the kernel and raises an exception if the current cell
+        runs after *deadline*
+
+        @param      deadline        None or a time given by ``time.perf_counter()``
+
+        .. versionadded:: 1.2
+        """
+        if deadline is not None and time.perf_counter() > deadline:
+            self.km.interrupt_kernel()
+            raise NotebookError(
+                "{0}\nthe execution of the cell took too long, the kernel was interrupted".format(self.comment))
+
+    def _drain_messages(self, msg_id, deadline, iscell, cell):
+        """
+        collects the messages sent by the kernel for an execution request,
+        it returns as soon as the kernel sends the status idle for this request,
+        messages related to other requests are ignored,
+        every message is converted into an output as soon as it is received
+        (see @see me _add_iopub_output) to keep only truncated outputs in memory
+
+        @param      msg_id      id of the execution request
+        @param      deadline    None or a time given by ``time.perf_counter()``
+        @param      iscell      True if *cell* is a cell, False for a string
+        @param      cell        cell
+        @return                 list of outputs, reply received on channel shell
+
+        .. versionadded:: 1.2
+        """
+        outs = list()
+        while True:
+            wait = 1. if deadline is None else max(
+                0., min(1., deadline - time.perf_counter()))
+            try:
+                msg = self.kc.get_iopub_msg(timeout=wait)
+            except Empty:
+                self._check_limits()
+                self._check_cell_deadline(deadline)
+                continue
+            if msg['parent_header'].get('msg_id', None) != msg_id:
+                continue
+            if msg['msg_type'] == 'status':
+                if msg['content']['execution_state'] == 'idle':
+                    break
+            outs = self._add_iopub_output(msg, iscell, cell, outs)
+
+        while True:
+            # the reply was sent before the status idle
+            reply = self._get_shell_reply(deadline)
+            if reply['parent_header'].get('msg_id', None) == msg_id:
+                return outs, reply
+
+    def run_cell(self, index_cell, cell, clean_function=None, timeout=None, silent=False):
         '''
         Run a notebook cell and update the output of that cell in-place.
 
         @param      index_cell          index of the cell
         @param      cell                cell to execute
         @param      clean_function      cleaning function to apply to the code before running it
+        @param      timeout             if not None, the kernel is interrupted and an exception raised
+                                        if the cell runs more than *timeout* seconds
+        @param      silent              if True, the code is executed silently, it does not change
+                                        the execution count and is not stored in the history of the kernel
         @return                         output of the cell
+
+        The text outputs are truncated to *max_output_size* characters
+        and the images saved in *image_folder* (see @see cl NotebookRunner).
+
+        .. versionchanged:: 1.2
+            Parameters *timeout*, *silent* were added.
         '''
         iscell, codei = NotebookRunner.get_cell_code(cell)
 
-        self.fLOG('-- running cell:\n%s\n' % codei)
+        if not silent:
+            self.fLOG('-- running cell:\n%s\n' % codei)
 
         code = self.clean_code(codei)
         if clean_function is not None:
             code = clean_function(code)
         if len(code) == 0:
             return ""
-        self.kc.execute(code)
+        self._output_left = self.max_output_size
+        msg_id = self.kc.execute(code, silent=silent, store_history=not silent)
+        deadline = None if timeout is None else time.perf_counter() + timeout
 
-        reply = self.kc.get_shell_msg()
+        if self.drain == "event":
+            outs, reply = self._drain_messages(msg_id, deadline, iscell, cell)
+        else:
+            reply = self._get_shell_reply(deadline)
         reason = None
         try:
             status = reply['content']['status']
@@ -241,81 +745,30 @@ class NotebookRunner(object):
             traceback_text = ''
             self.fLOG('-- cell returned')
 
-        outs = list()
-        nbissue = 0
-        while True:
-            try:
-                msg = self.kc.get_iopub_msg(timeout=1)
-                if msg['msg_type'] == 'status':
-                    if msg['content']['execution_state'] == 'idle':
-                        break
-            except Empty:
-                # execution state should return to idle before the queue becomes empty,
-                # if it doesn't, something bad has happened
-                status = "error"
-                reason = "exception Empty was raised"
-                nbissue += 1
-                if nbissue > 10:
-                    # the notebook is empty
-                    return ""
-                else:
-                    continue
-
-            content = msg['content']
-            msg_type = msg['msg_type']
-
-            # IPython 3.0.0-dev writes pyerr/pyout in the notebook format but uses
-            # error/execute_result in the message spec. This does the translation
-            # needed for tests to pass with IPython 3.0.0-dev
-            notebook3_format_conversions = {
-                'error': 'pyerr',
-                'execute_result': 'pyout'
-            }
-            msg_type = notebook3_format_conversions.get(msg_type, msg_type)
-
-            out = NotebookNode(output_type=msg_type)
-
-            if 'execution_count' in content:
-                if iscell:
-                    cell['prompt_number'] = content['execution_count']
-                out.prompt_number = content['execution_count']
-
-            if msg_type in ('status', 'pyin', 'execute_input'):
-                continue
-
-            elif msg_type == 'stream':
-                out.stream = content['name']
-                # in msgspec 5, this is name, text
-                # in msgspec 4, this is name, data
-                if 'text' in content:
-                    out.text = content['text']
-                else:
-                    out.data = content['data']
-
-            elif msg_type in ('display_data', 'pyout'):
-                out.data = content['data']
-
-            elif msg_type == 'pyerr':
-                out.ename = content['ename']
-                out.evalue = content['evalue']
-                out.traceback = content['traceback']
-
-            elif msg_type == 'clear_output':
-                outs = list()
-                continue
-
-            elif msg_type == 'comm_open' or msg_type == 'comm_msg':
-                # widgets in a notebook
-                out.data = content["data"]
-                out.comm_id = content["comm_id"]
-
-            else:
-                dcontent = "\n".join("{0}={1}".format(k, v)
-                                     for k, v in sorted(content.items()))
-                raise NotImplementedError(
-                    'unhandled iopub message: %s' % msg_type + "\nCONTENT:\n" + dcontent)
-
-            outs.append(out)
+        if self.drain != "event":
+            outs = list()
+            nbissue = 0
+            while True:
+                try:
+                    msg = self.kc.get_iopub_msg(timeout=1)
+                    if msg['msg_type'] == 'status':
+                        if msg['content']['execution_state'] == 'idle':
+                            break
+                except Empty:
+                    self._check_limits()
+                    self._check_cell_deadline(deadline)
+                    # execution state should return to idle before the queue becomes empty,
+                    # if it doesn't, something bad has happened
+                    status = "error"
+                    reason = "exception Empty was raised"
+                    nbissue += 1
+                    if nbissue > 10:
+                        # the notebook is empty
+                        return ""
+                    else:
+                        continue
+
+                outs = self._add_iopub_output(msg, iscell, cell, outs)
 
         if iscell:
             cell['outputs'] = outs
@@ -529,7 +982,13 @@ class NotebookRunner(object):
                      progress_callback=None,
                      additional_path=None,
                      valid=None,
-                     clean_function=None):
+                     clean_function=None,
+                     timeout=None,
+                     max_memory=None,
+                     cell_timeout=None,
+                     profile=False,
+                     stream_to=None,
+                     checkpoint=None, checkpoint_every=None):
         '''
         Run all the cells of a notebook in order and update
         the outputs in-place.
@@ -542,12 +1001,85 @@ class NotebookRunner(object):
         @param      additional_path     additional paths (as a list or None if none)
         @param      valid               if not None, valid is a function which returns wether or not the cell should be executed or not
         @param      clean_function      function which cleans a cell's code before executing it (None for None)
+        @param      timeout             if not None, the kernel is stopped and an exception raised
+                                        if the execution takes more than *timeout* seconds
+        @param      max_memory          if not None, the kernel is stopped and an exception raised
+                                        if it uses more than *max_memory* bytes (requires module
+                                        `psutil <https://pypi.python.org/pypi/psutil>`_)
+        @param      cell_timeout        if not None, the kernel is interrupted and an exception raised
+                                        if a cell runs more than *cell_timeout* seconds
+        @param      profile             if True, the statistics contain a profile of every cell,
+                                        it requires module `psutil <https://pypi.python.org/pypi/psutil>`_,
+                                        if the execution fails, the profile of the executed cells
+                                        is stored in attribute ``profile`` of the raised exception
+        @param      stream_to           if not None, the notebook is written into this file while it is executed,
+                                        every cell is written as soon as it is executed and its outputs
+                                        are removed from memory, the file is completed even if the execution fails
+        @param      checkpoint          if not None, folder where the state of the execution is saved after every cell,
+                                        see @see cl NotebookCheckpoint
+        @param      checkpoint_every    if not None, the state is saved after a cell only if *checkpoint_every*
+                                        seconds elapsed since the previous checkpoint
         @return                         dictionary with statistics
 
+        The statistics are ``nbcell``, ``nbrun``, ``nbvalid``, ``time`` and
+        ``cell_times``, the list of tuples *(index of the cell, wall time in seconds)*
+        for every executed cell.
+
+        If *profile* is True, the key ``profile`` contains a DataFrame
+        with one row per executed cell and the following columns:
+
+        * *cell*: index of the cell
+        * *wall_time*: execution time in seconds
+        * *cpu_time*: CPU time used by the kernel in seconds
+        * *peak_memory*: maximum memory used by the kernel in bytes,
+          it is sampled every 50 milliseconds
+        * *output_size*: size of the outputs (number of characters in JSON format)
+
+        If *checkpoint* is not None, the outputs of the executed cells and a snapshot
+        of the kernel namespace are saved after every cell. If the execution fails
+        or is interrupted, the next execution with the same checkpoint restores
+        the outputs and the namespace and continues from the first cell
+        which was not successfully executed, the statistics contain the key ``resumed``,
+        the index of this cell. The checkpoint is removed once the notebook
+        is completely executed.
+
         .. versionchanged:: 1.1
             The function adds the local variable ``theNotebook`` with
             the absolute file name of the notebook.
+
+        .. versionchanged:: 1.2
+            Parameters *timeout*, *max_memory*, *cell_timeout*, *profile*, *stream_to*,
+            *checkpoint*, *checkpoint_every* were added.
+            The statistics include the execution time of every cell.
         '''
+        if max_memory is not None or profile:
+            # fails now if the module is missing
+            import psutil
+            psutil.Process()
+        self.deadline = None if timeout is None else time.perf_counter() + timeout
+        self.max_memory = max_memory
+        writer = None if stream_to is None else _NotebookStreamWriter(
+            self.nb, stream_to)
+        try:
+            return self._run_notebook(skip_exceptions=skip_exceptions, progress_callback=progress_callback,
+                                      additional_path=additional_path, valid=valid,
+                                      clean_function=clean_function, cell_timeout=cell_timeout,
+                                      profile=profile, writer=writer, checkpoint=checkpoint,
+                                      checkpoint_every=checkpoint_every)
+        finally:
+            self.deadline = None
+            self.max_memory = None
+            if writer is not None:
+                writer.close()
+
+    def _run_notebook(self, skip_exceptions, progress_callback,
+                      additional_path, valid, clean_function, cell_timeout, profile,
+                      writer, checkpoint, checkpoint_every=None):
+        """
+        private: runs all the cells, see @see me run_notebook
+
+        .. versionadded:: 1.2
+        """
         # additional path
         if additional_path is not None:
             if not isinstance(additional_path, list):
@@ -568,33 +1100,112 @@ class NotebookRunner(object):
         if self.code_init is not None:
             self.run_cell(-1, self.code_init)
 
+        # restores the state of a previous execution
+        if checkpoint is not None:
+            checkpoint = NotebookCheckpoint(
+                self, checkpoint, every=checkpoint_every)
+            checkpoint.restore_namespace()
+            resume = checkpoint.resume_index
+        else:
+            resume = 0
+
         # execution of the notebook
         nbcell = 0
         nbrun = 0
         nbnerr = 0
+        cell_times = []
+        rows = []
+        sampler = _KernelMemorySampler(self) if profile else None
         cl = time.clock()
-        for i, cell in enumerate(self.iter_code_cells()):
-            nbcell += 1
-            iscell, codei = NotebookRunner.get_cell_code(cell)
-            if valid is not None and not valid(codei):
-                continue
-            try:
-                nbrun += 1
-                self.run_cell(i, cell, clean_function=clean_function)
-                nbnerr += 1
-            except Empty as er:
-                raise Exception(
-                    "{0}\nissue when executing:\n{1}".format(self.comment, codei)) from er
-            except NotebookError as e:
-                if not skip_exceptions:
-                    raise
-                else:
+        try:
+            for i, cell in enumerate(self.iter_code_cells()):
+                nbcell += 1
+                if i < resume:
+                    checkpoint.restore_cell(i, cell)
+                    if writer is not None:
+                        writer.write_until(cell)
+                    continue
+                iscell, codei = NotebookRunner.get_cell_code(cell)
+                if valid is not None and not valid(codei):
+                    continue
+                try:
+                    nbrun += 1
+                    if sampler is not None:
+                        cpu = self._kernel_usage()[0]
+                        sampler.reset()
+                    begin = time.perf_counter()
+                    outs = self.run_cell(i, cell, clean_function=clean_function,
+                                         timeout=cell_timeout)
+                    cell_times.append((i, time.perf_counter() - begin))
+                    if sampler is not None:
+                        cpu_end, memory = self._kernel_usage()
+                        rows.append(dict(cell=i, wall_time=cell_times[-1][1],
+                                         cpu_time=cpu_end - cpu,
+                                         peak_memory=max(
+                                             sampler.reset(), memory),
+                                         output_size=NotebookRunner._output_size(outs)))
+                    if checkpoint is not None:
+                        checkpoint.save(i, cell)
+                    nbnerr += 1
+                except Empty as er:
                     raise Exception(
-                        "issue when executing:\n{0}".format(codei)) from e
-            if progress_callback:
-                progress_callback(i)
+                        "{0}\nissue when executing:\n{1}".format(self.comment, codei)) from er
+                except NotebookError as e:
+                    if not skip_exceptions:
+                        raise
+                    else:
+                        raise Exception(
+                            "issue when executing:\n{0}".format(codei)) from e
+                if writer is not None:
+                    writer.write_until(cell)
+                if progress_callback:
+                    progress_callback(i)
+        except Exception as e:
+            if sampler is not None:
+                # the profile of the executed cells is given to the caller
+                e.profile = NotebookRunner._profile_frame(rows)
+            raise
+        finally:
+            if sampler is not None:
+                sampler.stop()
         etime = time.clock() - cl
-        return dict(nbcell=nbcell, nbrun=nbrun, nbvalid=nbnerr, time=etime)
+        stats = dict(nbcell=nbcell, nbrun=nbrun, nbvalid=nbnerr, time=etime,
+                     cell_times=cell_times)
+        if checkpoint is not None:
+            checkpoint.remove()
+            stats["resumed"] = resume
+        if sampler is not None:
+            stats["profile"] = NotebookRunner._profile_frame(rows)
+        return stats
+
+    @staticmethod
+    def _profile_frame(rows):
+        """
+        private: converts the profile of the cells into a DataFrame
+
+        @param      rows        list of dictionaries, one per executed cell
+        @return                 DataFrame
+
+        .. versionadded:: 1.2
+        """
+        import pandas
+        return pandas.DataFrame(rows, columns=["cell", "wall_time", "cpu_time",
+                                               "peak_memory", "output_size"])
+
+    @staticmethod
+    def _output_size(outs):
+        """
+        returns the size of the outputs of a cell
+
+        @param      outs        outputs returned by @see me run_cell
+        @return                 number of characters in JSON format
+
+        .. versionadded:: 1.2
+        """
+        try:
+            return len(json.dumps(outs))
+        except TypeError:
+            return len(str(outs))
 
     def count_code_cells(self):
         '''
@@ -13,6 +13,7 @@ def check_log():
 
 
 from .flog import run_cmd, fLOG, noLOG, PQHException, download, unzip_files, unzip, decode_outerr, run_script, removedirs
+from .run_cmd_parallel import run_cmd_parallel
 from .convert_helper import str_to_datetime, timestamp_to_datetime
 from .url_helper import get_url_content
 from .pyrepo_helper import SourceRepository
@@ -32,13 +32,17 @@ import decimal
 import urllib
 import copy
 import zipfile
-from .flog_fake_classes import FlogStatic, LogFakeFileStream, LogFileStream, PQHException
+import atexit
+import threading
+from .flog_fake_classes import FlogStatic, LogFakeFileStream, LogFileStream, PQHException, LogAsyncWriter
 
 if sys.version_info[0] == 2:
     from codecs import open
     import urllib2 as urllib_request
+    from Queue import Queue, Empty
 else:
     import urllib.request as urllib_request
+    from queue import Queue, Empty
 
 
 flog_static = FlogStatic()
@@ -158,6 +162,54 @@ def GetLogFile(physical=False, filename=None):
     return flog_static.store_log_values["__log_file"]
 
 
+def _print_lines(text):
+    """
+    private: prints messages ending with a new line, used by @see cl LogAsyncWriter
+    """
+    text = text.rstrip("\r\n")
+    try:
+        print(text)
+    except UnicodeEncodeError:
+        try:
+            print("\n".join(repr(text).split("\\n")))
+        except UnicodeEncodeError:
+            print("look error in log file")
+
+
+def _write_log(text):
+    """
+    private: writes messages into the current log file, used by @see cl LogAsyncWriter
+    """
+    GetLogFile().write(text)
+
+
+def set_async_log(enable=True):
+    """
+    switches the logs to the asynchronous mode, the messages are written
+    and displayed by a dedicated thread, the caller does not wait for the writing
+
+    @param      enable      True to enable, False to disable (the pending messages are written)
+
+    The pending messages are written when the program exits
+    or when ``fLOG(Flush=True)`` is called.
+
+    .. versionadded:: 1.2
+    """
+    writer = flog_static.store_log_values.get("__log_writer", None)
+    if enable:
+        if writer is None:
+            writer = LogAsyncWriter(GetLogFile)
+            flog_static.store_log_values["__log_writer"] = writer
+            atexit.register(writer.close)
+    elif writer is not None:
+        writer.close()
+        if hasattr(atexit, "unregister"):
+            # Python 2 cannot unregister a function,
+            # calling close again at exit does nothing
+            atexit.unregister(writer.close)
+        flog_static.store_log_values["__log_writer"] = None
+
+
 def noLOG(*l, **p):
     """
     does nothing
@@ -177,6 +229,8 @@ def fLOG(*l, **p):
                             - if p contains LogPathAdd, it adds this path to the temporary file
                             - if p contains Lock, it Locks option OutputPrint
                             - if p contains UnLock, it unlock option OutputPrint
+                            - if p contains Async, it calls @see fn set_async_log
+                            - if p contains Flush, it waits until all messages are written
 
                         example:
                         @code
@@ -203,9 +257,25 @@ def fLOG(*l, **p):
     @endcode
 
     @endFAQ
+
+    The logs do not slow down the caller anymore if they are written
+    by a dedicated thread:
+
+    @code
+    fLOG(OutputPrint=True, LogFile="log_file.txt", Async=True)
+    ...
+    fLOG(Flush=True)
+    @endcode
+
+    .. versionchanged:: 1.2
+        Parameters *Async*, *Flush* were added.
     """
     path_add = p.get("LogPathAdd", [])
 
+    if "Async" in p:
+        set_async_log(p["Async"])
+    writer = flog_static.store_log_values.get("__log_writer", None)
+
     lock = p.get("Lock", None)
     if lock is not None:
         flog_static.store_log_values["Lock"] = lock
@@ -263,7 +333,11 @@ def fLOG(*l, **p):
             message = str(dt).split(".")[0] + " " + " ".join([_str_process(s) for s in l]) + \
                 flog_static.store_log_values["__log_file_sep"]
 
-        if flog_static.store_log_values["__log_display"]:
+        if writer is not None:
+            if flog_static.store_log_values["__log_display"]:
+                writer.put(_print_lines, message)
+            writer.put(_write_log, message)
+        elif flog_static.store_log_values["__log_display"]:
             try:
                 myprint(message.strip("\r\n"))
             except UnicodeEncodeError:
@@ -278,7 +352,8 @@ def fLOG(*l, **p):
                     except UnicodeEncodeError:
                         myprint("look error in log file")
 
-        GetLogFile().write(message)
+        if writer is None:
+            GetLogFile().write(message)
         st = "                    "
     else:
         st = typstr(dt).split(".")[0] + " "
@@ -291,13 +366,21 @@ def fLOG(*l, **p):
                 typstr(k), typstr(v), flog_static.store_log_values["__log_file_sep"])
         if "INNER JOIN" in message:
             break
+        if writer is not None:
+            writer.put(_write_log, message)
+            if flog_static.store_log_values["__log_display"]:
+                writer.put(_print_lines, message)
+            continue
         GetLogFile().write(message)
         if flog_static.store_log_values["__log_display"]:
             try:
                 myprint(message.strip("\r\n"))
             except UnicodeEncodeError:
                 myprint("\n".join(repr(message.strip("\r\n")).split("\\n")))
-    GetLogFile().flush()
+    if writer is None:
+        GetLogFile().flush()
+    elif p.get("Flush", False):
+        writer.flush()
 
 
 def _this_fLOG(*l, **p):
@@ -883,6 +966,7 @@ def run_cmd(cmd,
             communicate=True,
             preprocess=True,
             timeout=None,
+            return_exit_code=False,
             fLOG=fLOG):
     """
     run a command line and wait for the result
@@ -898,13 +982,18 @@ def run_cmd(cmd,
     @param      do_not_log          do not log the output
     @param      encerror            encoding errors (ignore by default) while converting the output into a string
     @param      encoding            encoding of the output
-    @param      change_path         change the current path if  not None (put it back after the execution)
+    @param      change_path         if not None, the command is executed in this folder
     @param      communicate         use method `communicate <https://docs.python.org/3.4/library/subprocess.html#subprocess.Popen.communicate>`_ which is supposed to be safer,
                                     parameter ``wait`` must be True
     @param      preprocess          preprocess the command line if necessary (not available on Windows) (False to disable that option)
-    @param      timeout             when data is sent to stdin (``sin``), a timeout is needed to avoid waiting for ever (*timeout* is in seconds)
+    @param      timeout             maximum execution time of the command in seconds (None for no limit),
+                                    the process is killed and exception *subprocess.TimeoutExpired* is raised
+                                    if it runs longer (only if *wait* is True)
+    @param      return_exit_code    if True, the function also returns the exit code of the command
+                                    (None if it is still running)
     @param      fLOG                logging function (if not None, bypass others parameters)
-    @return                         content of stdout, stdres  (only if wait is True)
+    @return                         content of stdout, stdres  (only if wait is True),
+                                    and the exit code if *return_exit_code* is True
     @rtype      tuple
 
     @example(run a program using the command line)
@@ -918,6 +1007,15 @@ def run_cmd(cmd,
     .. versionchanged:: 0.9
         parameters *timeout*, *fLOG* were added,
         the function now works with stdin
+
+    .. versionchanged:: 1.2
+        *change_path* does not change the current directory of the calling process anymore,
+        the function can be called from several threads at the same time.
+        If *communicate* is False, stdout and stderr are read by two threads,
+        the function does not block anymore if the command writes a lot on stderr
+        and it returns as soon as the command ends.
+        The process is killed if it runs longer than *timeout*.
+        Parameter *return_exit_code* was added.
     """
     if secure is not None:
         with open(secure, "w") as f:
@@ -934,10 +1032,6 @@ def run_cmd(cmd,
     elif not do_not_log:
         _this_fLOG("execute", cmd)
 
-    if change_path is not None:
-        current = os.getcwd()
-        os.chdir(change_path)
-
     if sys.platform.startswith("win"):
 
         startupinfo = subprocess.STARTUPINFO()
@@ -949,7 +1043,8 @@ def run_cmd(cmd,
                                      sin) > 0 else None,
                                  stdout=subprocess.PIPE if wait else None,
                                  stderr=subprocess.PIPE if wait else None,
-                                 startupinfo=startupinfo)
+                                 startupinfo=startupinfo,
+                                 cwd=change_path)
     else:
         cmdl = split_cmp_command(cmd) if preprocess else cmd
         if fLOG is not None:
@@ -961,7 +1056,8 @@ def run_cmd(cmd,
                                  stdin=subprocess.PIPE if sin is not None and len(
                                      sin) > 0 else None,
                                  stdout=subprocess.PIPE if wait else None,
-                                 stderr=subprocess.PIPE if wait else None)
+                                 stderr=subprocess.PIPE if wait else None,
+                                 cwd=change_path)
 
     if isinstance(cmd, list):
         cmd = " ".join(cmd)
@@ -981,8 +1077,13 @@ def run_cmd(cmd,
             if sys.version_info[0] == 2:
                 stdoutdata, stderrdata = pproc.communicate(input=input)
             else:
-                stdoutdata, stderrdata = pproc.communicate(
-                    input=input, timeout=timeout)
+                try:
+                    stdoutdata, stderrdata = pproc.communicate(
+                        input=input, timeout=timeout)
+                except subprocess.TimeoutExpired:
+                    pproc.kill()
+                    pproc.communicate()
+                    raise
             out = decode_outerr(stdoutdata, encoding, encerror, cmd)
             err = decode_outerr(stderrdata, encoding, encerror, cmd)
         else:
@@ -990,9 +1091,52 @@ def run_cmd(cmd,
                 raise Exception(
                     "communicate should be True to send something on stdin")
             stdout, stderr = pproc.stdout, pproc.stderr
+            deadline = None if timeout is None else time.perf_counter() + timeout
+            errs = []
+            # set once the function stops waiting, the threads keep reading
+            # the pipes so that the command does not block but nobody
+            # needs the lines anymore
+            discard = threading.Event()
+
+            def read_stdout(lines):
+                # the pipe is closed by the thread once the command ends,
+                # the command may still be running when run_cmd returns
+                try:
+                    for line in stdout:
+                        if lines is not None and not discard.is_set():
+                            lines.put(line)
+                finally:
+                    stdout.close()
+                if lines is not None and not discard.is_set():
+                    lines.put(None)
+
+            def read_stderr():
+                try:
+                    for line in stderr:
+                        if not discard.is_set():
+                            errs.append(line)
+                finally:
+                    stderr.close()
+
+            th_err = threading.Thread(target=read_stderr)
+            th_err.daemon = True
+            th_err.start()
 
             if secure is None:
-                for line in stdout:
+                lines = Queue()
+                th_out = threading.Thread(target=read_stdout, args=(lines,))
+                th_out.daemon = True
+                th_out.start()
+                while True:
+                    try:
+                        line = lines.get(timeout=None if deadline is None else
+                                         max(deadline - time.perf_counter(), 0))
+                    except Empty:
+                        pproc.kill()
+                        pproc.wait()
+                        raise subprocess.TimeoutExpired(cmd, timeout)
+                    if line is None:
+                        break
                     decol = decode_outerr(line, encoding, encerror, cmd)
                     if fLOG is not None:
                         fLOG(decol.strip("\n\r"))
@@ -1000,8 +1144,6 @@ def run_cmd(cmd,
                         _this_fLOG(decol.strip("\n\r"))
 
                     out.append(decol.strip("\n\r"))
-                    if stdout.closed:
-                        break
                     if stop_waiting_if is not None and stop_waiting_if(decol):
                         skip_waiting = True
                         break
@@ -1023,21 +1165,47 @@ def run_cmd(cmd,
                                 last) > 0 and stop_waiting_if(last[-1]):
                             skip_waiting = True
                             break
+                    if deadline is not None and time.perf_counter() > deadline:
+                        pproc.kill()
+                        pproc.wait()
+                        raise subprocess.TimeoutExpired(cmd, timeout)
                     time.sleep(0.1)
 
-            if not skip_waiting:
-                pproc.wait()
-
             out = "\n".join(out)
-            temp = err = stderr.read()
+            if skip_waiting:
+                # the command is still running, the function returns the lines
+                # of the error stream received until now, the threads keep reading
+                # the pipes, discard the lines and close them when the command ends
+                th_err.join(0.1)
+                discard.set()
+                temp = b"".join(list(errs))
+                if secure is None:
+                    while True:
+                        try:
+                            lines.get_nowait()
+                        except Empty:
+                            break
+                else:
+                    th_out = threading.Thread(target=read_stdout, args=(None,))
+                    th_out.daemon = True
+                    th_out.start()
+            else:
+                try:
+                    pproc.wait(None if deadline is None else
+                               max(deadline - time.perf_counter(), 0))
+                except subprocess.TimeoutExpired:
+                    pproc.kill()
+                    pproc.wait()
+                    raise
+                th_err.join()
+                temp = b"".join(errs)
+                if secure is not None:
+                    stdout.close()
             try:
                 err = decode_outerr(temp, encoding, encerror, cmd)
             except:
                 err = decode_outerr(temp, encoding, "ignore", cmd)
 
-            stdout.close()
-            stderr.close()
-
         err = err.replace("\r\n", "\n")
         if fLOG is not None:
             fLOG("end of execution", cmd)
@@ -1050,18 +1218,15 @@ def run_cmd(cmd,
             else:
                 _this_fLOG("error (log)\n%s" % err)
 
-        if change_path is not None:
-            os.chdir(current)
-
         if sys.platform.startswith("win"):
-            return out.replace("\r\n", "\n"), err.replace("\r\n", "\n")
+            out, err = out.replace("\r\n", "\n"), err.replace("\r\n", "\n")
+        if return_exit_code:
+            return out, err, pproc.poll()
         else:
             return out, err
+    elif return_exit_code:
+        return "", "", None
     else:
-
-        if change_path is not None:
-            os.chdir(current)
-
         return "", ""
 
 
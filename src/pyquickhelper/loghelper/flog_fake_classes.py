@@ -7,6 +7,11 @@
 """
 import logging
 import logging.handlers
+import threading
+try:
+    from queue import Queue
+except ImportError:
+    from Queue import Queue
 
 
 class PQHException (Exception):
@@ -115,3 +120,83 @@ class LogFileStream:
         does nothing
         """
         pass
+
+
+class LogAsyncWriter:
+
+    """
+    writes the logs in a dedicated thread, the caller only adds
+    the messages to a queue, the thread writes them by batch and
+    flushes the log file after every batch, see @see fn fLOG
+
+    .. versionadded:: 1.2
+    """
+
+    def __init__(self, get_stream):
+        """
+        constructor, starts the thread
+
+        @param      get_stream      function returning the log file (stream)
+        """
+        self.get_stream = get_stream
+        self.queue = Queue()
+        self.thread = threading.Thread(target=self._run)
+        self.thread.daemon = True
+        self.thread.start()
+
+    def put(self, func, text):
+        """
+        adds a message
+
+        @param      func        function which writes the message (``print``, ``stream.write``)
+        @param      text        message
+        """
+        self.queue.put((func, text))
+
+    def _run(self):
+        """
+        writes the messages until it receives *(None, None)*
+        """
+        stop = False
+        while not stop:
+            items = [self.queue.get()]
+            while not self.queue.empty():
+                items.append(self.queue.get())
+            # the messages for the same function are written at once
+            batch = []
+            for func, text in items:
+                if func is None:
+                    stop = True
+                    continue
+                for f, texts in batch:
+                    if f is func:
+                        texts.append(text)
+                        break
+                else:
+                    batch.append((func, [text]))
+            for func, texts in batch:
+                try:
+                    func("".join(texts))
+                except Exception:
+                    # the logs must not stop the thread
+                    pass
+            try:
+                self.get_stream().flush()
+            except Exception:
+                pass
+            for item in items:
+                self.queue.task_done()
+
+    def flush(self):
+        """
+        waits until every message is written
+        """
+        self.queue.join()
+
+    def close(self):
+        """
+        writes the remaining messages and stops the thread
+        """
+        if self.thread.is_alive():
+            self.queue.put((None, None))
+            self.thread.join()
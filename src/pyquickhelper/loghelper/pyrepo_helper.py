@@ -16,15 +16,27 @@ class SourceRepository:
     or the `GitHub application <http://windows.github.com/>`_.
     """
 
-    def __init__(self, commandline=True):
+    def __init__(self, commandline=True, snapshot=False):
         """
         constructor
 
         @param      commandline     use command line or a specific module (like pysvn for example)
+        @param      snapshot        answer the queries with a cached snapshot of the repository,
+                                    see @see fn get_repo_snapshot (GIT and SVN)
+
+        .. versionchanged:: 1.2
+            Parameter *snapshot* was added.
         """
         self.commandline = commandline
+        self.snapshot = snapshot
         self.module = None
 
+    def _options(self):
+        """
+        returns the additional parameters given to the functions of the repository module
+        """
+        return dict(snapshot=True) if self.snapshot else {}
+
     def SetGuessedType(self, location):
         """
         guess the repository type given a location and change a member of the class
@@ -32,6 +44,13 @@ class SourceRepository:
         @param      location    location
         @return                 module to use
         """
+        if self.snapshot:
+            # no need to start a process, the closest repository wins
+            svn = SVN._find_svn_folder(location)[0]
+            git = GIT._find_git_folder(location)[0]
+            if svn is not None or git is not None:
+                self.module = SVN if len(svn or "") >= len(git or "") else GIT
+                return self.module
         svn = SVN.IsRepo(location, commandline=self.commandline)
         if not svn:
             git = GIT.IsRepo(location, commandline=self.commandline)
@@ -57,7 +76,7 @@ class SourceRepository:
         """
         if self.module is None:
             self.SetGuessedType(path)
-        return self.module.repo_ls(path, commandline=self.commandline)
+        return self.module.repo_ls(path, commandline=self.commandline, **self._options())
 
     def log(self, path=None, file_detail=False):
         """
@@ -82,7 +101,7 @@ class SourceRepository:
         if self.module is None:
             self.SetGuessedType(path)
         return self.module.get_repo_log(
-            path, file_detail, commandline=self.commandline)
+            path, file_detail, commandline=self.commandline, **self._options())
 
     def version(self, path=None):
         """
@@ -92,7 +111,7 @@ class SourceRepository:
         """
         if self.module is None:
             self.SetGuessedType(path)
-        return self.module.get_repo_version(path, commandline=self.commandline)
+        return self.module.get_repo_version(path, commandline=self.commandline, **self._options())
 
     def nb_commits(self, path=None):
         """
@@ -103,4 +122,4 @@ class SourceRepository:
         """
         if self.module is None:
             self.SetGuessedType(path)
-        return self.module.get_nb_commits(path, commandline=self.commandline)
+        return self.module.get_nb_commits(path, commandline=self.commandline, **self._options())
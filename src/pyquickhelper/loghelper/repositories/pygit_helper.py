@@ -6,7 +6,9 @@
 
 import os
 import sys
+import bisect
 import datetime
+import threading
 import xml.etree.ElementTree as ET
 
 from ..flog import fLOG, run_cmd
@@ -84,13 +86,20 @@ class RepoFile:
         return self.name
 
 
-def repo_ls(full, commandline=True):
+def repo_ls(full, commandline=True, snapshot=False):
     """
     run ``ls`` on a path
     @param      full            full path
     @param      commandline use command line instead of pysvn
+    @param      snapshot        if True, the function uses @see fn get_repo_snapshot
+                                and lists the files of the index instead of the files of HEAD
     @return                     output of client.ls
+
+    .. versionchanged:: 1.2
+        Parameter *snapshot* was added.
     """
+    if snapshot:
+        return get_repo_snapshot(full, commandline).ls(full)
 
     if not commandline:
         try:
@@ -147,12 +156,13 @@ def __get_version_from_version_txt(path):
         "unable to find version.txt in\n" + "\n".join(paths))
 
 
-def get_repo_log(path=None, file_detail=False, commandline=True):
+def get_repo_log(path=None, file_detail=False, commandline=True, snapshot=False):
     """
     get the latest changes operated on a file in a folder or a subfolder
     @param      path            path to look
     @param      file_detail     if True, add impacted files
     @param      commandline     if True, use the command line to get the version number, otherwise it uses pysvn
+    @param      snapshot        if True, the function uses @see fn get_repo_snapshot
     @return                     list of changes, each change is a list of 4-uple:
                                     - author
                                     - commit hash [:6]
@@ -190,6 +200,8 @@ def get_repo_log(path=None, file_detail=False, commandline=True):
         when it was used to generate documentation for others modules than pyquickhelper.
         Not using this function helps. The cause still remains obscure.
 
+    .. versionchanged:: 1.2
+        Parameter *snapshot* was added.
     """
     if file_detail:
         raise NotImplementedError()
@@ -198,6 +210,9 @@ def get_repo_log(path=None, file_detail=False, commandline=True):
         path = os.path.normpath(
             os.path.abspath(os.path.join(os.path.split(__file__)[0], "..", "..", "..")))
 
+    if snapshot:
+        return get_repo_snapshot(path, commandline).get_log(path)
+
     if not commandline:
         try:
             raise NotImplementedError()
@@ -261,7 +276,7 @@ def get_repo_log(path=None, file_detail=False, commandline=True):
         return res
 
 
-def get_repo_version(path=None, commandline=True, usedate=False, log=False):
+def get_repo_version(path=None, commandline=True, usedate=False, log=False, snapshot=False):
     """
     Get the latest check for a specific path or version number based on the date (is usedate is True)
     If usedate is False, it returns a mini hash (a string then)
@@ -270,16 +285,28 @@ def get_repo_version(path=None, commandline=True, usedate=False, log=False):
     @param      commandline     if True, use the command line to get the version number, otherwise it uses pysvn
     @param      usedate         if True, it uses the date to return a minor version number (1.1.thisone)
     @param      log             if True, returns the output instead of a boolean
+    @param      snapshot        if True, the function uses @see fn get_repo_snapshot
     @return                     integer)
+
+    .. versionchanged:: 1.2
+        Parameter *snapshot* was added.
     """
     if not usedate:
-        last = get_nb_commits(path, commandline)
+        last = get_nb_commits(path, commandline, snapshot=snapshot)
         return last
     else:
         if path is None:
             path = os.path.normpath(
                 os.path.abspath(os.path.join(os.path.split(__file__)[0], "..", "..", "..")))
 
+        if snapshot:
+            changes = get_repo_snapshot(path, commandline).get_log(path)
+            if len(changes) == 0:
+                raise Exception("no commit for path " + path)
+            dt = changes[0][2]
+            dt0 = datetime.datetime(dt.year, 1, 1, 0, 0, 0)
+            return "%d" % (dt - dt0).days
+
         if not commandline:
             try:
                 raise NotImplementedError()
@@ -380,18 +407,25 @@ def get_master_location(path=None, commandline=True):
         return res
 
 
-def get_nb_commits(path=None, commandline=True):
+def get_nb_commits(path=None, commandline=True, snapshot=False):
     """
     returns the number of commit
 
     @param      path            path to look
     @param      commandline     if True, use the command line to get the version number, otherwise it uses pysvn
+    @param      snapshot        if True, the function uses @see fn get_repo_snapshot
     @return                     integer
+
+    .. versionchanged:: 1.2
+        Parameter *snapshot* was added.
     """
     if path is None:
         path = os.path.normpath(
             os.path.abspath(os.path.join(os.path.split(__file__)[0], "..", "..", "..")))
 
+    if snapshot:
+        return get_repo_snapshot(path, commandline).nb_commits(path)
+
     if not commandline:
         try:
             raise NotImplementedError()
@@ -431,6 +465,327 @@ def get_nb_commits(path=None, commandline=True):
         return nb
 
 
+def _git_command(args):
+    """
+    private: builds a git command for @see fn run_cmd
+
+    @param      args        list of arguments
+    @return                 command (a string on Windows, a list otherwise)
+    """
+    if sys.platform.startswith("win32"):
+        return r'"C:\Program Files (x86)\Git\bin\git" ' + \
+            " ".join('"%s"' % a if " " in a else a for a in args)
+    else:
+        return ["git"] + args
+
+
+def _find_git_folder(path):
+    """
+    private: looks for the folder ``.git`` in *path* or one of its parents
+
+    @param      path        path to look
+    @return                 root of the repository, git folder (or None, None)
+    """
+    path = os.path.abspath(path)
+    if os.path.isfile(path):
+        path = os.path.dirname(path)
+    while True:
+        git = os.path.join(path, ".git")
+        if os.path.isdir(git):
+            return path, git
+        if os.path.isfile(git):
+            # worktree or submodule
+            with open(git, "r") as f:
+                line = f.read().strip()
+            if line.startswith("gitdir:"):
+                return path, os.path.normpath(os.path.join(path, line[7:].strip()))
+        parent = os.path.dirname(path)
+        if parent == path:
+            return None, None
+        path = parent
+
+
+def _git_common_folder(git):
+    """
+    private: returns the folder holding the branches, ``packed-refs`` and the configuration,
+    it is the git folder unless it contains a file ``commondir`` (worktree)
+
+    @param      git     git folder returned by @see fn _find_git_folder
+    @return             folder
+    """
+    commondir = os.path.join(git, "commondir")
+    if os.path.isfile(commondir):
+        with open(commondir, "r") as f:
+            return os.path.normpath(os.path.join(git, f.read().strip()))
+    return git
+
+
+class RepositorySnapshot:
+
+    """
+    keeps in memory the content of a git repository obtained with two git commands,
+    ``git ls-files -z`` for the list of files and ``git log --name-status``
+    for the history (only run when it is needed), the files and the commits
+    are indexed by folder to answer @see fn repo_ls, @see fn get_repo_log,
+    @see fn get_nb_commits without starting any other process
+
+    The snapshot is obtained with @see fn get_repo_snapshot which keeps
+    one snapshot per repository and builds a new one once the commit HEAD points to
+    or the modification time of the index changed.
+
+    .. versionadded:: 1.2
+    """
+
+    def __init__(self, path, commandline=True):
+        """
+        constructor, runs ``git ls-files``
+
+        @param      path            any path inside the repository
+        @param      commandline     only True is implemented
+        """
+        self.root, self.git = _find_git_folder(path)
+        if self.root is None:
+            raise FileNotFoundError(
+                "unable to find a git repository for path " + path)
+        self.commandline = commandline
+        self.key = RepositorySnapshot.current_key(self.git)
+        self._log = None
+        self._master = None
+        self._lock = threading.Lock()
+
+        out = self._run(["ls-files", "-z"])
+        self.files = sorted(_ for _ in out.split("\0") if len(_) > 0)
+        self.folders = {}
+        for f in self.files:
+            folder = f.rsplit("/", 1)[0] if "/" in f else ""
+            self.folders.setdefault(folder, []).append(f)
+
+    def _run(self, args):
+        """
+        runs a git command from the root of the repository
+
+        @param      args        list of arguments
+        @return                 output
+        """
+        cmd = _git_command(["-c", "core.quotepath=off"] + args)
+        out, err = run_cmd(cmd,
+                           wait=True,
+                           do_not_log=True,
+                           encerror="strict",
+                           encoding="utf8",
+                           change_path=self.root,
+                           log_error=False,
+                           shell=sys.platform.startswith("win32"),
+                           preprocess=False)
+        if len(err) > 0:
+            raise Exception(
+                "unable to run a git command in {0}\nERR:\n{1}\nCMD:\n{2}".format(self.root, err, cmd))
+        return out
+
+    @staticmethod
+    def current_key(git):
+        """
+        returns the commit HEAD points to and the modification time of the index,
+        it reads the files in folder ``.git`` and does not start any process,
+        for a worktree, the branches are stored in the folder
+        the file ``commondir`` points to
+
+        @param      git     git folder
+        @return             tuple
+        """
+        with open(os.path.join(git, "HEAD"), "r") as f:
+            head = f.read().strip()
+        if head.startswith("ref:"):
+            ref = head[4:].strip()
+            common = _git_common_folder(git)
+            names = [os.path.join(folder, *ref.split("/"))
+                     for folder in ([git, common] if common != git else [git])]
+            names = [_ for _ in names if os.path.exists(_)]
+            if len(names) > 0:
+                with open(names[0], "r") as f:
+                    head = f.read().strip()
+            else:
+                packed = os.path.join(common, "packed-refs")
+                if os.path.exists(packed):
+                    with open(packed, "r") as f:
+                        for line in f:
+                            spl = line.strip().split(" ")
+                            if len(spl) == 2 and spl[1] == ref:
+                                head = spl[0]
+                                break
+        index = os.path.join(git, "index")
+        mtime = os.stat(index).st_mtime if os.path.exists(index) else None
+        return head, mtime
+
+    def is_valid(self):
+        """
+        tells if the snapshot still reflects the repository
+        """
+        return RepositorySnapshot.current_key(self.git) == self.key
+
+    def relative(self, path):
+        """
+        returns the path relative to the root of the repository
+        with ``/`` as a separator, an empty string for the root
+        """
+        rel = os.path.relpath(os.path.abspath(path), self.root)
+        if rel == ".":
+            return ""
+        if rel.startswith(".."):
+            raise ValueError(
+                "path {0} is not in repository {1}".format(path, self.root))
+        return rel.replace("\\", "/")
+
+    @staticmethod
+    def _match(name, rel):
+        """
+        tells if file *name* is *rel* or is in folder *rel*
+        """
+        return rel == "" or name == rel or name.startswith(rel + "/")
+
+    def ls(self, path):
+        """
+        returns the files in a folder and its subfolders,
+        the same result as @see fn repo_ls
+
+        @param      path        file or folder
+        @return                 list of @see cl RepoFile
+        """
+        rel = self.relative(path)
+        if rel == "":
+            names = self.files
+        else:
+            # the files are sorted, the ones starting with rel are contiguous
+            begin = bisect.bisect_left(self.files, rel)
+            names = []
+            for name in self.files[begin:]:
+                if not name.startswith(rel):
+                    break
+                if RepositorySnapshot._match(name, rel):
+                    names.append(name)
+        return [RepoFile(name=os.path.join(self.root, *name.split("/"))) for name in names]
+
+    def ls_folder(self, path):
+        """
+        returns the files directly stored in a folder (not in its subfolders)
+
+        @param      path        folder
+        @return                 list of filenames relative to the root of the repository
+        """
+        return list(self.folders.get(self.relative(path), []))
+
+    @property
+    def master(self):
+        """
+        returns the location of the remote repository, see @see fn get_master_location
+        """
+        if self._master is None:
+            lines = [_ for _ in self._run(["config", "--get", "remote.origin.url"]).split("\n")
+                     if len(_) > 0] if self._has_remote() else []
+            master = lines[0] if len(lines) > 0 else ""
+            self._master = master[:-4] if master.endswith(".git") else master
+        return self._master
+
+    def _has_remote(self):
+        """
+        tells if the configuration of the repository defines a remote ``origin``
+        """
+        config = os.path.join(_git_common_folder(self.git), "config")
+        if not os.path.exists(config):
+            return False
+        with open(config, "r", encoding="utf8") as f:
+            return '[remote "origin"]' in f.read()
+
+    @property
+    def log(self):
+        """
+        returns the history, runs ``git log --name-status`` the first time
+
+        @return     list of tuple (short hash, author, date, comment, full hash, list of files)
+        """
+        with self._lock:
+            if self._log is None:
+                out = self._run(["log", "--name-status",
+                                 "--pretty=format:%x1e%h%x1f%an%x1f%ci%x1f%s%x1f%H"])
+                log = []
+                for block in out.split("\x1e"):
+                    if len(block.strip()) == 0:
+                        continue
+                    lines = block.split("\n")
+                    spl = lines[0].split("\x1f")
+                    files = []
+                    for line in lines[1:]:
+                        names = line.split("\t")[1:]
+                        files.extend(_ for _ in names if len(_) > 0)
+                    log.append((spl[0], spl[1], spl[2], spl[3], spl[4], files))
+                self._log = log
+        return self._log
+
+    def get_log(self, path):
+        """
+        returns the commits which modified a file in a folder or a subfolder,
+        the same result as @see fn get_repo_log
+
+        @param      path        file or folder
+        @return                 list of changes
+        """
+        rel = self.relative(path)
+        master = self.master
+        res = []
+        for revision, author, sdate, msg, hash, files in self.log:
+            if rel != "" and not any(RepositorySnapshot._match(f, rel) for f in files):
+                continue
+            dt = my_date_conversion(sdate.replace("T", " ").strip("Z "))
+            row = [author.strip(), revision.strip(), dt,
+                   msg.strip() if len(msg.strip()) > 0 else "-", hash]
+            if master.startswith("http"):
+                row.append(master + "/commit/" + hash)
+            res.append(row)
+        return res
+
+    def nb_commits(self, path):
+        """
+        returns the number of commits which modified a file in a folder or a subfolder,
+        the same result as @see fn get_nb_commits
+        """
+        if self.relative(path) == "":
+            return len(self.log)
+        return len(self.get_log(path))
+
+
+_snapshots = {}
+_snapshots_lock = threading.Lock()
+
+
+def get_repo_snapshot(path=None, commandline=True):
+    """
+    returns a snapshot of the repository which contains *path*,
+    it is cached and built again only if the commit HEAD points to
+    or the index changed, see @see cl RepositorySnapshot
+
+    @param      path            path to look
+    @param      commandline     only True is implemented
+    @return                     @see cl RepositorySnapshot
+
+    .. versionadded:: 1.2
+    """
+    if path is None:
+        path = os.path.normpath(
+            os.path.abspath(os.path.join(os.path.split(__file__)[0], "..", "..", "..")))
+    root, git = _find_git_folder(path)
+    if root is None:
+        raise FileNotFoundError(
+            "unable to find a git repository for path " + path)
+    with _snapshots_lock:
+        snap = _snapshots.get(root, None)
+        if snap is not None and snap.is_valid():
+            return snap
+    snap = RepositorySnapshot(root, commandline=commandline)
+    with _snapshots_lock:
+        _snapshots[root] = snap
+    return snap
+
+
 def clone(location,
           srv,
           group,
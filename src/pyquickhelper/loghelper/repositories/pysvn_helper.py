@@ -9,6 +9,7 @@ If such a case happens, most of the function will call ``svn`` using the command
 import os
 import sys
 import datetime
+import threading
 import xml.etree.ElementTree as ET
 
 from ..flog import fLOG, run_cmd
@@ -67,13 +68,20 @@ class RepoFile:
         return self.name
 
 
-def repo_ls(full, commandline=True):
+def repo_ls(full, commandline=True, snapshot=False):
     """
     run ``ls`` on a path
     @param      full            full path
     @param      commandline use command line instead of pysvn
+    @param      snapshot        if True, the function uses @see fn get_repo_snapshot
+                                and lists the working copy instead of the last revision on the server
     @return                     output of client.ls
+
+    .. versionchanged:: 1.2
+        Parameter *snapshot* was added.
     """
+    if snapshot:
+        return get_repo_snapshot(full, commandline).ls(full)
     if not commandline:
         try:
             import pysvn
@@ -118,6 +126,262 @@ def repo_ls(full, commandline=True):
         return res
 
 
+def _find_svn_folder(path):
+    """
+    private: looks for the folder ``.svn`` in *path* or one of its parents
+
+    @param      path        path to look
+    @return                 root of the working copy, svn folder (or None, None)
+    """
+    path = os.path.abspath(path)
+    if os.path.isfile(path):
+        path = os.path.dirname(path)
+    while True:
+        svn = os.path.join(path, ".svn")
+        if os.path.isdir(svn):
+            return path, svn
+        parent = os.path.dirname(path)
+        if parent == path:
+            return None, None
+        path = parent
+
+
+class RepositorySnapshot:
+
+    """
+    keeps in memory the content of a SVN working copy obtained with one command
+    ``svn info -R --xml`` which does not connect to the server,
+    the history is retrieved with one command ``svn log -v --xml`` only when it is needed,
+    the files and the commits are indexed by folder to answer @see fn repo_ls,
+    @see fn get_repo_log, @see fn get_repo_version without starting any other process
+
+    The snapshot is obtained with @see fn get_repo_snapshot which keeps
+    one snapshot per working copy and builds a new one once the working copy
+    was updated (the modification time of ``.svn/wc.db`` changed), the snapshot
+    then reflects a different revision.
+    The snapshot describes the working copy (BASE) and not the last revision
+    on the server (HEAD) as @see fn repo_ls does.
+
+    .. versionadded:: 1.2
+    """
+
+    def __init__(self, path, commandline=True, info=None):
+        """
+        constructor, runs ``svn info -R --xml``
+
+        @param      path            any path inside the working copy
+        @param      commandline     only True is implemented
+        @param      info            output of ``svn info -R --xml`` if it was already retrieved
+        """
+        self.root, self.svn = _find_svn_folder(path)
+        if self.root is None:
+            if info is None:
+                raise FileNotFoundError(
+                    "unable to find a SVN working copy for path " + path)
+            self.root, self.svn = os.path.abspath(path), None
+        self.commandline = commandline
+        self.key = RepositorySnapshot.current_key(self.svn)
+        self._log = None
+        self._lock = threading.Lock()
+
+        if info is None:
+            info = self._run(["info", "-R", "--xml", "."])
+        root = ET.fromstring(info)
+
+        self.revision = 0
+        self.prefix = ""
+        self.kinds = {}
+        self.folders = {}
+        for entry in root.iter("entry"):
+            wc = entry.find("wc-info")
+            schedule = wc.find("schedule") if wc is not None else None
+            if schedule is not None and schedule.text == "add":
+                # not in the repository yet
+                continue
+            name = entry.attrib["path"].replace("\\", "/")
+            if name.startswith("./"):
+                name = name[2:]
+            if name == ".":
+                name = ""
+                url = entry.find("url").text
+                repo = entry.find("repository")
+                repo = repo.find("root").text if repo is not None else None
+                if repo is not None and url.startswith(repo):
+                    self.prefix = url[len(repo):].rstrip("/")
+            self.revision = max(self.revision, int(entry.attrib["revision"]))
+            self.kinds[name] = entry.attrib["kind"]
+            if name != "":
+                folder = name.rsplit("/", 1)[0] if "/" in name else ""
+                self.folders.setdefault(folder, []).append(name)
+        for v in self.folders.values():
+            v.sort()
+
+    def _run(self, args):
+        """
+        runs a svn command from the root of the working copy
+
+        @param      args        list of arguments
+        @return                 output
+        """
+        cmd = "svn " + " ".join('"%s"' % a if " " in a else a for a in args)
+        out, err = run_cmd(cmd,
+                           wait=True,
+                           do_not_log=True,
+                           encerror="strict",
+                           encoding="utf8",
+                           change_path=self.root,
+                           log_error=False)
+        if len(err) > 0:
+            raise Exception(
+                "unable to run a svn command in {0}\nERR:\n{1}\nCMD:\n{2}".format(self.root, err, cmd))
+        return out
+
+    @staticmethod
+    def current_key(svn):
+        """
+        returns the modification time of the database of the working copy,
+        it does not start any process
+
+        @param      svn     svn folder
+        @return             tuple
+        """
+        if svn is None:
+            return None
+        for name in ["wc.db", "entries"]:
+            full = os.path.join(svn, name)
+            if os.path.exists(full):
+                return name, os.stat(full).st_mtime
+        return None
+
+    def is_valid(self):
+        """
+        tells if the snapshot still reflects the working copy
+        """
+        return self.svn is not None and RepositorySnapshot.current_key(self.svn) == self.key
+
+    def relative(self, path):
+        """
+        returns the path relative to the root of the working copy
+        with ``/`` as a separator, an empty string for the root
+        """
+        rel = os.path.relpath(os.path.abspath(path), self.root)
+        if rel == ".":
+            return ""
+        if rel.startswith(".."):
+            raise ValueError(
+                "path {0} is not in working copy {1}".format(path, self.root))
+        return rel.replace("\\", "/")
+
+    def ls(self, path):
+        """
+        returns the content of a folder (not its subfolders),
+        the same result as @see fn repo_ls, a folder name ends with ``/``
+
+        @param      path        folder
+        @return                 list of @see cl RepoFile
+        """
+        rel = self.relative(path)
+        res = []
+        for name in self.folders.get(rel, []):
+            short = name.split("/")[-1]
+            if self.kinds[name] == "dir":
+                short += "/"
+            res.append(RepoFile(name=os.path.join(path, short)))
+        return res
+
+    @property
+    def log(self):
+        """
+        returns the history, runs ``svn log -v --xml`` the first time
+
+        @return     list of tuple (revision, author, date, comment, list of files)
+        """
+        with self._lock:
+            if self._log is None:
+                self._log = RepositorySnapshot.parse_log(
+                    self._run(["log", "-v", "--xml", "-r", "%d:1" % self.revision, "."]))
+        return self._log
+
+    @staticmethod
+    def parse_log(out):
+        """
+        parses the output of ``svn log -v --xml``
+
+        @param      out     output
+        @return             list of tuple (revision, author, date, comment, list of files)
+        """
+        root = ET.fromstring(out)
+        res = []
+        for i in root.iter('logentry'):
+            revision = int(i.attrib['revision'].strip())
+            author = i.find("author")
+            author = author.text.strip() if author is not None and author.text else ""
+            t = i.find("msg").text
+            msg = t.strip() if t is not None else "-"
+            sdate = i.find("date").text.strip()
+            dt = str_to_datetime(sdate.replace("T", " ").strip("Z "))
+            files = [p.text for p in i.iter("path") if p.text]
+            res.append((revision, author, dt, msg, files))
+        return res
+
+    def get_log(self, path):
+        """
+        returns the commits which modified a file in a folder or a subfolder,
+        the same result as @see fn get_repo_log except the history
+        before a copy is ignored
+
+        @param      path        file or folder
+        @return                 list of changes
+        """
+        rel = self.relative(path)
+        prefix = self.prefix + "/" + rel if rel else self.prefix
+        res = []
+        for revision, author, dt, msg, files in self.log:
+            if any(f == prefix or f.startswith(prefix + "/") for f in files):
+                res.append([author, revision, dt, msg])
+        return res
+
+    def version(self, path):
+        """
+        returns the revision of the working copy,
+        @see fn get_repo_version returns the revision of the server
+        """
+        return self.revision
+
+
+_snapshots = {}
+_snapshots_lock = threading.Lock()
+
+
+def get_repo_snapshot(path=None, commandline=True):
+    """
+    returns a snapshot of the working copy which contains *path*,
+    it is cached and built again only if the working copy was updated,
+    see @see cl RepositorySnapshot
+
+    @param      path            path to look
+    @param      commandline     only True is implemented
+    @return                     @see cl RepositorySnapshot
+
+    .. versionadded:: 1.2
+    """
+    if path is None:
+        path = os.path.normpath(
+            os.path.abspath(os.path.join(os.path.split(__file__)[0], "..", "..", "..")))
+    root, svn = _find_svn_folder(path)
+    if root is None:
+        raise FileNotFoundError(
+            "unable to find a SVN working copy for path " + path)
+    with _snapshots_lock:
+        snap = _snapshots.get(root, None)
+        if snap is not None and snap.is_valid():
+            return snap
+    snap = RepositorySnapshot(root, commandline=commandline)
+    with _snapshots_lock:
+        _snapshots[root] = snap
+    return snap
+
+
 def __get_version_from_version_txt(path):
     """
     private function, tries to find a file ``version.txt`` which should
@@ -143,12 +407,13 @@ def __get_version_from_version_txt(path):
         "unable to find version.txt in\n" + "\n".join(paths))
 
 
-def get_repo_log(path=None, file_detail=False, commandline=True):
+def get_repo_log(path=None, file_detail=False, commandline=True, snapshot=False):
     """
     get the latest changes operated on a file in a folder or a subfolder
     @param      path            path to look
     @param      file_detail     if True, add impacted files
     @param      commandline     if True, use the command line to get the version number, otherwise it uses pysvn
+    @param      snapshot        if True, the function uses @see fn get_repo_snapshot (*file_detail* is ignored)
     @return                     list of changes, each change is a list of 4-uple:
                                     - author
                                     - change number (int)
@@ -163,11 +428,17 @@ def get_repo_log(path=None, file_detail=False, commandline=True):
         <msg>pyquickhelper: first version</msg>
     </logentry>
     @endcode
+
+    .. versionchanged:: 1.2
+        Parameter *snapshot* was added.
     """
     if path is None:
         path = os.path.normpath(
             os.path.abspath(os.path.join(os.path.split(__file__)[0], "..", "..", "..")))
 
+    if snapshot:
+        return get_repo_snapshot(path, commandline).get_log(path)
+
     if not commandline:
         try:
             import pysvn
@@ -241,18 +512,26 @@ def get_repo_log(path=None, file_detail=False, commandline=True):
     return message
 
 
-def get_repo_version(path=None, commandline=True, log=False):
+def get_repo_version(path=None, commandline=True, log=False, snapshot=False):
     """
     get the latest check in number for a specific path
     @param      path            path to look
     @param      commandline     if True, use the command line to get the version number, otherwise it uses pysvn
     @param      log             if True, returns the output instead of a boolean
+    @param      snapshot        if True, the function uses @see fn get_repo_snapshot
+                                and returns the revision of the working copy
     @return                     integer (check in number)
+
+    .. versionchanged:: 1.2
+        Parameter *snapshot* was added.
     """
     if path is None:
         path = os.path.normpath(
             os.path.abspath(os.path.join(os.path.split(__file__)[0], "..", "..", "..")))
 
+    if snapshot:
+        return get_repo_snapshot(path, commandline).version(path)
+
     if not commandline:
         try:
             import pysvn
@@ -310,12 +589,18 @@ def get_master_location(path=None, commandline=True):
     raise NotImplementedError()
 
 
-def get_nb_commits(path=None, commandline=True):
+def get_nb_commits(path=None, commandline=True, snapshot=False):
     """
     returns the number of commit
 
     @param      path            path to look
     @param      commandline     if True, use the command line to get the version number, otherwise it uses pysvn
+    @param      snapshot        only implemented if True, see @see fn get_repo_snapshot
     @return                     integer
+
+    .. versionchanged:: 1.2
+        Parameter *snapshot* was added.
     """
+    if snapshot:
+        return len(get_repo_snapshot(path, commandline).get_log(path))
     raise NotImplementedError()
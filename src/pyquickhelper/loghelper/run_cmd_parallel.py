@@ -0,0 +1,165 @@
+"""
+@file
+@brief Runs several command lines at the same time, see @see fn run_cmd_parallel.
+
+.. versionadded:: 1.2
+"""
+import os
+import time
+
+from .flog import run_cmd, noLOG
+
+
+def _normalize_commands(cmds):
+    """
+    private: converts the list of commands given to @see fn run_cmd_parallel
+    into a dictionary *{ name: (command, dependencies, options) }*
+    and checks the dependencies
+
+    @param      cmds        list of commands
+    @return                 list of names (same order as *cmds*), dictionary
+    """
+    names = []
+    tasks = {}
+    for i, c in enumerate(cmds):
+        if isinstance(c, str  # unicode#
+                      ):
+            name, cmd, depends, options = i, c, [], {}
+        elif isinstance(c, dict):
+            options = c.copy()
+            cmd = options.pop("cmd")
+            name = options.pop("name", i)
+            depends = options.pop("depends", [])
+        else:
+            raise TypeError(
+                "a command must be a string or a dictionary not {0}".format(type(c)))
+        if name in tasks:
+            raise ValueError("two commands share the same name: {0}".format(name))
+        if not isinstance(depends, (list, tuple, set)):
+            depends = [depends]
+        names.append(name)
+        tasks[name] = (cmd, list(depends), options)
+
+    # checks the dependencies exist and do not contain any cycle
+    done = set()
+    remaining = list(names)
+    while len(remaining) > 0:
+        ready = [n for n in remaining if all(d in done for d in tasks[n][1])]
+        if len(ready) == 0:
+            for n in remaining:
+                for d in tasks[n][1]:
+                    if d not in tasks:
+                        raise ValueError(
+                            "command {0} depends on an unknown command {1}".format(n, d))
+            raise ValueError(
+                "cycle in the dependencies between commands: {0}".format(remaining))
+        done.update(ready)
+        remaining = [n for n in remaining if n not in done]
+    return names, tasks
+
+
+def run_cmd_parallel(cmds, n_jobs=None, stop_on_error=False, skip_if_failed=True,
+                     fLOG=noLOG, **kwargs):
+    """
+    runs a list of command lines, the commands which do not depend on each other
+    run at the same time
+
+    @param      cmds            list of commands, a command is either a string or a dictionary
+                                with keys ``cmd`` (command line), ``name`` (optional, its index by default),
+                                ``depends`` (optional, list of names of the commands which must be
+                                completed before this one starts), the other keys are
+                                parameters for @see fn run_cmd and replace those in *kwargs*
+    @param      n_jobs          maximum number of commands running at the same time,
+                                None for the number of processors
+    @param      stop_on_error   if True, the commands which did not start yet are not run
+                                once one command fails (non null exit code)
+    @param      skip_if_failed  if True, a command is not run if one of the commands it depends on failed,
+                                otherwise, the dependencies only define the execution order,
+                                it can be a function which receives the result of a dependency
+                                *(out, err, returncode, duration)* and tells if it failed
+    @param      fLOG            logging function
+    @param      kwargs          parameters for @see fn run_cmd, they apply to every command
+    @return                     dictionary *{ name: (out, err, returncode, duration) }*
+
+    A command which is not run (see *stop_on_error*, *skip_if_failed*) gets
+    None as exit code and its error output explains why. Parameter *wait* is always True.
+
+    @example(run two sphinx builds at the same time, then a third command)
+    @code
+    res = run_cmd_parallel([dict(name="html", cmd="sphinx-build -b html source build/html"),
+                            dict(name="latex", cmd="sphinx-build -b latex source build/latex"),
+                            dict(name="pdf", cmd="make -C build/latex", depends=["latex"])],
+                           n_jobs=2)
+    out, err, returncode, duration = res["pdf"]
+    @endcode
+    @endexample
+    """
+    from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+
+    names, tasks = _normalize_commands(cmds)
+    if callable(skip_if_failed):
+        dependency_failed = skip_if_failed
+    elif skip_if_failed:
+        def dependency_failed(res):
+            return res[2] != 0
+    else:
+        dependency_failed = None
+    if n_jobs is None:
+        n_jobs = os.cpu_count() or 1
+    n_jobs = max(n_jobs, 1)
+    kwargs["wait"] = True
+    if "fLOG" not in kwargs:
+        kwargs["fLOG"] = fLOG
+
+    def execute(name):
+        cmd, _, options = tasks[name]
+        params = kwargs.copy()
+        params.update(options)
+        params["return_exit_code"] = True
+        begin = time.perf_counter()
+        out, err, code = run_cmd(cmd, **params)
+        return out, err, code, time.perf_counter() - begin
+
+    results = {}
+    running = {}
+    failed = False
+    remaining = list(names)
+    with ThreadPoolExecutor(max_workers=n_jobs) as executor:
+        while len(remaining) > 0 or len(running) > 0:
+            for name in list(remaining):
+                if len(running) >= n_jobs:
+                    # a command is only submitted when it can start
+                    break
+                depends = tasks[name][1]
+                if any(d not in results for d in depends):
+                    continue
+                remaining.remove(name)
+                bad = [d for d in depends if dependency_failed(results[d])] \
+                    if dependency_failed is not None else []
+                if len(bad) > 0:
+                    results[name] = ("", "not run, failed dependencies: {0}".format(
+                        ", ".join(str(d) for d in bad)), None, 0.)
+                elif failed and stop_on_error:
+                    results[name] = ("", "not run, a previous command failed",
+                                     None, 0.)
+                else:
+                    fLOG("[run_cmd_parallel] start", name)
+                    running[executor.submit(execute, name)] = name
+
+            if len(running) == 0:
+                # every remaining command was skipped
+                continue
+
+            completed, _ = wait(list(running), return_when=FIRST_COMPLETED)
+            for fut in completed:
+                name = running.pop(fut)
+                try:
+                    results[name] = fut.result()
+                except Exception as e:
+                    results[name] = ("", "{0}: {1}".format(
+                        type(e).__name__, e), None, 0.)
+                if results[name][2] != 0:
+                    failed = True
+                fLOG("[run_cmd_parallel] end", name, "exit code",
+                     results[name][2], "in", "%1.2fs" % results[name][3])
+    return results
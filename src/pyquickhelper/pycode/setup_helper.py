@@ -144,7 +144,7 @@ def standard_help_for_setup(file_or_folder, project_var_name, module_name=None,
 
 
 def run_unittests_for_setup(file_or_folder, skip_function=default_skip_function, setup_params=None,
-                            only_setup_hook=False):
+                            only_setup_hook=False, n_jobs=1):
     """
     run the unit tests and compute the coverage, stores
     the results in ``_doc/sphinxdoc/source/coverage``
@@ -154,6 +154,10 @@ def run_unittests_for_setup(file_or_folder, skip_function=default_skip_function,
     @param      skip_function       @see fn main_wrapper_tests
     @param      setup_params        @see fn main_wrapper_tests
     @param      only_setup_hook     @see fn main_wrapper_tests
+    @param      n_jobs              number of processes running the test files, @see fn main_wrapper_tests
+
+    .. versionchanged:: 1.2
+        Parameter *n_jobs* was added.
     """
     ffolder = get_folder(file_or_folder)
     funit = os.path.join(ffolder, "_unittests")
@@ -169,7 +173,7 @@ def run_unittests_for_setup(file_or_folder, skip_function=default_skip_function,
     fix_tkinter_issues_virtualenv()
     main_wrapper_tests(
         run_unit, add_coverage=True, skip_function=skip_function, setup_params=setup_params,
-        only_setup_hook=only_setup_hook)
+        only_setup_hook=only_setup_hook, n_jobs=n_jobs)
 
 
 def copy27_for_setup(file_or_folder):
@@ -260,6 +260,123 @@ def clean(dir=None):
                   " --- ", str(e).replace("\n", " "))
 
 
+class _ProcessTestResult:
+
+    """
+    private: results of the tests of a file run by another process,
+    it mimics the methods of *unittest.TestResult* the function @see fn main relies on
+    """
+
+    def __init__(self, testsRun, errors, failures, success):
+        """
+        constructor
+        """
+        self.testsRun = testsRun
+        self.nb_errors = errors
+        self.nb_failures = failures
+        self.success = success
+
+    def wasSuccessful(self):
+        """
+        returns True if every test passed
+        """
+        return self.success
+
+    def __str__(self):
+        """
+        usual, same format as *unittest.TestResult*
+        """
+        return "<_ProcessTestResult run={0} errors={1} failures={2}>".format(
+            self.testsRun, self.nb_errors, self.nb_failures)
+
+
+_worker_coverage = None
+
+
+def _start_worker_coverage(coverage_source):
+    """
+    private: starts measuring the coverage in a process running unit tests
+    for @see fn main if *coverage_source* is not None and if it was not started yet
+    """
+    global _worker_coverage
+    if coverage_source is not None and _worker_coverage is None:
+        from coverage import coverage
+        _worker_coverage = coverage(source=coverage_source, data_suffix=True)
+        _worker_coverage.exclude('if __name__ == "__main__"')
+        _worker_coverage.start()
+
+
+def _run_test_file(filename, class_name, coverage_source=None):
+    """
+    private: runs the tests of one class of a test file in a process
+    started by @see fn main
+
+    @param      filename        test file
+    @param      class_name      test class
+    @param      coverage_source see @see fn main
+    @return                     dictionary with the results, the outputs and the warnings
+    """
+    _start_worker_coverage(coverage_source)
+    out, err = io.StringIO(), io.StringIO()
+    stream = io.StringIO()
+    runner = unittest.TextTestRunner(verbosity=0, stream=stream)
+    stdout, stderr = sys.stdout, sys.stderr
+    sys.stdout, sys.stderr = out, err
+    list_warn = []
+    try:
+        suite = [_[0] for _ in import_files([filename])
+                 if type(next(iter(_[0]))).__name__ == class_name]
+        with warnings.catch_warnings(record=True) as w:
+            warnings.simplefilter("always")
+            r = runner.run(unittest.TestSuite(suite))
+            list_warn = [str(ww) for ww in w]
+            warnings.resetwarnings()
+        res = dict(testsRun=r.testsRun, errors=len(r.errors),
+                   failures=len(r.failures), success=r.wasSuccessful())
+    except Exception as e:
+        stream.write("\n===========\nunable to run {0}\n{1}: {2}\nRan 0 tests in 0s\n".format(
+            filename, type(e).__name__, e))
+        res = dict(testsRun=0, errors=1, failures=0, success=False)
+    finally:
+        sys.stdout, sys.stderr = stdout, stderr
+    if _worker_coverage is not None:
+        _worker_coverage.save()
+    res.update(dict(out=stream.getvalue(), stdout=out.getvalue(),
+                    stderr=err.getvalue(), warnings=list_warn))
+    return res
+
+
+def _run_test_files_parallel(todo, n_jobs, coverage_source=None, flogp=print):
+    """
+    private: runs test files on a pool of processes, the longest tests start first
+
+    @param      todo                list of tuple (estimated time, index, filename, class name)
+    @param      n_jobs              number of processes
+    @param      coverage_source     see @see fn main
+    @param      flogp               logging function
+    @return                         dictionary { index: results of @see fn _run_test_file }
+    """
+    from concurrent.futures import ProcessPoolExecutor, as_completed
+    todo = sorted(todo, key=lambda t: (-t[0], t[1]))
+    results = {}
+    with ProcessPoolExecutor(max_workers=n_jobs) as executor:
+        futures = {executor.submit(_run_test_file, fn, cl, coverage_source): (i, fn)
+                   for e, i, fn, cl in todo}
+        for fut in as_completed(futures):
+            i, fn = futures[fut]
+            try:
+                results[i] = fut.result()
+            except Exception as e:
+                # the process running the test died
+                results[i] = dict(testsRun=0, errors=1, failures=0, success=False,
+                                  out="\n===========\n{0}: {1}\nRan 0 tests in 0s\n".format(
+                                      type(e).__name__, e),
+                                  stdout="", stderr="", warnings=[])
+            flogp("  completed {0}/{1}: {2}".format(len(results),
+                                                    len(todo), os.path.split(fn)[-1]))
+    return results
+
+
 def main(runner,
          path_test=None,
          limit_max=1e9,
@@ -269,7 +386,9 @@ def main(runner,
          on_stderr=False,
          flogp=print,
          processes=False,
-         skip_function=None):
+         skip_function=None,
+         n_jobs=1,
+         coverage_source=None):
     """
     run all unit test
     the function looks into the folder _unittest and extract from all files
@@ -289,6 +408,12 @@ def main(runner,
     @param      processes       to run the unit test in a separate process (with function @see fn run_cmd),
                                 however, to make that happen, you need to specify
                                 ``exit=False`` for each test file, see `unittest.main <https://docs.python.org/3.4/library/unittest.html#unittest.main>`_
+    @param      n_jobs          if > 1, the test files are distributed over a pool of *n_jobs* processes,
+                                the longest ones (see @see fn get_estimation_time) start first,
+                                *processes* and *log* are then ignored
+    @param      coverage_source if *n_jobs* > 1 and the coverage is measured by the calling process,
+                                the processes of the pool measure it too for these sources,
+                                they store their data the calling process needs to combine
     @return                     dictionnary: ``{ "err": err, "tests":list of couple (file, test results) }``
 
     .. versionchanged:: 0.9
@@ -297,6 +422,9 @@ def main(runner,
 
     .. versionchanged:: 1.0
         parameter *skip_function* was added
+
+    .. versionchanged:: 1.2
+        parameters *n_jobs*, *coverage_source* were added
     """
     if skip_list is None:
         skip_list = set()
@@ -374,16 +502,34 @@ def main(runner,
     stderr = sys.stderr
     fullstderr = io.StringIO()
 
-    for i, s in enumerate(suite):
+    def selected(i, s):
         if skip >= 0 and i < skip:
-            continue
+            return False
         if i + 1 in skip_list:
-            continue
+            return False
         if skip_function is not None:
             with open(s[1], "r") as f:
                 content = f.read()
             if skip_function(s[1], content):
+                return False
+        return True
+
+    parallel = None
+    if n_jobs is not None and n_jobs > 1:
+        est = {l: e for e, l in cco}
+        todo = [(est.get(s[1], 0), i, s[1], type(next(iter(s[0]))).__name__)
+                for i, s in enumerate(suite) if selected(i, s) and s[0].countTestCases() > 0]
+        flogp("running {0} test suites on {1} processes".format(
+            len(todo), n_jobs))
+        parallel = _run_test_files_parallel(
+            todo, n_jobs, coverage_source=coverage_source, flogp=flogp)
+
+    for i, s in enumerate(suite):
+        if parallel is not None:
+            if i not in parallel:
                 continue
+        elif not selected(i, s):
+            continue
 
         cut = os.path.split(s[1])
         cut = os.path.split(cut[0])[-1] + "/" + cut[-1]
@@ -400,7 +546,17 @@ def main(runner,
         sys.stderr = newstdr
         list_warn = []
 
-        if processes:
+        if parallel is not None:
+            res = parallel[i]
+            r = _ProcessTestResult(res["testsRun"], res["errors"],
+                                   res["failures"], res["success"])
+            out = res["out"]
+            list_warn = res["warnings"]
+            newstdr.write(res["stderr"])
+            if not res["success"] and len(res["stdout"]) > 0:
+                newstdr.write("STDOUT:\n")
+                newstdr.write(res["stdout"])
+        elif processes:
             cmd = sys.executable.replace("w.exe", ".exe") + " " + li[i]
             out, err = run_cmd(cmd, wait=True)
             if len(err) > 0:
@@ -544,7 +700,8 @@ def main_wrapper_tests(codefile,
                        report_folder=None,
                        skip_function=default_skip_function,
                        setup_params=None,
-                       only_setup_hook=False):
+                       only_setup_hook=False,
+                       n_jobs=1):
     """
     calls function :func:`main <pyquickhelper.unittests.utils_tests.main>` and throw an exception if it fails
 
@@ -559,6 +716,7 @@ def main_wrapper_tests(codefile,
     @param      skip_function   function(filename,content) --> boolean to skip a unit test
     @param      setup_params    parameters sent to @see fn call_setup_hook
     @param      only_setup_hook calls only @see fn call_setup_hook, do not run the unit test
+    @param      n_jobs          number of processes running the test files, see @see fn main
 
     @FAQ(How to build pyquickhelper with Jenkins?)
     `Jenkins <http://jenkins-ci.org/>`_ is a task scheduler for continuous integration.
@@ -604,14 +762,16 @@ def main_wrapper_tests(codefile,
 
     .. versionchanged:: 1.2
         Parameter *only_setup_hook* was added.
+        Parameter *n_jobs* was added, the coverage measured by the processes
+        running the tests is combined with the coverage of the calling process.
 
     """
     runner = unittest.TextTestRunner(verbosity=0, stream=io.StringIO())
     path = os.path.abspath(os.path.join(os.path.split(codefile)[0]))
 
-    def run_main():
+    def run_main(coverage_source=None):
         res = main(runner, path_test=path, skip=-1, skip_list=skip_list, processes=processes,
-                   skip_function=skip_function)
+                   skip_function=skip_function, n_jobs=n_jobs, coverage_source=coverage_source)
         return res
 
     if "win" not in sys.platform and "DISPLAY" not in os.environ:
@@ -681,9 +841,13 @@ def main_wrapper_tests(codefile,
             cov.exclude('if __name__ == "__main__"')
             cov.start()
 
-            res = run_main()
+            parallel = n_jobs is not None and n_jobs > 1
+            res = run_main(coverage_source=[srcp] if parallel else None)
 
             cov.stop()
+            if parallel:
+                cov.save()
+                cov.combine()
             cov.html_report(directory=report_folder)
 
         else:
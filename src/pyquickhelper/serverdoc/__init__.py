@@ -4,3 +4,4 @@ shortcuts for documentation_server
 
 from .documentation_server import run_doc_server
 from .server_helper import get_jenkins_mappings
+from .server_benchmark import benchmark_doc_server
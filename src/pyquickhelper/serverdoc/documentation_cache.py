@@ -0,0 +1,156 @@
+#-*- coding:utf-8 -*-
+"""
+@file
+@brief Cache for the files served by the documentation server.
+
+.. versionadded:: 1.2
+"""
+import os
+import sys
+import threading
+from collections import OrderedDict
+
+
+class DocumentationCache:
+
+    """
+    keeps the content of the most recently served files in memory,
+    the total size of the cached contents never exceeds *max_bytes*,
+    the least recently used files are removed first,
+    a cached content is served only if the file has still the same
+    modification time and size, the cache can be used by several threads
+
+    The cache counts the number of hits, misses and evictions
+    (see @see me statistics). A file may have several cached contents,
+    its raw content and variants such as its compressed content,
+    they are validated the same way.
+    """
+
+    def __init__(self, max_bytes=2 ** 26):
+        """
+        constructor
+
+        @param      max_bytes       maximum size of the cached contents in bytes
+        """
+        self.max_bytes = max_bytes
+        self.nbytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        """
+        returns the number of cached files
+        """
+        return len(self._entries)
+
+    @staticmethod
+    def _size(content):
+        """
+        returns the memory used by a content
+        """
+        return sys.getsizeof(content)
+
+    @staticmethod
+    def _signature(filename):
+        """
+        returns the modification time and the size of a file or None if it does not exist
+        """
+        try:
+            st = os.stat(filename)
+        except OSError:
+            return None
+        return st.st_mtime, st.st_size
+
+    def get(self, filename, variant=None):
+        """
+        returns the cached content of a file
+
+        @param      filename        filename
+        @param      variant         None for the raw content or the name of a variant (``"gzip"``)
+        @return                     content or None if it is not cached or if the file was modified
+        """
+        signature = DocumentationCache._signature(filename)
+        key = filename, variant
+        with self._lock:
+            entry = self._entries.get(key, None)
+            if entry is None:
+                self.misses += 1
+                return None
+            if entry[1] != signature:
+                # the file was modified or removed
+                self._remove(key)
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            entry[3] += 1
+            self.hits += 1
+            return entry[0]
+
+    def put(self, filename, content, signature=None, variant=None):
+        """
+        adds or replaces the content of a file
+
+        @param      filename        filename
+        @param      content         content
+        @param      signature       modification time and size of the file when it was read,
+                                    if None, the function calls ``os.stat``
+        @param      variant         None for the raw content or the name of a variant (``"gzip"``)
+        @return                     True if the content was cached, False if it is too big
+        """
+        if signature is None:
+            signature = DocumentationCache._signature(filename)
+        size = DocumentationCache._size(content)
+        if size > self.max_bytes or signature is None:
+            return False
+        key = filename, variant
+        with self._lock:
+            if key in self._entries:
+                self._remove(key)
+            while self.nbytes + size > self.max_bytes:
+                self._remove(next(iter(self._entries)))
+                self.evictions += 1
+            self._entries[key] = [content, signature, size, 0]
+            self.nbytes += size
+        return True
+
+    def _remove(self, key):
+        """
+        removes an entry, the lock must be held
+        """
+        entry = self._entries.pop(key)
+        self.nbytes -= entry[2]
+
+    def clear(self):
+        """
+        removes every entry
+        """
+        with self._lock:
+            self._entries.clear()
+            self.nbytes = 0
+
+    def statistics(self):
+        """
+        returns statistics about the cache
+
+        @return     dictionary with keys ``files``, ``nbytes``, ``max_bytes``,
+                    ``hits``, ``misses``, ``evictions``
+        """
+        with self._lock:
+            return dict(files=len(self._entries), nbytes=self.nbytes,
+                        max_bytes=self.max_bytes, hits=self.hits,
+                        misses=self.misses, evictions=self.evictions)
+
+    def most_requested(self, n=20):
+        """
+        returns the most requested files
+
+        @param      n       number of files to return
+        @return             list of tuple (number of hits, filename)
+        """
+        with self._lock:
+            al = [(v[3], k[0] if k[1] is None else "{0} ({1})".format(*k))
+                  for k, v in self._entries.items()]
+        return sorted(al, reverse=True)[:n]
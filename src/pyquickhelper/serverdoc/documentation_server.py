@@ -10,14 +10,17 @@
 """
 import sys
 import os
-import subprocess
 import copy
-import datetime
+import gzip
+import io
+import json
+import zlib
+from email.utils import formatdate, parsedate_tz, mktime_tz
 try:
     from urllib.parse import urlparse, parse_qs
 except ImportError:
     from urlparse import urlparse, parse_qs
-from threading import Thread
+from threading import Thread, Lock
 try:
     from http.server import BaseHTTPRequestHandler, HTTPServer
 except ImportError:
@@ -33,9 +36,13 @@ if __name__ == "__main__":
     if path not in sys.path:
         sys.path.append(path)
     from pyquickhelper import fLOG, get_url_content
+    from pyquickhelper.serverdoc.documentation_cache import DocumentationCache
+    from pyquickhelper.serverdoc.script_pool import ScriptWorkerPool, run_script
 else:
     from ..loghelper.flog import fLOG
     from ..loghelper.url_helper import get_url_content
+    from .documentation_cache import DocumentationCache
+    from .script_pool import ScriptWorkerPool, run_script
 
 
 class DocumentationHandler(BaseHTTPRequestHandler):
@@ -64,9 +71,10 @@ class DocumentationHandler(BaseHTTPRequestHandler):
             </html>
             """.replace("            ", "")
 
-    cache = {}
-    cache_attributes = {}
-    cache_refresh = datetime.timedelta(1)
+    cache = DocumentationCache()
+    script_pool = None
+    script_timeout = 60
+    script_cache = False
 
     def LOG(self, *l, **p):
         """
@@ -145,6 +153,9 @@ class DocumentationHandler(BaseHTTPRequestHandler):
         ".otf": ('font/opentype', 'rb'),
         ".svg": ('image/svg+xml', 'r'),
         ".woff": ('application/font-wof', 'rb'),
+        ".pdf": ('application/pdf', 'rb'),
+        ".zip": ('application/zip', 'rb'),
+        ".ipynb": ('application/x-ipynb+json', 'rb'),
     }
 
     @staticmethod
@@ -163,14 +174,21 @@ class DocumentationHandler(BaseHTTPRequestHandler):
         htype, ftype = DocumentationHandler.media_types.get(ext, ('', ''))
         return htype, ftype
 
-    def send_headers(self, path):
+    def send_headers(self, path, headers=None):
         """
         defines the header to send (type of files) based on path
         @param      path        location (a string)
+        @param      headers     additional headers (dictionary or None)
         @return                 type (html, css, ...)
+
+        .. versionchanged:: 1.2
+            Parameter *headers* was added.
         """
         htype, ftype = self.get_ftype(path)
 
+        if headers is not None:
+            for k, v in sorted(headers.items()):
+                self.send_header(k, v)
         if htype != '':
             self.send_header('Content-type', htype)
             self.end_headers()
@@ -179,6 +197,216 @@ class DocumentationHandler(BaseHTTPRequestHandler):
             self.end_headers()
         return ftype
 
+    compressed_types = {'text/html', 'text/css', 'text/plain',
+                        'application/javascript', 'image/svg+xml'}
+    compress_min_size = 256
+    static_max_age = 86400
+    stream_min_size = 2 ** 20
+
+    @staticmethod
+    def get_validators(localpath, signature, project=None):
+        """
+        returns the headers used by a browser to validate its cached copy of a file
+
+        @param      localpath       path requested by the browser
+        @param      signature       modification time and size of the file
+                                    (see @see cl DocumentationCache)
+        @param      project         if not None, the content sent to the browser
+                                    depends on the project (see @see me process_html_path),
+                                    the ETag depends on it too
+        @return                     dictionary with headers ``ETag``, ``Last-Modified``,
+                                    ``Cache-Control``
+
+        The files in ``_static`` rarely change, the browser keeps them
+        for *static_max_age* seconds, it validates the other files every time.
+
+        .. versionadded:: 1.2
+        """
+        mtime, size = signature
+        if project is None:
+            etag = 'W/"{0:x}-{1:x}"'.format(int(mtime * 1e6), size)
+        else:
+            etag = 'W/"{0:x}-{1:x}-{2:x}"'.format(int(mtime * 1e6), size,
+                                                  zlib.crc32(project.encode("utf-8")))
+        headers = {'ETag': etag,
+                   'Last-Modified': formatdate(mtime, usegmt=True)}
+        if "_static/" in localpath.replace("\\", "/"):
+            headers['Cache-Control'] = "public, max-age={0}".format(
+                DocumentationHandler.static_max_age)
+        else:
+            headers['Cache-Control'] = "no-cache"
+        return headers
+
+    def is_not_modified(self, validators):
+        """
+        tells if the browser has the current version of a file
+        based on headers ``If-None-Match`` and ``If-Modified-Since``
+
+        @param      validators      headers returned by @see me get_validators
+        @return                     boolean
+
+        .. versionadded:: 1.2
+        """
+        match = self.headers.get('If-None-Match', None)
+        if match is not None:
+            tags = [_.strip() for _ in match.split(",")]
+            return "*" in tags or validators['ETag'] in tags or \
+                validators['ETag'][2:] in tags
+        since = self.headers.get('If-Modified-Since', None)
+        if since is not None:
+            parsed = parsedate_tz(since)
+            if parsed is not None:
+                modified = parsedate_tz(validators['Last-Modified'])
+                return mktime_tz(modified) <= mktime_tz(parsed)
+        return False
+
+    def send_not_modified(self, validators):
+        """
+        sends the response 304 (not modified)
+
+        @param      validators      headers returned by @see me get_validators
+
+        .. versionadded:: 1.2
+        """
+        self.send_response(304)
+        for k, v in sorted(validators.items()):
+            self.send_header(k, v)
+        self.end_headers()
+
+    def send_file_content(self, access, path, content, headers, variant="gzip"):
+        """
+        sends a file with its headers, a text content is compressed
+        with gzip if the browser accepts it, the compressed content
+        is cached, see @see cl DocumentationCache
+
+        @param      access          local file the content comes from
+        @param      path            path which gives the type of the content
+        @param      content         content to send (string or bytes)
+        @param      headers         additional headers
+        @param      variant         name of the compressed content in the cache,
+                                    it must be different for every content
+                                    built from the same file
+
+        .. versionadded:: 1.2
+        """
+        if not isinstance(content, bytes):
+            content = content.encode("utf-8")
+        htype, _ = self.get_ftype(path)
+        accept = self.headers.get('Accept-Encoding', '')
+        headers = {} if headers is None else headers.copy()
+        if htype in DocumentationHandler.compressed_types and "gzip" in accept and \
+                len(content) >= DocumentationHandler.compress_min_size:
+            compressed = DocumentationHandler.cache.get(access, variant)
+            if compressed is None:
+                buffer = io.BytesIO()
+                with gzip.GzipFile(fileobj=buffer, mode="wb", mtime=0) as f:
+                    f.write(content)
+                compressed = buffer.getvalue()
+                DocumentationHandler.cache.put(
+                    access, compressed, variant=variant)
+            content = compressed
+            headers['Content-Encoding'] = 'gzip'
+        if htype in DocumentationHandler.compressed_types:
+            headers['Vary'] = 'Accept-Encoding'
+        headers['Content-Length'] = str(len(content))
+        self.send_headers(path, headers)
+        self.wfile.write(content)
+
+    @staticmethod
+    def parse_range(value, size):
+        """
+        parses header ``Range``
+
+        @param      value       value of the header, ex: ``bytes=0-499``
+        @param      size        size of the file
+        @return                 tuple (first byte, last byte) or None if the header
+                                cannot be used (several ranges, syntax error),
+                                the file is then sent entirely
+
+        The function raises an exception *ValueError* if the range cannot be satisfied.
+
+        .. versionadded:: 1.2
+        """
+        value = value.strip()
+        if not value.startswith("bytes=") or "," in value:
+            return None
+        spl = value[6:].strip().split("-")
+        if len(spl) != 2:
+            return None
+        try:
+            if spl[0] == "":
+                # last bytes
+                start = max(size - int(spl[1]), 0)
+                end = size - 1
+            else:
+                start = int(spl[0])
+                end = size - 1 if spl[1] == "" else min(int(spl[1]), size - 1)
+        except ValueError:
+            return None
+        if start >= size or start > end:
+            raise ValueError(
+                "unable to satisfy range {0} for {1} bytes".format(value, size))
+        return start, end
+
+    def send_file_stream(self, access, path, size, validators):
+        """
+        sends a big file without loading it in memory and without caching it,
+        it uses ``socket.sendfile`` if it is available,
+        the function supports header ``Range`` (one range only)
+
+        @param      access          local file
+        @param      path            path which gives the type of the content
+        @param      size            size of the file
+        @param      validators      headers returned by @see me get_validators
+
+        .. versionadded:: 1.2
+        """
+        start, end = 0, size - 1
+        headers = validators.copy()
+        headers['Accept-Ranges'] = 'bytes'
+        status = 200
+        value = self.headers.get('Range', None)
+        check = self.headers.get('If-Range', None)
+        # If-Range requires a strong comparison, the ETag is weak,
+        # only the date of the last modification can validate the range
+        if value is not None and (check is None or
+                                  check.strip() == validators['Last-Modified']):
+            try:
+                rng = DocumentationHandler.parse_range(value, size)
+            except ValueError:
+                self.send_response(416)
+                self.send_header('Content-Range', 'bytes */{0}'.format(size))
+                self.send_header('Content-Length', '0')
+                self.end_headers()
+                return
+            if rng is not None:
+                start, end = rng
+                status = 206
+                headers['Content-Range'] = 'bytes {0}-{1}/{2}'.format(
+                    start, end, size)
+
+        count = end - start + 1
+        headers['Content-Length'] = str(count)
+        self.send_response(status)
+        self.send_headers(path, headers)
+        self.LOG("streams ", access, start, count)
+        with open(access, "rb") as f:
+            try:
+                if hasattr(self.request, "sendfile"):
+                    self.wfile.flush()
+                    self.request.sendfile(f, start, count)
+                else:
+                    f.seek(start)
+                    while count > 0:
+                        chunk = f.read(min(count, 2 ** 16))
+                        if not chunk:
+                            break
+                        self.wfile.write(chunk)
+                        count -= len(chunk)
+            except ConnectionError as e:
+                # the browser cancelled the download
+                self.LOG("** w,download interrupted ", access, e)
+
     def get_file_content(self, localpath, ftype, path=None):
         """
         Returns the content of a local file.
@@ -188,118 +416,145 @@ class DocumentationHandler(BaseHTTPRequestHandler):
         @param      path            if != None, the filename will be path/localpath
         @return                     content
 
-        This function implements a simple cache mechanism.
-        """
-        if path is not None:
-            tlocalpath = os.path.join(path, localpath)
-        else:
-            tlocalpath = localpath
+        This function implements a simple cache mechanism,
+        see @see cl DocumentationCache.
 
-        content = DocumentationHandler.get_from_cache(tlocalpath)
+        .. versionchanged:: 1.2
+            The cache is bounded and a file modified since it was cached is read again.
+        """
+        access = DocumentationHandler.get_access_path(localpath, path)
+        content = DocumentationHandler.get_from_cache(access)
         if content is not None:
-            self.LOG("serves cached", tlocalpath)
+            self.LOG("serves cached", access)
             return content
 
-        if ftype == "r" or ftype == "execute":
-            if not os.path.exists(
-                    tlocalpath) and "_static/bootswatch" in tlocalpath:
-                access = tlocalpath.replace("bootswatch", "bootstrap")
-            else:
-                access = tlocalpath
-
-            if not os.path.exists(access):
-                self.LOG("** w,unable to find: ", access)
-                return None
+        if not os.path.exists(access):
+            self.LOG("** w,unable to find: ", access)
+            return None
 
-            self.LOG("reading file ", access)
+        self.LOG("reading file ", access)
+        signature = DocumentationCache._signature(access)
+        if ftype == "r" or ftype == "execute":
             with open(access, "r", encoding="utf8") as f:
                 content = f.read()
-                DocumentationHandler.update_cache(tlocalpath, content)
-                return content
         else:
-            if not os.path.exists(
-                    tlocalpath) and "_static/bootswatch" in tlocalpath:
-                access = tlocalpath.replace("bootswatch", "bootstrap")
-            else:
-                access = tlocalpath
+            with open(access, "rb") as f:
+                content = f.read()
+        DocumentationHandler.update_cache(access, content, signature)
+        return content
 
-            if not os.path.exists(access):
-                self.LOG("** w,unable to find: ", access)
-                return None
+    @staticmethod
+    def get_access_path(localpath, path=None):
+        """
+        returns the local file to read
 
-            self.LOG("reading file ", access)
-            with open(tlocalpath, "rb") as f:
-                content = f.read()
-                DocumentationHandler.update_cache(tlocalpath, content)
-                return content
+        @param      localpath       local filename
+        @param      path            if != None, the filename will be path/localpath
+        @return                     filename
+
+        .. versionadded:: 1.2
+        """
+        if path is not None:
+            tlocalpath = os.path.join(path, localpath)
+        else:
+            tlocalpath = localpath
+
+        if not os.path.exists(
+                tlocalpath) and "_static/bootswatch" in tlocalpath:
+            return tlocalpath.replace("bootswatch", "bootstrap")
+        else:
+            return tlocalpath
 
     @staticmethod
     def get_from_cache(key):
         """
         retrieve a file from the cache if it was cached,
-        it the file was added later than a day, it returns None
+        it returns None if the file was modified since then
 
-        @param      key     key
+        @param      key     filename
         @return             content or None if None found or too old
-        """
-        content = DocumentationHandler.cache.get(key, None)
-        if content is None:
-            return content
 
-        att = DocumentationHandler.cache_attributes[key]
-        delta = datetime.datetime.now() - att["date"]
-        if delta > DocumentationHandler.cache_refresh:
-            del DocumentationHandler.cache[key]
-            del DocumentationHandler.cache_attributes[key]
-            return None
-        else:
-            DocumentationHandler.cache_attributes[key]["nb"] += 1
-            return content
+        .. versionchanged:: 1.2
+            The content is validated with the modification time and the size of the file.
+        """
+        return DocumentationHandler.cache.get(key)
 
     @staticmethod
-    def update_cache(key, content):
+    def update_cache(key, content, signature=None):
         """
-        update the cache
+        update the cache, the least recently used files are removed
+        if the cache is full
 
-        @param      key         key
+        @param      key         filename
         @param      content     content to place
-        """
-        if len(DocumentationHandler.cache) < 5000:
-            # we do not clean here as the cache is shared by every session/user
-            # it would not be safe
-            # unless we add protection
-            # self.clean_cache(1000)
-            pass
+        @param      signature   modification time and size of the file when it was read (or None)
 
-        # this one first as a document existence is checked by using cache
-        DocumentationHandler.cache_attributes[key] = {"nb": 1,
-                                                      "date": datetime.datetime.now()}
-        DocumentationHandler.cache[key] = content
+        .. versionchanged:: 1.2
+            Parameter *signature* was added.
+        """
+        DocumentationHandler.cache.put(key, content, signature)
 
     @staticmethod
     def _print_cache(n=20):
         """
         display the most requested files
         """
-        al = [(v["nb"], k)
-              for k, v in DocumentationHandler.cache_attributes.items() if v["nb"] > 1]
-        for i, doc in enumerate(sorted(al, reverse=True)):
-            if i >= n:
-                break
+        for doc in DocumentationHandler.cache.most_requested(n):
             print("cache: {0} - {1}".format(*doc))
+        print("cache: {0}".format(DocumentationHandler.cache.statistics()))
 
     @staticmethod
-    def execute(localpath):
+    def execute(localpath, params=None):
         """
         locally execute a python script
         @param      localpath       local python script
+        @param      params          parameters of the request (dictionary), the script
+                                    receives them as a global variable *params*
         @return                     output, error
+
+        If *script_pool* is None, the script runs in a new process
+        (see @see fn run_script), otherwise, it runs in one of the processes of the pool
+        (see @see cl ScriptWorkerPool). The script is stopped after
+        *script_timeout* seconds.
+
+        .. versionchanged:: 1.2
+            Parameter *params* was added, the script can be executed by a pool of processes.
+        """
+        timeout = DocumentationHandler.script_timeout
+        if DocumentationHandler.script_pool is not None:
+            runner = DocumentationHandler.script_pool.run
+        else:
+            runner = run_script
+        try:
+            return runner(localpath, params, timeout=timeout)
+        except TimeoutError as e:
+            return b"", str(e).encode("utf-8")
+
+    def execute_cached(self, localpath, params):
         """
-        exe = subprocess.Popen([sys.executable, localpath],
-                               stdout=subprocess.PIPE,
-                               stderr=subprocess.PIPE)
-        out, error = exe.communicate()
-        return out, error
+        executes a script, the outputs are cached if *script_cache* is True
+        (False by default, a script may not return the same output for the same parameters),
+        they are associated to the script and the parameters of the request,
+        the script is executed again if it is modified
+
+        @param      localpath       local python script
+        @param      params          parameters of the request (dictionary)
+        @return                     output, error
+
+        .. versionadded:: 1.2
+        """
+        params = {k: v for k, v in params.items() if not k.startswith("__")}
+        variant = "execute " + json.dumps(params, sort_keys=True)
+        if DocumentationHandler.script_cache:
+            out = DocumentationHandler.cache.get(localpath, variant)
+            if out is not None:
+                self.LOG("serves cached execution", localpath)
+                return out, b""
+        signature = DocumentationCache._signature(localpath)
+        out, err = DocumentationHandler.execute(localpath, params)
+        if DocumentationHandler.script_cache and len(err) == 0:
+            DocumentationHandler.cache.put(localpath, out, signature, variant)
+        return out, err
 
     def feed(self, anys, script_python=False, params=None):
         """
@@ -401,7 +656,6 @@ class DocumentationHandler(BaseHTTPRequestHandler):
                     fullpath = os.path.join(value, localpath)
                     self.LOG("localpath ", fullpath, os.path.isfile(fullpath))
 
-                    self.send_response(200)
                     _, ftype = self.get_ftype(localpath)
 
                     execute = eval(params.get("execute", ["True"])[0])
@@ -409,6 +663,24 @@ class DocumentationHandler(BaseHTTPRequestHandler):
                     # keep = eval(params.get("keep", ["False"])[0])
 
                     if ftype != 'execute' or not execute:
+                        access = DocumentationHandler.get_access_path(
+                            fullpath, spath)
+                        ext = os.path.splitext(localpath)[-1].lower()
+                        signature = DocumentationCache._signature(access)
+                        validators = None if signature is None else \
+                            DocumentationHandler.get_validators(
+                                localpath, signature,
+                                project if ext == ".html" else None)
+                        if validators is not None and self.is_not_modified(validators):
+                            self.LOG("not modified ", access)
+                            self.send_not_modified(validators)
+                            return
+                        if ftype not in ('r', 'execute') and signature is not None and \
+                                signature[1] >= DocumentationHandler.stream_min_size:
+                            self.send_file_stream(
+                                access, localpath, signature[1], validators)
+                            return
+
                         content = self.get_file_content(fullpath, ftype, spath)
                         if content is None:
                             self.LOG("** w,unable to get file for key:", spath)
@@ -416,28 +688,34 @@ class DocumentationHandler(BaseHTTPRequestHandler):
                             self.feed(
                                 "Requested resource %s unavailable" % localpath)
                         else:
-                            ext = os.path.splitext(localpath)[-1].lower()
+                            self.send_response(200)
                             if ext in [
                                     ".py", ".c", ".cpp", ".hpp", ".h", ".r", ".sql", ".java"]:
-                                self.send_headers(".html")
-                                self.feed(
-                                    DocumentationHandler.html_code_renderer(localpath, content))
+                                self.send_file_content(access, ".html",
+                                                       DocumentationHandler.html_code_renderer(
+                                                           localpath, content),
+                                                       validators)
                             elif ext in [".html"]:
                                 content = DocumentationHandler.process_html_path(
                                     project, content)
-                                self.send_headers(localpath)
-                                self.feed(content)
+                                self.send_file_content(
+                                    access, localpath, content, validators,
+                                    variant="gzip:" + project)
                             else:
-                                self.send_headers(localpath)
-                                self.feed(content)
+                                self.send_file_content(
+                                    access, localpath, content, validators)
                     else:
-                        self.LOG("execute file ", localpath)
-                        out, err = DocumentationHandler.execute(localpath)
+                        access = DocumentationHandler.get_access_path(
+                            fullpath, spath)
+                        self.LOG("execute file ", access)
+                        out, err = self.execute_cached(access, params)
                         if len(err) > 0:
+                            self.LOG("** w,execution failed:", access, err)
                             self.send_error(404)
                             self.feed(
                                 "Requested resource %s unavailable" % localpath)
                         else:
+                            self.send_response(200)
                             self.send_headers(localpath)
                             self.feed(out)
 
@@ -503,6 +781,90 @@ class DocumentationHandler(BaseHTTPRequestHandler):
         self.feed(content)
 
 
+class DocumentationThreadingServer(HTTPServer):
+
+    """
+    HTTP server which processes the requests with a pool of threads,
+    a slow request does not block the others,
+    at most *max_workers* requests are processed at the same time,
+    at most *max_pending* requests are accepted (running or waiting
+    for a free thread), the server answers the next ones with
+    a ``503 Service Unavailable`` until a request is completed
+
+    .. versionadded:: 1.2
+    """
+
+    def __init__(self, server_address, RequestHandlerClass, max_workers=8,
+                 max_pending=None):
+        """
+        constructor
+
+        @param      server_address          (host, port)
+        @param      RequestHandlerClass     handler, usually @see cl DocumentationHandler
+        @param      max_workers             number of threads processing the requests
+        @param      max_pending             maximum number of accepted requests,
+                                            running or waiting, ``4 * max_workers`` if None
+        """
+        from concurrent.futures import ThreadPoolExecutor
+        HTTPServer.__init__(self, server_address, RequestHandlerClass)
+        self.max_workers = max_workers
+        self.max_pending = max_pending if max_pending is not None else 4 * max_workers
+        if self.max_pending < max_workers:
+            raise ValueError("max_pending must be >= max_workers: {0} < {1}".format(
+                self.max_pending, max_workers))
+        self.pending = 0
+        self._pending_lock = Lock()
+        self.executor = ThreadPoolExecutor(max_workers=max_workers)
+
+    def process_request(self, request, client_address):
+        """
+        processes a request in one thread of the pool,
+        rejects it if *max_pending* requests are already accepted
+        """
+        with self._pending_lock:
+            accepted = self.pending < self.max_pending
+            if accepted:
+                self.pending += 1
+        if accepted:
+            self.executor.submit(self._process_request_pool,
+                                 request, client_address)
+        else:
+            self._reject_request(request)
+
+    def _process_request_pool(self, request, client_address):
+        """
+        processes a request (executed by a thread of the pool)
+        """
+        try:
+            self.finish_request(request, client_address)
+        except Exception:
+            self.handle_error(request, client_address)
+        finally:
+            self.shutdown_request(request)
+            with self._pending_lock:
+                self.pending -= 1
+
+    def _reject_request(self, request):
+        """
+        answers ``503 Service Unavailable`` and closes the connection
+        """
+        try:
+            request.sendall(b"HTTP/1.0 503 Service Unavailable\r\n"
+                            b"Retry-After: 1\r\n"
+                            b"Content-Length: 0\r\n"
+                            b"Connection: close\r\n\r\n")
+        except (OSError, IOError):
+            pass
+        self.shutdown_request(request)
+
+    def server_close(self):
+        """
+        closes the server and waits for the pending requests
+        """
+        HTTPServer.server_close(self)
+        self.executor.shutdown(wait=True)
+
+
 class DocumentationThreadServer (Thread):
 
     """
@@ -540,7 +902,12 @@ class DocumentationThreadServer (Thread):
 def run_doc_server(server,
                    mappings,
                    thread=False,
-                   port=8079):
+                   port=8079,
+                   max_workers=None,
+                   max_pending=None,
+                   cache_size=None,
+                   script_workers=None,
+                   script_cache=False):
     """
     run the server
     @param      server      if None, it becomes ``HTTPServer(('localhost', 8080), DocumentationHandler)``
@@ -549,6 +916,19 @@ def run_doc_server(server,
                             and the function returns right away,
                             otherwise, it runs the server.
     @param      port        port to use
+    @param      max_workers if None, the server processes one request at a time,
+                            otherwise, it processes up to *max_workers* requests at the same time
+                            (see @see cl DocumentationThreadingServer)
+    @param      max_pending maximum number of accepted requests when *max_workers* is not None,
+                            the server answers the next ones with a 503 error
+    @param      cache_size  if not None, replaces the cache shared by all servers
+                            by a new one which holds at most *cache_size* bytes,
+                            see @see cl DocumentationCache
+    @param      script_workers  if not None, the scripts are executed by a pool of *script_workers*
+                                processes shared by all servers (see @see cl ScriptWorkerPool),
+                                otherwise, every script runs in a new process
+    @param      script_cache    if True, the outputs of the scripts are cached,
+                                see @see me execute_cached
     @return                 server if thread is False, the thread otherwise (the thread is started)
 
     @example(run a local server which serves the documentation)
@@ -564,14 +944,28 @@ def run_doc_server(server,
     More than one mappings can be sent.
     @endexample
 
+    .. versionchanged:: 1.2
+        Parameters *max_workers*, *max_pending*, *cache_size*, *script_workers*, *script_cache* were added.
     """
     for k, v in mappings.items():
         DocumentationHandler.add_mapping(k, v)
+    if cache_size is not None:
+        DocumentationHandler.cache = DocumentationCache(cache_size)
+    if script_workers is not None:
+        if DocumentationHandler.script_pool is not None:
+            DocumentationHandler.script_pool.close()
+        DocumentationHandler.script_pool = ScriptWorkerPool(script_workers)
+    DocumentationHandler.script_cache = script_cache
 
     if server is None:
-        server = HTTPServer(('localhost', port), DocumentationHandler)
-    elif isinstance(server, str):
-        server = HTTPServer((server, port), DocumentationHandler)
+        server = 'localhost'
+    if isinstance(server, str):
+        if max_workers is None:
+            server = HTTPServer((server, port), DocumentationHandler)
+        else:
+            server = DocumentationThreadingServer(
+                (server, port), DocumentationHandler, max_workers=max_workers,
+                max_pending=max_pending)
     elif not isinstance(server, HTTPServer):
         raise TypeError("unexpected type for server: " + str(type(server)))
 
@@ -0,0 +1,271 @@
+#-*- coding:utf-8 -*-
+"""
+@file
+@brief Pool of processes executing the scripts served by the documentation server.
+
+.. versionadded:: 1.2
+"""
+import os
+import sys
+import runpy
+import tempfile
+import traceback
+import threading
+import multiprocessing
+from queue import Queue
+
+
+def _snapshot_state():
+    """
+    private: returns the part of the interpreter state a script may modify
+    """
+    return dict(cwd=os.getcwd(), environ=dict(os.environ), path=list(sys.path),
+                modules=set(sys.modules), argv=list(sys.argv))
+
+
+def _restore_state(state):
+    """
+    private: restores the state returned by @see fn _snapshot_state,
+    the modules imported by a script are removed
+    """
+    os.chdir(state["cwd"])
+    os.environ.clear()
+    os.environ.update(state["environ"])
+    sys.path[:] = state["path"]
+    sys.argv[:] = state["argv"]
+    for name in list(sys.modules):
+        if name not in state["modules"]:
+            del sys.modules[name]
+
+
+def _run_script(filename, params):
+    """
+    private: runs a script and captures its outputs,
+    the file descriptors 1 and 2 are redirected during the execution,
+    the outputs of C code and of the child processes are captured as well
+
+    @param      filename    script
+    @param      params      dictionary, the script receives it as a global variable *params*
+    @return                 output, error (bytes)
+    """
+    streams = sys.stdout, sys.stderr
+    for stream in streams:
+        stream.flush()
+    with tempfile.TemporaryFile() as out, tempfile.TemporaryFile() as err:
+        saved = os.dup(1), os.dup(2)
+        os.dup2(out.fileno(), 1)
+        os.dup2(err.fileno(), 2)
+        try:
+            sys.argv = [filename]
+            sys.path.insert(0, os.path.dirname(os.path.abspath(filename)))
+            runpy.run_path(filename, init_globals=dict(params=params or {}),
+                           run_name="__main__")
+        except SystemExit as e:
+            if e.code not in (None, 0):
+                streams[1].write("exit code {0}\n".format(e.code))
+        except BaseException:
+            traceback.print_exc(file=streams[1])
+        finally:
+            sys.stdout, sys.stderr = streams
+            for stream in streams:
+                stream.flush()
+            os.dup2(saved[0], 1)
+            os.dup2(saved[1], 2)
+            os.close(saved[0])
+            os.close(saved[1])
+        out.seek(0)
+        err.seek(0)
+        return out.read(), err.read()
+
+
+def _script_worker(conn):
+    """
+    private: loop of a worker, receives tuples *(filename, params)*
+    and sends back the outputs until it receives None,
+    the interpreter state is restored after every script
+    """
+    state = _snapshot_state()
+    conn.send("ready")
+    while True:
+        try:
+            task = conn.recv()
+        except EOFError:
+            break
+        if task is None:
+            break
+        res = _run_script(*task)
+        _restore_state(state)
+        conn.send(res)
+
+
+class ScriptWorkerPool:
+
+    """
+    keeps *size* Python processes ready to execute scripts,
+    a script does not pay for the interpreter startup,
+    a worker is replaced after *max_tasks* scripts,
+    a worker running a script for more than *timeout* seconds is killed
+    and replaced
+
+    The processes are started with the method ``spawn``
+    (the server runs many threads, forking it is not safe),
+    the main script must be protected by ``if __name__ == "__main__":``.
+    After every script, a worker restores its current directory, its environment
+    variables, *sys.path*, *sys.argv* and removes the modules the script imported.
+    The outputs are captured at file descriptor level.
+
+    @code
+    pool = ScriptWorkerPool(2)
+    out, err = pool.run("script.py", params={"q": ["value"]}, timeout=10)
+    pool.close()
+    @endcode
+    """
+
+    def __init__(self, size=2, max_tasks=100):
+        """
+        constructor
+
+        @param      size        number of processes
+        @param      max_tasks   number of scripts a process executes before being replaced
+        """
+        self.size = size
+        self.max_tasks = max_tasks
+        self._idle = Queue()
+        self._lock = threading.Lock()
+        self._closed = False
+        for i in range(size):
+            self._idle.put(self._start_worker())
+
+    @staticmethod
+    def _start_worker():
+        """
+        starts a worker and waits until it is ready,
+        the startup time is not counted in the timeout of the first script
+
+        @return     list [process, connection, number of executed scripts]
+        """
+        context = multiprocessing.get_context("spawn")
+        parent, child = context.Pipe()
+        proc = context.Process(target=_script_worker, args=(child,))
+        proc.daemon = True
+        proc.start()
+        child.close()
+        try:
+            parent.recv()
+        except EOFError:
+            proc.join()
+            parent.close()
+            raise RuntimeError(
+                "unable to start a worker, exit code {0}".format(proc.exitcode))
+        return [proc, parent, 0]
+
+    @staticmethod
+    def _stop_worker(worker, kill=False):
+        """
+        stops a worker
+        """
+        proc, conn, _ = worker
+        if kill:
+            proc.terminate()
+        else:
+            try:
+                conn.send(None)
+            except OSError:
+                proc.terminate()
+        proc.join()
+        conn.close()
+
+    @staticmethod
+    def _submit(worker, filename, params, timeout):
+        """
+        sends a script to a worker and waits for its outputs
+
+        @param      worker          worker returned by @see me _start_worker
+        @param      filename        script
+        @param      params          dictionary, the script receives it as a global variable *params*
+        @param      timeout         maximum execution time in seconds (None for no limit)
+        @return                     output, error, False if the script stopped the worker
+
+        The function raises an exception *TimeoutError* if the script
+        runs longer than *timeout*, the worker must be killed.
+        """
+        conn = worker[1]
+        try:
+            conn.send((filename, params))
+            completed = conn.poll(timeout)
+            if completed:
+                out, err = conn.recv()
+        except (EOFError, OSError) as e:
+            # the script stopped the worker
+            return b"", "the worker stopped: {0}".format(e).encode("utf-8"), False
+        if not completed:
+            raise TimeoutError(
+                "script '{0}' ran more than {1} seconds".format(filename, timeout))
+        worker[2] += 1
+        return out, err, True
+
+    def run(self, filename, params=None, timeout=None):
+        """
+        executes a script in one of the processes, waits for a free process if
+        they are all busy
+
+        @param      filename        script
+        @param      params          dictionary, the script receives it as a global variable *params*
+        @param      timeout         maximum execution time in seconds (None for no limit)
+        @return                     output, error (bytes)
+
+        The function raises an exception *TimeoutError* if the script
+        runs longer than *timeout*.
+        """
+        if self._closed:
+            raise RuntimeError("the pool is closed")
+        worker = self._idle.get()
+        alive = False
+        try:
+            out, err, alive = ScriptWorkerPool._submit(
+                worker, filename, params, timeout)
+            return out, err
+        finally:
+            if not alive or worker[2] >= self.max_tasks:
+                ScriptWorkerPool._stop_worker(worker, kill=not alive)
+                worker = None if self._closed else ScriptWorkerPool._start_worker()
+            if worker is not None:
+                with self._lock:
+                    if self._closed:
+                        ScriptWorkerPool._stop_worker(worker)
+                    else:
+                        self._idle.put(worker)
+
+    def close(self):
+        """
+        stops the processes which are not busy, the others stop
+        once their script is completed
+        """
+        with self._lock:
+            self._closed = True
+        while not self._idle.empty():
+            ScriptWorkerPool._stop_worker(self._idle.get())
+
+
+def run_script(filename, params=None, timeout=None):
+    """
+    executes a script in a new process which stops after it,
+    the script receives its parameters and its outputs are captured
+    the same way as with @see cl ScriptWorkerPool
+
+    @param      filename        script
+    @param      params          dictionary, the script receives it as a global variable *params*
+    @param      timeout         maximum execution time in seconds (None for no limit)
+    @return                     output, error (bytes)
+
+    The function raises an exception *TimeoutError* if the script
+    runs longer than *timeout*.
+    """
+    worker = ScriptWorkerPool._start_worker()
+    alive = False
+    try:
+        out, err, alive = ScriptWorkerPool._submit(
+            worker, filename, params, timeout)
+        return out, err
+    finally:
+        ScriptWorkerPool._stop_worker(worker, kill=not alive)
@@ -0,0 +1,100 @@
+#-*- coding:utf-8 -*-
+"""
+@file
+@brief Measures the number of requests per second a documentation server can serve.
+
+.. versionadded:: 1.2
+"""
+import time
+import socket
+import threading
+try:
+    from urllib.parse import urlparse
+    from urllib.request import urlopen
+except ImportError:
+    from urlparse import urlparse
+    from urllib2 import urlopen
+
+
+def _slow_client(url, stop, delay):
+    """
+    private: sends requests to *url* one byte every *delay* seconds
+    until *stop* is set, it simulates a slow network
+    """
+    parsed = urlparse(url)
+    request = "GET {0} HTTP/1.0\r\nHost: {1}\r\n\r\n".format(
+        parsed.path or "/", parsed.netloc).encode("ascii")
+    while not stop.is_set():
+        try:
+            sock = socket.create_connection((parsed.hostname, parsed.port))
+            try:
+                for i in range(len(request)):
+                    sock.sendall(request[i:i + 1])
+                    time.sleep(delay)
+                while sock.recv(65536):
+                    pass
+            finally:
+                sock.close()
+        except OSError:
+            time.sleep(delay)
+
+
+def benchmark_doc_server(url, nb_requests=100, n_clients=4, slow_clients=0,
+                         slow_delay=0.01, timeout=60):
+    """
+    measures the number of requests per second a server can serve,
+    it sends *nb_requests* requests to *url* from *n_clients* threads
+
+    @param      url             url to request
+    @param      nb_requests     number of requests
+    @param      n_clients       number of clients sending requests at the same time
+    @param      slow_clients    number of additional clients sending their requests
+                                slowly (one byte every *slow_delay* seconds) during the benchmark
+    @param      slow_delay      see *slow_clients*
+    @param      timeout         timeout for every request
+    @return                     dictionary with keys ``requests``, ``errors``, ``time``, ``rps``
+
+    @example(compare the servers for the documentation)
+    @code
+    from pyquickhelper.serverdoc import run_doc_server
+    from pyquickhelper.serverdoc.server_benchmark import benchmark_doc_server
+    th1 = run_doc_server(None, {"doc": "dist/html"}, True, port=8079)
+    th2 = run_doc_server(None, {"doc": "dist/html"}, True, port=8080, max_workers=8)
+    print(benchmark_doc_server("http://localhost:8079/doc/index.html", slow_clients=1))
+    print(benchmark_doc_server("http://localhost:8080/doc/index.html", slow_clients=1))
+    th1.shutdown()
+    th2.shutdown()
+    @endcode
+    @endexample
+    """
+    from concurrent.futures import ThreadPoolExecutor
+
+    def fetch(i):
+        try:
+            u = urlopen(url, timeout=timeout)
+            u.read()
+            u.close()
+            return True
+        except Exception:
+            return False
+
+    stop = threading.Event()
+    slows = [threading.Thread(target=_slow_client, args=(url, stop, slow_delay))
+             for i in range(slow_clients)]
+    for th in slows:
+        th.daemon = True
+        th.start()
+    # the slow clients start first
+    time.sleep(slow_delay * 2)
+
+    begin = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=n_clients) as executor:
+        res = list(executor.map(fetch, range(nb_requests)))
+    duration = time.perf_counter() - begin
+
+    stop.set()
+    for th in slows:
+        th.join()
+
+    return dict(requests=nb_requests, errors=res.count(False), time=duration,
+                rps=nb_requests / duration)